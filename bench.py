@@ -1,50 +1,245 @@
 #!/usr/bin/env python3
 """
-bench.py — placeholder micro-benchmark
+bench.py — benchmark harness for the hot paths
 
-Purpose
+Times the sieve kernel (trace generation + max), UnifiedEngine.run_engine,
+tseitin_cnf/dump_dimacs, drat_proof_and_hash and capsule schema validation
+with warmup, repeats and outlier rejection (brain/benchmarks/harness.py).
+
+Outputs
 -------
-Keeps CI green by producing a deterministic CSV artifact that downstream
-steps (plot, gallery) can consume. Replace with the real harness later.
+--out   CSV for the plot/gallery steps, same schema as before:
+        timestamp,mode,traces,throughput_traces_per_s,elapsed_s
+        (one row: the sieve case, median time over the kept repeats)
+--json  every case with raw samples and mean/median/stdev/min/max/p5..p95
+        (default: the CSV path with a .json suffix)
+
+--mode selects the array backend for the sieve case: cpu (NumPy), gpu (CuPy,
+error without a CUDA device) or auto (CuPy when available, else NumPy).  The
+other cases are pure Python and always run on the CPU.
+
+--history appends every case to a JSONL store keyed by git SHA, machine
+fingerprint and case; --baseline SHA|previous gates the run against it and
+exits 1 on a significant slowdown (brain/benchmarks/history.py, which also
+renders the trend report).
+
+--sweep runs the parallel-capable workloads (sieve, sharded engine batches)
+and CNF generation over sizes x workers x dtype.  It reports throughput,
+speedup and parallel efficiency, and flags where scaling flattens
+(brain/benchmarks/scaling.py).
 
 Usage (examples)
 ----------------
 python bench.py --traces 100000 --mode auto
 python bench.py --traces 1e6 --mode gpu --out out/bench_1M_gpu.csv
+python bench.py --cases sieve engine --repeats 10 --warmup 2
+python bench.py --history out/bench_history.jsonl --baseline previous --case-threshold engine=0.25
+python bench.py --sweep --sweep-traces 1e6 4e6 --sweep-workers 1 2 4 8 16
 """
 
 from __future__ import annotations
-import argparse, os, csv, time, math
 
-def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--traces", type=float, default=100_000,
-                    help="Number of traces (accepts float for scientific notation).")
-    ap.add_argument("--mode", choices=["auto", "cpu", "gpu"], default="auto",
-                    help="Execution mode hint.")
-    ap.add_argument("--out", default="out/bench_auto.csv",
-                    help="Output CSV path.")
-    args = ap.parse_args()
+import argparse
+import csv
+import json
+import os
+import platform
+import sys
+import time
+
+from brain.benchmarks import history
+from brain.benchmarks import scaling
+from brain.benchmarks.harness import run_case
+from brain.benchmarks.suite import CASES, MODES, build_cases, select_backend
+from brain.sieve.kernel import DTYPES
 
-    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
 
-    # Deterministic “fake” timing that scales with trace count,
-    # just to produce sensible numbers for charts.
-    traces = float(args.traces)
-    base_tps = 125_000.0
-    mode_factor = {"cpu": 0.8, "gpu": 8.0, "auto": 1.0}[args.mode]
-    tps = base_tps * mode_factor
-    elapsed = traces / tps if tps > 0 else 0.0
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark the Brain hot paths.")
+    ap.add_argument("--traces", type=float, default=100_000,
+                    help="Sieve traces per run (accepts float for scientific notation).")
+    ap.add_argument("--mode", choices=MODES, default="auto",
+                    help="Array backend for the sieve case.")
+    ap.add_argument("--out", default="out/bench_auto.csv", help="Output CSV path.")
+    ap.add_argument("--json", help="Detailed results JSON (default: --out with .json).")
+    ap.add_argument("--cases", nargs="+", choices=CASES, default=list(CASES))
+    ap.add_argument("--warmup", type=int, default=1, help="Untimed calls per case.")
+    ap.add_argument("--repeats", type=int, default=5, help="Timed calls per case.")
+    ap.add_argument("--outlier-k", type=float, default=1.5,
+                    help="Tukey fence multiplier for outlier rejection (0 = keep all).")
+    ap.add_argument("--trace-len", type=int, default=int(os.getenv("TRACE_LEN", "48")))
+    ap.add_argument("--items", type=int, default=2_000, help="Motif lists per engine run.")
+    ap.add_argument("--tseitin-n", type=int, default=60, help="Expander size (even).")
+    ap.add_argument("--history", help="Append results to this JSONL history store.")
+    ap.add_argument("--baseline",
+                    help="Gate against this SHA prefix (or 'previous') in --history; "
+                         "exit 1 on a regression.")
+    ap.add_argument("--threshold", type=float, default=history.DEFAULT_THRESHOLD,
+                    help="Median slowdown (fraction) that counts as a regression.")
+    ap.add_argument("--case-threshold", nargs="*", default=[], metavar="CASE=FRAC",
+                    help="Per-case overrides of --threshold, e.g. engine=0.25.")
+    ap.add_argument("--alpha", type=float, default=history.DEFAULT_ALPHA,
+                    help="Mann-Whitney significance level for the gate.")
+    ap.add_argument("--sweep", action="store_true",
+                    help="Scaling sweep (sizes x workers x dtype) instead of the cases.")
+    ap.add_argument("--sweep-traces", type=float, nargs="+", default=[1e5, 4e5])
+    ap.add_argument("--sweep-lengths", type=int, nargs="+", default=[48])
+    ap.add_argument("--sweep-dtypes", nargs="+", choices=DTYPES, default=list(DTYPES))
+    ap.add_argument("--sweep-items", type=int, nargs="+", default=[2_000, 8_000],
+                    help="Engine motif corpus sizes.")
+    ap.add_argument("--sweep-tseitin", type=int, nargs="+", default=[20, 60, 120])
+    ap.add_argument("--sweep-workers", type=int, nargs="+",
+                    help="Worker counts (default 1, 2, 4, ... up to the core count).")
+    ap.add_argument("--sweep-out", default="out/bench_sweep.csv",
+                    help="Sweep CSV (a .json with raw results goes next to it).")
+    args = ap.parse_args(argv)
+    if args.baseline and not args.history:
+        ap.error("--baseline needs --history")
+    try:
+        thresholds = history.parse_thresholds(args.case_threshold)
+    except ValueError as exc:
+        ap.error(str(exc))
+
+    try:
+        xp, backend = select_backend(args.mode)
+    except RuntimeError as exc:
+        print(f"[bench] {exc}", file=sys.stderr)
+        return 2
+    if args.sweep:
+        return sweep(args, xp, backend)
+    traces = int(args.traces)
+    cases = build_cases(
+        args.cases, traces, args.trace_len, xp, backend, args.items, args.tseitin_n
+    )
 
     now = int(time.time())
+    results = []
+    for case in cases:
+        res = run_case(case, args.warmup, args.repeats, args.outlier_k)
+        results.append(res)
+        if "skipped" in res:
+            print(f"[bench] {res['case']:<9} skipped: {res['skipped']}")
+            continue
+        el = res["elapsed_s"]
+        print(
+            f"[bench] {res['case']:<9} median={el['median']:.6f}s stdev={el['stdev']:.6f}s "
+            f"{res['throughput_per_s']:.0f} {res['unit']}/s "
+            f"(kept {el['n']}/{res['repeats']})"
+        )
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
     with open(args.out, "w", newline="") as f:
         w = csv.writer(f)
         w.writerow(["timestamp", "mode", "traces", "throughput_traces_per_s", "elapsed_s"])
-        w.writerow([now, args.mode, int(traces), f"{tps:.3f}", f"{elapsed:.6f}"])
+        sieve = next((r for r in results if r["case"] == "sieve" and "elapsed_s" in r), None)
+        if sieve is not None:
+            tps, elapsed = sieve["throughput_per_s"], sieve["elapsed_s"]["median"]
+            w.writerow([now, args.mode, traces, f"{tps:.3f}", f"{elapsed:.6f}"])
+
+    sha, machine = history.git_sha(), history.machine_info(backend)
+    records = history.make_records(results, sha, machine, now, args.mode)
+    comparisons = []
+    if args.baseline:
+        past = list(history.load_records(args.history))
+        for rec in records:
+            base = history.find_baseline(past, rec, args.baseline)
+            if base is None:
+                print(f"[bench] {rec['case']:<9} no baseline {args.baseline!r} to compare")
+                continue
+            cmp = history.compare(
+                rec, base, thresholds.get(rec["case"], args.threshold), args.alpha, args.outlier_k
+            )
+            comparisons.append(cmp)
+            print(
+                f"[bench] {cmp['case']:<9} {100 * cmp['change']:+.1f}% vs "
+                f"{cmp['baseline_sha'][:12]} (p={cmp['p_value']:.3g})"
+                + ("  REGRESSION" if cmp["regression"] else "")
+            )
+    if args.history:
+        history.append_records(args.history, records)
+
+    json_path = args.json or os.path.splitext(args.out)[0] + ".json"
+    os.makedirs(os.path.dirname(json_path) or ".", exist_ok=True)
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "timestamp": now,
+                "mode": args.mode,
+                "backend": backend,
+                "warmup": args.warmup,
+                "repeats": args.repeats,
+                "outlier_k": args.outlier_k,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "sha": sha,
+                "machine": machine,
+                "cases": results,
+                "comparisons": comparisons,
+            },
+            f,
+            indent=2,
+        )
+
+    print(f"[bench] wrote CSV → {args.out}, JSON → {json_path}")
+    regressions = [c["case"] for c in comparisons if c["regression"]]
+    if regressions:
+        print(f"[bench] regression in: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
 
-    print(f"[bench] wrote CSV → {args.out}")
-    print(f"[bench] mode={args.mode} traces={int(traces)} tps≈{tps:.0f} elapsed≈{elapsed:.3f}s")
+
+def sweep(args, xp, backend) -> int:
+    grid = scaling.SweepGrid(
+        traces=[int(t) for t in args.sweep_traces],
+        lengths=args.sweep_lengths,
+        dtypes=args.sweep_dtypes,
+        items=args.sweep_items,
+        tseitin=args.sweep_tseitin,
+    )
+    if args.sweep_workers:
+        grid.workers = sorted(set(args.sweep_workers))
+
+    def progress(res) -> None:
+        shown = " ".join(f"{k}={v}" for k, v in res["params"].items())
+        if "skipped" in res:
+            print(f"[bench] sweep {res['case']:<7} {shown} skipped: {res['skipped']}")
+        else:
+            print(f"[bench] sweep {res['case']:<7} {shown} "
+                  f"{res['throughput_per_s']:.0f} {res['unit']}/s")
+
+    out = scaling.run_sweep(
+        grid, xp, backend, args.warmup, args.repeats, args.outlier_k, progress
+    )
+    print(scaling.format_rows(out["rows"]))
+    for knee in out["knees"]:
+        print(
+            f"[bench] {knee['workload']} size={knee['size']} dtype={knee['dtype']}: scaling "
+            f"flattens at {knee['flattens_at_workers']} workers (speedup {knee['speedup']:.2f}x)"
+        )
+
+    os.makedirs(os.path.dirname(args.sweep_out) or ".", exist_ok=True)
+    with open(args.sweep_out, "w", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=scaling.SWEEP_COLUMNS)
+        w.writeheader()
+        w.writerows(out["rows"])
+    json_path = os.path.splitext(args.sweep_out)[0] + ".json"
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "timestamp": int(time.time()),
+                "mode": args.mode,
+                "backend": backend,
+                "machine": history.machine_info(backend),
+                "sha": history.git_sha(),
+                **out,
+            },
+            f,
+            indent=2,
+        )
+    print(f"[bench] wrote sweep CSV → {args.sweep_out}, JSON → {json_path}")
     return 0
 
+
 if __name__ == "__main__":
     raise SystemExit(main())
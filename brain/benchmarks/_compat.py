@@ -0,0 +1,24 @@
+"""Import helpers shared by the benchmark scripts.
+
+The engine lives in ``python/brain`` while the benchmarks live in the top-level
+``brain`` package.  Both halves are merged via ``pkgutil.extend_path`` when the
+two directories are on ``sys.path``; running a benchmark straight from a
+checkout (``python -m brain.benchmarks.<name>``) only puts the repository root
+there, so we graft the in-repo engine package onto ``brain.__path__``.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import brain
+
+REPO = Path(__file__).resolve().parents[2]
+
+
+def ensure_engine_importable() -> None:
+    """Make ``brain.unified_engine`` and friends importable from a checkout."""
+
+    engine_pkg = str(REPO / "python" / "brain")
+    if engine_pkg not in brain.__path__:
+        brain.__path__.append(engine_pkg)
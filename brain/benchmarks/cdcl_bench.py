@@ -0,0 +1,70 @@
+"""CDCL throughput over the Tseitin expander family.
+
+Solves :func:`tseitin_cnf` instances for a range of ``n`` with the pure-Python
+solver behind ``TranslatorCore.minisat_solve(backend="cdcl")`` and reports
+wall time, conflicts/sec and propagations/sec per instance.
+
+Usage::
+
+    python -m brain.benchmarks.cdcl_bench --sizes 10 20 40 60
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Dict, List, Sequence
+
+from brain.benchmarks._compat import ensure_engine_importable
+from brain.benchmarks.tseitin_expander import expander_graph, tseitin_cnf
+
+ensure_engine_importable()
+
+from brain.cdcl import CDCLSolver  # noqa: E402
+
+DEFAULT_SIZES = (10, 20, 30, 40, 50, 60)
+
+
+def bench_tseitin(n: int) -> Dict[str, float]:
+    """Solve the ``n``-vertex Tseitin instance once and return solver rates."""
+
+    clauses = tseitin_cnf(expander_graph(n))
+    t0 = time.perf_counter()
+    solver = CDCLSolver(clauses)
+    sat = solver.solve()
+    elapsed = time.perf_counter() - t0
+    if sat is not False:
+        raise RuntimeError(f"Tseitin instance n={n} should be UNSAT, solver returned {sat}")
+    stats = solver.stats
+    return {
+        "n": float(n),
+        "clauses": float(len(clauses)),
+        "elapsed_s": elapsed,
+        "conflicts": float(stats.conflicts),
+        "propagations": float(stats.propagations),
+        "conflicts_per_s": stats.conflicts / elapsed if elapsed > 0 else 0.0,
+        "propagations_per_s": stats.propagations / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def bench_family(sizes: Sequence[int] = DEFAULT_SIZES) -> List[Dict[str, float]]:
+    return [bench_tseitin(n) for n in sizes]
+
+
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    args = ap.parse_args(argv)
+
+    print(f"{'n':>4} {'clauses':>8} {'time_s':>8} {'conflicts':>10} {'confl/s':>9} {'props/s':>10}")
+    for row in bench_family(args.sizes):
+        print(
+            f"{int(row['n']):>4} {int(row['clauses']):>8} {row['elapsed_s']:>8.3f} "
+            f"{int(row['conflicts']):>10} {row['conflicts_per_s']:>9.0f} "
+            f"{row['propagations_per_s']:>10.0f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
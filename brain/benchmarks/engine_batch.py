@@ -0,0 +1,85 @@
+"""Throughput benchmark for :meth:`UnifiedEngine.run_engine_batch`.
+
+Compares the per-call ``run_engine`` loop against the batch API on the same
+deterministic motif corpus and reports items/sec for both paths.
+
+Usage::
+
+    python -m brain.benchmarks.engine_batch --items 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import time
+from typing import Dict, List
+
+from brain.benchmarks._compat import ensure_engine_importable
+
+ensure_engine_importable()
+
+from brain.unified_engine import UnifiedEngine  # noqa: E402
+
+_PATTERNS: List[List[str]] = [
+    ["⥁", "⚛", "MARKET:SPY"],
+    ["A", "NOT:A", "MARKET:QQQ"],
+    ["⥁", "MARKET:IWM"],
+    ["B", "C", "NOT:D", "MARKET:SPY"],
+]
+
+
+def motif_corpus(n_items: int) -> List[List[str]]:
+    """Return ``n_items`` deterministic motif lists cycling through a few shapes."""
+
+    corpus: List[List[str]] = []
+    for i in range(n_items):
+        base = _PATTERNS[i % len(_PATTERNS)]
+        corpus.append(base + [f"SEQ:{i % 97}"])
+    return corpus
+
+
+def bench_engine_batch(n_items: int = 20_000) -> Dict[str, float]:
+    """Time the single-call loop and the batch API; return items/sec for each."""
+
+    corpus = motif_corpus(n_items)
+    engine = UnifiedEngine()
+    sink = io.StringIO()
+
+    with contextlib.redirect_stdout(sink):
+        t0 = time.perf_counter()
+        for motifs in corpus:
+            engine.run_engine(motifs)
+        single_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        engine.run_engine_batch(corpus)
+        batch_s = time.perf_counter() - t0
+
+    single_ips = n_items / single_s if single_s > 0 else float("inf")
+    batch_ips = n_items / batch_s if batch_s > 0 else float("inf")
+    return {
+        "items": float(n_items),
+        "single_items_per_s": single_ips,
+        "batch_items_per_s": batch_ips,
+        "speedup": batch_ips / single_ips if single_ips else float("inf"),
+    }
+
+
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--items", type=int, default=20_000, help="Motif lists per run.")
+    args = ap.parse_args(argv)
+
+    res = bench_engine_batch(args.items)
+    print(
+        f"[engine-batch] items={int(res['items'])} "
+        f"single={res['single_items_per_s']:.0f}/s batch={res['batch_items_per_s']:.0f}/s "
+        f"speedup={res['speedup']:.2f}x"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,84 @@
+"""Worker-count scaling for :class:`ShardedEngineRunner`.
+
+Runs the same motif corpus with 1..N worker processes and reports items/sec,
+speedup over the in-process baseline and parallel efficiency.
+
+Usage::
+
+    python -m brain.benchmarks.engine_scaling --items 200000 --max-workers 32
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from typing import Dict, List, Sequence
+
+from brain.benchmarks._compat import ensure_engine_importable
+from brain.benchmarks.engine_batch import motif_corpus
+
+ensure_engine_importable()
+
+from brain.sharded import ShardedEngineRunner  # noqa: E402
+
+
+def worker_counts(max_workers: int) -> List[int]:
+    """1, 2, 4, ... up to ``max_workers`` (always included)."""
+
+    counts = []
+    w = 1
+    while w < max_workers:
+        counts.append(w)
+        w *= 2
+    counts.append(max_workers)
+    return counts
+
+
+def bench_scaling(
+    n_items: int, workers: Sequence[int], chunk_size: int = 256
+) -> List[Dict[str, float]]:
+    corpus = motif_corpus(n_items)
+    ts = "2025-01-01T00:00:00Z"
+    rows: List[Dict[str, float]] = []
+    base_ips = 0.0
+    for w in workers:
+        runner = ShardedEngineRunner(workers=w, chunk_size=chunk_size)
+        t0 = time.perf_counter()
+        count = sum(1 for _ in runner.iter_run(corpus, timestamp=ts))
+        elapsed = time.perf_counter() - t0
+        ips = count / elapsed if elapsed > 0 else 0.0
+        if not base_ips:
+            base_ips = ips
+        speedup = ips / base_ips if base_ips else 0.0
+        rows.append(
+            {
+                "workers": float(w),
+                "items": float(count),
+                "elapsed_s": elapsed,
+                "items_per_s": ips,
+                "speedup": speedup,
+                "efficiency": speedup / w,
+            }
+        )
+    return rows
+
+
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--items", type=int, default=50_000)
+    ap.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--chunk-size", type=int, default=256)
+    args = ap.parse_args(argv)
+
+    print(f"{'workers':>7} {'items/s':>10} {'speedup':>8} {'eff':>6}")
+    for row in bench_scaling(args.items, worker_counts(args.max_workers), args.chunk_size):
+        print(
+            f"{int(row['workers']):>7} {row['items_per_s']:>10.0f} "
+            f"{row['speedup']:>8.2f} {row['efficiency']:>6.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,131 @@
+"""Timing harness used by ``bench.py``.
+
+A :class:`Case` wraps a ``setup`` callable that builds its inputs once and
+returns the zero-argument function to time.  :func:`run_case` makes
+``warmup`` untimed calls, then ``repeats`` timed ones (``perf_counter``, GC
+collected before and disabled during each call, as :mod:`timeit` does).  It
+drops outliers outside Tukey's fences (``k`` × IQR beyond the quartiles) and
+summarises the rest.  The raw samples are kept in the result so later
+comparisons can use them.
+"""
+
+from __future__ import annotations
+
+import gc
+import math
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+PERCENTILES = (5, 25, 75, 95)
+
+
+class SkipCase(Exception):
+    """Raised by a case's ``setup`` when it cannot run here (e.g. missing dependency)."""
+
+
+@dataclass
+class Case:
+    """
+    One benchmark.
+    - `setup`: builds inputs, returns the function to time (may raise SkipCase)
+    - `units`: work items per call (traces, motif lists, clauses, ...), for throughput
+    - `sync`: called after each timed call (e.g. GPU synchronise) so async work counts
+    """
+
+    name: str
+    setup: Callable[[], Callable[[], Any]]
+    units: float
+    unit: str
+    backend: str = "cpu"
+    params: Dict[str, Any] = field(default_factory=dict)
+    sync: Optional[Callable[[], None]] = None
+
+
+def percentile(sorted_samples: Sequence[float], q: float) -> float:
+    """Linear-interpolated ``q``-th percentile of ascending ``sorted_samples``."""
+
+    if not sorted_samples:
+        return math.nan
+    pos = (len(sorted_samples) - 1) * q / 100.0
+    lo = math.floor(pos)
+    hi = min(lo + 1, len(sorted_samples) - 1)
+    return sorted_samples[lo] + (sorted_samples[hi] - sorted_samples[lo]) * (pos - lo)
+
+
+def reject_outliers(samples: Sequence[float], k: float = 1.5) -> Tuple[List[float], List[float]]:
+    """Split ``samples`` into (kept, rejected) by Tukey's fences; ``k <= 0`` keeps all."""
+
+    if k <= 0 or len(samples) < 4:
+        return list(samples), []
+    s = sorted(samples)
+    q1, q3 = percentile(s, 25), percentile(s, 75)
+    lo, hi = q1 - k * (q3 - q1), q3 + k * (q3 - q1)
+    kept = [x for x in samples if lo <= x <= hi]
+    return kept, [x for x in samples if not lo <= x <= hi]
+
+
+def summarize(samples: Sequence[float]) -> Dict[str, float]:
+    """n, mean, median, stdev, min, max and the :data:`PERCENTILES` of ``samples``."""
+
+    s = sorted(samples)
+    out: Dict[str, float] = {
+        "n": len(s),
+        "mean": statistics.fmean(s) if s else math.nan,
+        "median": statistics.median(s) if s else math.nan,
+        "stdev": statistics.stdev(s) if len(s) > 1 else 0.0,
+        "min": s[0] if s else math.nan,
+        "max": s[-1] if s else math.nan,
+    }
+    for q in PERCENTILES:
+        out[f"p{q}"] = percentile(s, q)
+    return out
+
+
+def time_call(fn: Callable[[], Any], sync: Optional[Callable[[], None]] = None) -> float:
+    gc.collect()
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        t0 = time.perf_counter()
+        fn()
+        if sync is not None:
+            sync()
+        return time.perf_counter() - t0
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def run_case(case: Case, warmup: int = 1, repeats: int = 5, k: float = 1.5) -> Dict[str, Any]:
+    """Time ``case``; returns its JSON-able result (``skipped`` set if setup declined)."""
+
+    result: Dict[str, Any] = {
+        "case": case.name,
+        "unit": case.unit,
+        "units": case.units,
+        "backend": case.backend,
+        "params": case.params,
+    }
+    try:
+        fn = case.setup()
+    except SkipCase as exc:
+        result["skipped"] = str(exc)
+        return result
+    for _ in range(warmup):
+        fn()
+        if case.sync is not None:
+            case.sync()
+    samples = [time_call(fn, case.sync) for _ in range(max(1, repeats))]
+    kept, rejected = reject_outliers(samples, k)
+    stats = summarize(kept)
+    result.update(
+        warmup=warmup,
+        repeats=len(samples),
+        samples_s=samples,
+        rejected=len(rejected),
+        elapsed_s=stats,
+        throughput_per_s=case.units / stats["median"] if stats["median"] > 0 else math.inf,
+    )
+    return result
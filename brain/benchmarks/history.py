@@ -0,0 +1,341 @@
+"""Benchmark history store, regression gate and trend report.
+
+``bench.py --history PATH`` appends one JSON line per case and run to
+``PATH``.  Each line carries the git SHA, a machine fingerprint, the case,
+its parameters and the raw timing samples.  Lines are only ever appended, so
+the file merges cleanly and survives interrupted runs.  A torn last line is
+skipped on load.
+
+``bench.py --baseline REF`` compares the new samples with the baseline
+record for the same case, machine and parameters.  ``REF`` is a SHA prefix,
+or ``previous`` for the latest earlier record.  A case regresses when its
+median slowed by more than the case's threshold *and* a one-sided
+Mann-Whitney U test says the new samples are larger (p < alpha).  Small
+samples without ties get the exact U distribution, larger ones the normal
+approximation with tie correction.
+
+Usage::
+
+    python bench.py --history out/bench_history.jsonl --baseline previous
+    python -m brain.benchmarks.history out/bench_history.jsonl --case sieve --csv trend.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import hashlib
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+from statistics import NormalDist, median
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from brain.benchmarks._compat import REPO
+from brain.benchmarks.harness import reject_outliers
+
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_ALPHA = 0.05
+_EXACT_MAX_N = 30
+TREND_COLUMNS = (
+    "timestamp",
+    "mode",
+    "traces",
+    "throughput_traces_per_s",
+    "elapsed_s",
+    "case",
+    "unit",
+    "sha",
+    "machine",
+)
+
+
+def git_sha(cwd: Optional[str] = None) -> str:
+    """HEAD of the checkout (``BENCH_SHA``/``GITHUB_SHA`` win); ``+dirty`` if modified."""
+
+    sha = os.getenv("BENCH_SHA") or os.getenv("GITHUB_SHA")
+    if sha:
+        return sha
+    cwd = cwd or str(REPO)
+    try:
+        sha = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=cwd, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "diff", "--quiet", "HEAD", "--"], cwd=cwd, capture_output=True
+        ).returncode
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return sha + ("+dirty" if dirty else "")
+
+
+def _cpu_model() -> str:
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor()
+
+
+def machine_info(backend: str) -> Dict[str, Any]:
+    import numpy as np
+
+    return {
+        "node": platform.node(),
+        "system": platform.system(),
+        "arch": platform.machine(),
+        "cpu": _cpu_model(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "backend": backend,
+    }
+
+
+def machine_fingerprint(info: Dict[str, Any]) -> str:
+    """
+    Short stable hash of :func:`machine_info` minus the hostname (CI runners get
+    a new one per job); runs are comparable only within one fingerprint.
+    """
+
+    blob = json.dumps({k: v for k, v in info.items() if k != "node"}, sort_keys=True)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:12]
+
+
+def make_records(
+    results: Sequence[Dict[str, Any]],
+    sha: str,
+    machine: Dict[str, Any],
+    timestamp: int,
+    mode: str,
+) -> List[Dict[str, Any]]:
+    """One history record per timed (not skipped) bench result."""
+
+    fp = machine_fingerprint(machine)
+    return [
+        {
+            "timestamp": timestamp,
+            "sha": sha,
+            "machine": fp,
+            "machine_info": machine,
+            "mode": mode,
+            "case": r["case"],
+            "unit": r["unit"],
+            "units": r["units"],
+            "params": r["params"],
+            "samples_s": r["samples_s"],
+            "median_s": r["elapsed_s"]["median"],
+            "throughput_per_s": r["throughput_per_s"],
+        }
+        for r in results
+        if "samples_s" in r
+    ]
+
+
+def append_records(path: str, records: Sequence[Dict[str, Any]]) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        for rec in records:
+            f.write(json.dumps(rec, sort_keys=True) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def load_records(path: str) -> Iterator[Dict[str, Any]]:
+    """Records in file (= chronological) order; unparsable lines are skipped."""
+
+    try:
+        f = open(path, encoding="utf-8")
+    except FileNotFoundError:
+        return
+    with f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def find_baseline(
+    records: Sequence[Dict[str, Any]], current: Dict[str, Any], ref: str
+) -> Optional[Dict[str, Any]]:
+    """Latest record comparable with ``current`` whose SHA starts with ``ref`` (or any)."""
+
+    for rec in reversed(records):
+        if (rec["case"], rec["machine"], rec["params"]) != (
+            current["case"],
+            current["machine"],
+            current["params"],
+        ):
+            continue
+        if ref == "previous" or rec["sha"].startswith(ref):
+            return rec
+    return None
+
+
+def _ranks(values: Sequence[float]) -> Tuple[List[float], bool]:
+    order = sorted(range(len(values)), key=values.__getitem__)
+    ranks = [0.0] * len(values)
+    ties = False
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        ties |= j > i
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2.0 + 1.0
+        i = j + 1
+    return ranks, ties
+
+
+def _exact_upper_tail(u: int, n1: int, n2: int) -> float:
+    # counts[j][s]: orderings of i x's and j y's with s (x > y) pairs, built
+    # up over i.  The largest element is either an x (beating all j y's) or a y.
+    counts = [[1] for _ in range(n2 + 1)]
+    for _ in range(n1):
+        new = [[1]]
+        for j in range(1, n2 + 1):
+            a, b = counts[j], new[j - 1]  # largest is an x / a y
+            row = [0] * max(len(a) + j, len(b))
+            for s, c in enumerate(a):
+                row[s + j] += c
+            for s, c in enumerate(b):
+                row[s] += c
+            new.append(row)
+        counts = new
+    dist = counts[n2]
+    return sum(dist[u:]) / sum(dist)
+
+
+def mann_whitney_greater(x: Sequence[float], y: Sequence[float]) -> Tuple[float, float]:
+    """``(U, p)`` for the one-sided alternative "``x`` tends to be larger than ``y``"."""
+
+    n1, n2 = len(x), len(y)
+    if not n1 or not n2:
+        return 0.0, 1.0
+    ranks, ties = _ranks(list(x) + list(y))
+    u = sum(ranks[:n1]) - n1 * (n1 + 1) / 2.0
+    if not ties and max(n1, n2) <= _EXACT_MAX_N:
+        return u, _exact_upper_tail(int(u), n1, n2)
+    n = n1 + n2
+    counts: Dict[float, int] = {}
+    for v in list(x) + list(y):
+        counts[v] = counts.get(v, 0) + 1
+    tie_term = sum(t**3 - t for t in counts.values()) / (n * (n - 1))
+    sigma = math.sqrt(n1 * n2 / 12.0 * ((n + 1) - tie_term))
+    if sigma == 0:
+        return u, 1.0
+    z = (u - n1 * n2 / 2.0 - 0.5) / sigma
+    return u, 1.0 - NormalDist().cdf(z)
+
+
+def compare(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    alpha: float = DEFAULT_ALPHA,
+    outlier_k: float = 1.5,
+) -> Dict[str, Any]:
+    """Regression verdict for one case: ``current`` vs ``baseline`` records."""
+
+    cur, _ = reject_outliers(current["samples_s"], outlier_k)
+    base, _ = reject_outliers(baseline["samples_s"], outlier_k)
+    change = median(cur) / median(base) - 1.0
+    _, p = mann_whitney_greater(cur, base)
+    return {
+        "case": current["case"],
+        "baseline_sha": baseline["sha"],
+        "baseline_median_s": median(base),
+        "median_s": median(cur),
+        "change": change,
+        "p_value": p,
+        "threshold": threshold,
+        "regression": change > threshold and p < alpha,
+    }
+
+
+def parse_thresholds(items: Sequence[str]) -> Dict[str, float]:
+    """``["sieve=0.05", "engine=0.2"]`` → per-case slowdown thresholds."""
+
+    out: Dict[str, float] = {}
+    for item in items:
+        case, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"expected case=fraction, got {item!r}")
+        out[case] = float(value)
+    return out
+
+
+def trend_rows(
+    records: Sequence[Dict[str, Any]],
+    case: Optional[str] = None,
+    machine: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Rows for the trend CSV: the bench chart columns plus case, unit, SHA and machine."""
+
+    return [
+        {
+            "timestamp": rec["timestamp"],
+            "mode": rec["mode"],
+            "traces": rec["units"],
+            "throughput_traces_per_s": f"{rec['throughput_per_s']:.3f}",
+            "elapsed_s": f"{rec['median_s']:.6f}",
+            "case": rec["case"],
+            "unit": rec["unit"],
+            "sha": rec["sha"],
+            "machine": rec["machine"],
+        }
+        for rec in records
+        if (case is None or rec["case"] == case) and (machine is None or rec["machine"] == machine)
+    ]
+
+
+def format_trend(rows: Sequence[Dict[str, Any]]) -> str:
+    """Text table per case: median, throughput and change vs the previous row."""
+
+    lines = [f"{'case':<9} {'sha':<12} {'machine':<12} {'median_s':>10} {'per_s':>12} {'Δ':>7}"]
+    last: Dict[Tuple[str, str], float] = {}
+    for row in sorted(rows, key=lambda r: (r["case"], r["machine"], r["timestamp"])):
+        key = (row["case"], row["machine"])
+        med = float(row["elapsed_s"])
+        delta = f"{100.0 * (med / last[key] - 1.0):+6.1f}%" if key in last else ""
+        last[key] = med
+        lines.append(
+            f"{row['case']:<9} {row['sha'][:12]:<12} {row['machine']:<12} {med:>10.6f} "
+            f"{float(row['throughput_traces_per_s']):>12.0f} {delta:>7}"
+        )
+    return "\n".join(lines)
+
+
+def write_trend_csv(path: str, rows: Sequence[Dict[str, Any]]) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=TREND_COLUMNS)
+        w.writeheader()
+        w.writerows(rows)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark trend report from a history file")
+    ap.add_argument("history", help="JSONL written by bench.py --history")
+    ap.add_argument("--case", help="only this case (e.g. sieve for the chart input)")
+    ap.add_argument("--machine", help="only this machine fingerprint")
+    ap.add_argument("--csv", help="also write the trend as CSV here")
+    args = ap.parse_args(argv)
+
+    rows = trend_rows(list(load_records(args.history)), args.case, args.machine)
+    print(format_trend(rows))
+    if args.csv:
+        write_trend_csv(args.csv, rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+"""Scaling sweep behind ``bench.py --sweep``: problem size × workers × dtype.
+
+Workloads:
+
+* ``sieve``: traces × ``TRACE_LEN`` × dtype, serial (workers = 1, the path
+  ``sieve.py`` runs by default) or on :func:`brain.sieve.parallel.run_parallel`.
+  The batch size is fixed per size, so every worker count does the same work.
+* ``engine``: motif corpus size × workers on :class:`ShardedEngineRunner`
+  (workers = 1 runs in-process, the baseline).
+* ``tseitin``: CNF generation (``dump_dimacs``) over expander size ``n``.  It
+  is single-process, so it contributes a size curve only.
+
+Within each series (workload, size, dtype) every point gets its speedup over
+the smallest worker count and its parallel efficiency (speedup / worker
+ratio).  A step is flagged ``flat`` when doubling-style increases in workers
+buy less than ``flat_gain`` of the ideal extra throughput; the first such
+step is reported as the series' knee.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import math
+import os
+import sys
+import tempfile
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from brain.benchmarks._compat import ensure_engine_importable
+from brain.benchmarks.engine_batch import motif_corpus
+from brain.benchmarks.engine_scaling import worker_counts
+from brain.benchmarks.harness import Case, SkipCase, run_case
+from brain.benchmarks.suite import SIEVE_MEM_BYTES, tseitin_case
+from brain.sieve.kernel import SieveParams, auto_batch, batch_maxima
+from brain.sieve.parallel import run_parallel
+
+ensure_engine_importable()
+
+from brain.sharded import ShardedEngineRunner  # noqa: E402
+
+SWEEP_COLUMNS = (
+    "workload",
+    "size",
+    "length",
+    "dtype",
+    "workers",
+    "median_s",
+    "throughput_per_s",
+    "unit",
+    "speedup",
+    "efficiency",
+    "flat",
+)
+_TS = "2025-01-01T00:00:00Z"
+
+
+@dataclass
+class SweepGrid:
+    traces: Sequence[int] = (100_000, 400_000)
+    lengths: Sequence[int] = (48,)
+    dtypes: Sequence[str] = ("float64", "float32")
+    items: Sequence[int] = (2_000, 8_000)
+    tseitin: Sequence[int] = (20, 60, 120)
+    workers: Sequence[int] = field(default_factory=lambda: worker_counts(os.cpu_count() or 1))
+
+
+def sieve_batch(traces: int, length: int, params: SieveParams, max_workers: int) -> int:
+    """Batch size for a sweep point: enough batches to feed ``max_workers``, within budget."""
+
+    per_worker = math.ceil(traces / (4 * max_workers))
+    return max(1, min(per_worker, auto_batch(SIEVE_MEM_BYTES, length, params)))
+
+
+def sieve_case(
+    traces: int, length: int, dtype: str, workers: int, batch: int, xp: Any, backend: str
+) -> Case:
+    params = SieveParams(dtype=dtype)
+
+    def setup() -> Callable[[], Any]:
+        if workers == 1:
+
+            def serial() -> int:
+                hits = 0
+                for b, start in enumerate(range(0, traces, batch)):
+                    m = batch_maxima(xp, 42, b, min(batch, traces - start), length, params)
+                    hits += int(xp.count_nonzero(m > params.np_threshold))
+                return hits
+
+            return serial
+        if xp is not np:
+            raise SkipCase("multi-worker sieve is CPU-only")
+        return lambda: run_parallel(lambda *_: None, traces, batch, length, 42, params, workers)
+
+    return Case(
+        "sieve",
+        setup,
+        traces,
+        "traces",
+        backend if workers == 1 else "cpu",
+        {"traces": traces, "length": length, "dtype": dtype, "workers": workers, "batch": batch},
+    )
+
+
+@contextlib.contextmanager
+def _quiet_stderr() -> Iterator[None]:
+    # ShardedEngineRunner prints refinement feedback to stderr, in pool
+    # workers too; they inherit fd 2, so swap the descriptor, not just sys.stderr.
+    sys.stderr.flush()
+    saved = os.dup(2)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    try:
+        os.dup2(devnull, 2)
+        with contextlib.redirect_stderr(io.StringIO()):
+            yield
+    finally:
+        os.dup2(saved, 2)
+        os.close(saved)
+        os.close(devnull)
+
+
+def engine_case(items: int, workers: int, chunk_size: int = 256) -> Case:
+    def setup() -> Callable[[], Any]:
+        corpus = motif_corpus(items)
+        runner = ShardedEngineRunner(workers=workers, chunk_size=chunk_size)
+
+        def run() -> int:
+            with _quiet_stderr():
+                return sum(1 for _ in runner.iter_run(corpus, timestamp=_TS))
+
+        return run
+
+    return Case(
+        "engine",
+        setup,
+        items,
+        "motif_lists",
+        params={"items": items, "workers": workers, "chunk_size": chunk_size},
+    )
+
+
+def sweep_cases(grid: SweepGrid, xp: Any, backend: str, workdir: Path) -> List[Case]:
+    cases: List[Case] = []
+    top = max(grid.workers)
+    for length in grid.lengths:
+        for dtype in grid.dtypes:
+            for traces in grid.traces:
+                batch = sieve_batch(traces, length, SieveParams(dtype=dtype), top)
+                for w in grid.workers:
+                    cases.append(sieve_case(traces, length, dtype, w, batch, xp, backend))
+    for items in grid.items:
+        for w in grid.workers:
+            cases.append(engine_case(items, w))
+    for n in grid.tseitin:
+        case = tseitin_case(n, workdir)
+        case.params["workers"] = 1
+        cases.append(case)
+    return cases
+
+
+def _series_key(res: Dict[str, Any]) -> Tuple[str, int, Optional[int], str]:
+    p = res["params"]
+    size = p.get("traces", p.get("items", p.get("n")))
+    return res["case"], size, p.get("length"), p.get("dtype", "-")
+
+
+def scaling_rows(
+    results: Sequence[Dict[str, Any]], flat_gain: float = 0.25
+) -> List[Dict[str, Any]]:
+    """One row per timed point with speedup, efficiency and the ``flat`` flag."""
+
+    series: Dict[Tuple[str, int, Optional[int], str], List[Dict[str, Any]]] = {}
+    for res in results:
+        if "throughput_per_s" in res:
+            series.setdefault(_series_key(res), []).append(res)
+    rows: List[Dict[str, Any]] = []
+    for (workload, size, length, dtype), points in series.items():
+        points.sort(key=lambda r: r["params"]["workers"])
+        base_w = points[0]["params"]["workers"]
+        base_tp = points[0]["throughput_per_s"]
+        prev: Optional[Tuple[int, float]] = None
+        for res in points:
+            w, tp = res["params"]["workers"], res["throughput_per_s"]
+            speedup = tp / base_tp if base_tp else 0.0
+            flat = False
+            if prev is not None:
+                ideal = w / prev[0]
+                flat = tp / prev[1] < 1.0 + flat_gain * (ideal - 1.0)
+            prev = (w, tp)
+            rows.append(
+                {
+                    "workload": workload,
+                    "size": size,
+                    "length": length if length is not None else "",
+                    "dtype": dtype,
+                    "workers": w,
+                    "median_s": res["elapsed_s"]["median"],
+                    "throughput_per_s": tp,
+                    "unit": res["unit"],
+                    "speedup": speedup,
+                    "efficiency": speedup / (w / base_w),
+                    "flat": flat,
+                }
+            )
+    return rows
+
+
+def knees(rows: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """First flat step per series: where more workers stop paying off."""
+
+    seen = set()
+    out = []
+    for row in rows:
+        key = (row["workload"], row["size"], row["length"], row["dtype"])
+        if row["flat"] and key not in seen:
+            seen.add(key)
+            out.append(
+                {
+                    "workload": row["workload"],
+                    "size": row["size"],
+                    "length": row["length"],
+                    "dtype": row["dtype"],
+                    "flattens_at_workers": row["workers"],
+                    "speedup": row["speedup"],
+                }
+            )
+    return out
+
+
+def format_rows(rows: Sequence[Dict[str, Any]]) -> str:
+    lines = [
+        f"{'workload':<8} {'size':>9} {'len':>4} {'dtype':<8} {'workers':>7} "
+        f"{'per_s':>12} {'speedup':>8} {'eff':>5}"
+    ]
+    for r in rows:
+        lines.append(
+            f"{r['workload']:<8} {r['size']:>9} {r['length']!s:>4} {r['dtype']:<8} "
+            f"{r['workers']:>7} {r['throughput_per_s']:>12.0f} {r['speedup']:>8.2f} "
+            f"{r['efficiency']:>5.2f}" + ("  flat" if r["flat"] else "")
+        )
+    return "\n".join(lines)
+
+
+def run_sweep(
+    grid: SweepGrid,
+    xp: Any,
+    backend: str,
+    warmup: int = 1,
+    repeats: int = 3,
+    k: float = 1.5,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """Run every grid point; returns the grid, raw results, scaling rows and knees."""
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench-sweep-"))
+    results = []
+    for case in sweep_cases(grid, xp, backend, workdir):
+        res = run_case(case, warmup, repeats, k)
+        results.append(res)
+        if progress is not None:
+            progress(res)
+    rows = scaling_rows(results)
+    return {"grid": asdict(grid), "results": results, "rows": rows, "knees": knees(rows)}
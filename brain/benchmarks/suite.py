@@ -0,0 +1,165 @@
+"""The hot paths ``bench.py`` times, as :class:`~brain.benchmarks.harness.Case` builders.
+
+* ``sieve``: trace generation plus the per-trace max reduction
+  (:func:`brain.sieve.kernel.batch_maxima`, the path ``sieve.py`` runs), on
+  NumPy or CuPy depending on the selected backend,
+* ``engine``: :meth:`UnifiedEngine.run_engine` over the motif corpus of
+  :mod:`brain.benchmarks.engine_batch`,
+* ``tseitin``: :func:`tseitin_cnf` + :func:`dump_dimacs` for one expander,
+* ``drat``: :func:`drat_proof_and_hash` on that CNF,
+* ``capsules``: JSON-Schema validation of ``capsules/*.json`` (needs
+  ``jsonschema``; skipped without it).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from brain.benchmarks._compat import REPO, ensure_engine_importable
+from brain.benchmarks.drat_check import drat_proof_and_hash
+from brain.benchmarks.engine_batch import motif_corpus
+from brain.benchmarks.harness import Case, SkipCase
+from brain.benchmarks.tseitin_expander import dump_dimacs, expander_graph, tseitin_cnf
+from brain.sieve.kernel import SieveParams, auto_batch, batch_maxima
+
+ensure_engine_importable()
+
+from brain.unified_engine import UnifiedEngine  # noqa: E402
+
+MODES = ("auto", "cpu", "gpu")
+CASES = ("sieve", "engine", "tseitin", "drat", "capsules")
+SIEVE_MEM_BYTES = 256 << 20
+
+
+def select_backend(mode: str) -> Tuple[Any, str]:
+    """``(array module, backend name)`` for ``mode``; ``gpu`` raises if CuPy has no device."""
+
+    if mode not in MODES:
+        raise ValueError(f"unknown mode {mode!r}; expected one of {MODES}")
+    if mode != "cpu":
+        try:
+            import cupy as cp  # type: ignore
+
+            cp.cuda.runtime.getDeviceCount()
+            return cp, "cuda"
+        except Exception as exc:
+            if mode == "gpu":
+                raise RuntimeError(f"--mode gpu needs CuPy with a CUDA device: {exc}") from exc
+    return np, "cpu"
+
+
+def _sync(xp: Any) -> Optional[Callable[[], None]]:
+    if xp is np:
+        return None
+    return lambda: xp.cuda.Device().synchronize()
+
+
+def sieve_case(
+    traces: int, length: int, xp: Any, backend: str, dtype: str = "float64", seed: int = 42
+) -> Case:
+    params = SieveParams(dtype=dtype)
+    batch = min(traces, auto_batch(SIEVE_MEM_BYTES, length, params)) or 1
+
+    def setup() -> Callable[[], Any]:
+        def run() -> int:
+            hits = 0
+            for b, start in enumerate(range(0, traces, batch)):
+                m = batch_maxima(xp, seed, b, min(batch, traces - start), length, params)
+                hits += int(xp.count_nonzero(m > params.np_threshold))
+            return hits
+
+        return run
+
+    return Case(
+        "sieve",
+        setup,
+        traces,
+        "traces",
+        backend,
+        {"traces": traces, "length": length, "dtype": dtype, "batch": batch},
+        _sync(xp),
+    )
+
+
+def engine_case(items: int) -> Case:
+    def setup() -> Callable[[], Any]:
+        corpus = motif_corpus(items)
+        engine = UnifiedEngine()
+
+        def run() -> None:
+            with contextlib.redirect_stdout(io.StringIO()):
+                for motifs in corpus:
+                    engine.run_engine(motifs)
+
+        return run
+
+    return Case("engine", setup, items, "motif_lists", params={"items": items})
+
+
+def tseitin_case(n: int, workdir: Path) -> Case:
+    clauses = len(tseitin_cnf(expander_graph(n)))
+
+    def setup() -> Callable[[], Any]:
+        out = workdir / f"tseitin{n}.cnf"
+        return lambda: dump_dimacs(n, out)
+
+    return Case("tseitin", setup, clauses, "clauses", params={"n": n})
+
+
+def drat_case(n: int, workdir: Path) -> Case:
+    def setup() -> Callable[[], Any]:
+        cnf = workdir / f"drat{n}.cnf"
+        dump_dimacs(n, cnf)
+        return lambda: drat_proof_and_hash(cnf)
+
+    return Case("drat", setup, 1, "proofs", params={"n": n})
+
+
+def capsule_case(capsule_dir: Path = REPO / "capsules") -> Case:
+    paths = sorted(p for p in capsule_dir.glob("*.json") if not p.name.startswith("_"))
+
+    def setup() -> Callable[[], Any]:
+        try:
+            from jsonschema import Draft202012Validator, FormatChecker
+        except ImportError as exc:
+            raise SkipCase(f"jsonschema not installed ({exc})") from exc
+        schema = json.loads((REPO / "schema" / "capsule.schema.json").read_text(encoding="utf-8"))
+        validator = Draft202012Validator(schema, format_checker=FormatChecker())
+        docs = [json.loads(p.read_text(encoding="utf-8")) for p in paths]
+
+        def run() -> int:
+            return sum(1 for doc in docs for _ in validator.iter_errors(doc))
+
+        return run
+
+    return Case("capsules", setup, len(paths), "capsules", params={"files": len(paths)})
+
+
+def build_cases(
+    names: List[str],
+    traces: int,
+    length: int,
+    xp: Any,
+    backend: str,
+    items: int,
+    tseitin_n: int,
+    workdir: Optional[Path] = None,
+) -> List[Case]:
+    """The requested cases, in :data:`CASES` order; CNF files go under ``workdir``."""
+
+    workdir = workdir or Path(tempfile.mkdtemp(prefix="bench-"))
+    builders: Dict[str, Callable[[], Case]] = {
+        "sieve": lambda: sieve_case(traces, length, xp, backend),
+        "engine": lambda: engine_case(items),
+        "tseitin": lambda: tseitin_case(tseitin_n, workdir),
+        "drat": lambda: drat_case(tseitin_n, workdir),
+        "capsules": lambda: capsule_case(),
+    }
+    return [builders[name]() for name in CASES if name in names]
@@ -0,0 +1,6 @@
+"""Helpers for the Day-2 entropy sieve (``sieve.py``).
+
+``sieve.py`` stays the env-configured entry point (and the Jupytext pair of
+``sieve.ipynb``); the reusable pieces live here so they can be imported by
+tools, tests and worker processes.
+"""
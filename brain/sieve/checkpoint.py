@@ -0,0 +1,79 @@
+"""Atomic checkpoints for long sieve runs.
+
+A checkpoint is one JSON document holding the run configuration, the next
+batch to generate, running totals, the merged sketch and the output writer's
+state (rows, byte offsets).  Every batch draws from its own
+``SeedSequence(seed, spawn_key=(batch,))`` stream, so the RNG state to resume
+from is just the seed and the next batch index.
+
+Writes go to a temporary file in the same directory, are fsynced and then
+renamed over the previous checkpoint, so a crash leaves either the old or the
+new checkpoint, never a torn one.  The writer is checkpointed (fsynced) first,
+so the output always holds at least what the checkpoint claims.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from typing import Any, Dict, Optional
+
+CHECKPOINT_VERSION = "sieve-ckpt-1"
+
+
+def default_checkpoint_path(meta_path: str) -> str:
+    return meta_path + ".ckpt"
+
+
+def save_checkpoint(path: str, state: Dict[str, Any]) -> None:
+    """Atomically replace ``path`` with ``state`` (plus the format version)."""
+
+    d = os.path.dirname(os.path.abspath(path))
+    os.makedirs(d, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".ckpt-", dir=d)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"version": CHECKPOINT_VERSION, **state}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    try:  # make the rename itself durable
+        dir_fd = os.open(d, os.O_RDONLY)
+    except OSError:  # pragma: no cover - e.g. Windows
+        return
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+def load_checkpoint(path: str) -> Optional[Dict[str, Any]]:
+    """The checkpoint at ``path``, or None if there is none."""
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return None
+    if state.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"{path}: unsupported checkpoint version {state.get('version')!r}")
+    return state
+
+
+def clear_checkpoint(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def config_mismatch(saved: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """``{key: (checkpoint value, current value)}`` for every differing setting."""
+
+    keys = sorted(set(saved) | set(current))
+    return {k: (saved.get(k), current.get(k)) for k in keys if saved.get(k) != current.get(k)}
@@ -0,0 +1,159 @@
+"""Trace generation shared by the serial and parallel sieve paths.
+
+Every batch ``b`` draws from its own stream, derived as
+``SeedSequence(seed, spawn_key=(b,))`` (exactly the ``b``-th child of
+``SeedSequence(seed).spawn``).  A batch therefore produces the same numbers no
+matter which process generates it or in what order, which is what makes the
+output independent of the worker count.  The output does depend on ``BATCH``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Tuple
+
+import numpy as np
+
+
+# Default column chunk of the fused kernel: a handful of (chunk, n) blocks
+# stay cache-friendly while the per-chunk Python overhead stays negligible.
+DEFAULT_CHUNK = 16
+DTYPES = ("float64", "float32")
+
+
+@dataclass(frozen=True)
+class SieveParams:
+    """
+    Trace model parameters (see ``sieve.py`` for the env names), plus the
+    kernel choice: ``fused`` streams over ``chunk`` columns at a time,
+    ``dtype`` is the compute precision (float32 halves memory and bandwidth
+    but is a different, coarser stream than float64).
+    """
+
+    np_threshold: float = 0.09
+    spike_prob: float = 0.035
+    noise_sigma: float = 0.02
+    dtype: str = "float64"
+    fused: bool = True
+    chunk: int = DEFAULT_CHUNK
+
+
+def batch_seed_sequence(seed: int, batch: int) -> np.random.SeedSequence:
+    """Independent, order-free stream for batch ``batch`` of a run seeded with ``seed``."""
+
+    return np.random.SeedSequence(seed, spawn_key=(batch,))
+
+
+def batch_rng(xp: Any, seed: int, batch: int) -> Any:
+    """NumPy ``Generator`` (or a seeded CuPy ``RandomState``) for one batch."""
+
+    ss = batch_seed_sequence(seed, batch)
+    if xp is np:
+        return np.random.default_rng(ss)
+    return xp.random.RandomState(int(ss.generate_state(1, np.uint32)[0]))
+
+
+def rng_rand(rng: Any, shape: Tuple[int, ...]) -> Any:
+    if isinstance(rng, np.random.Generator):
+        return rng.random(shape)
+    return rng.rand(*shape)
+
+
+def rng_normal(rng: Any, shape: Tuple[int, ...], sigma: float, dtype: Any = np.float64) -> Any:
+    noise = rng.standard_normal(size=shape, dtype=dtype)
+    noise *= sigma
+    return noise
+
+
+def _row_draws(xp: Any, rng: Any, n: int, params: SieveParams) -> Tuple[Any, Any]:
+    # Per-trace base level and spike increment, drawn before any noise so
+    # that the noise stream can be consumed column chunk by column chunk.
+    dt = xp.dtype(params.dtype)
+    base = (0.03 + 0.03 * rng_rand(rng, (n,))).astype(dt)  # [0.03, 0.06)
+    spikes = (rng_rand(rng, (n,)) < params.spike_prob).astype(dt)
+    spike_height = params.np_threshold + 0.02 + 0.05 * rng_rand(rng, (n,))
+    return base, spikes * spike_height.astype(dt)
+
+
+def spike_column(length: int) -> int:
+    """Column of the injected spike (near the last third)."""
+
+    return int(0.66 * length)
+
+
+def gen_traces(xp: Any, rng: Any, n: int, length: int, params: SieveParams) -> Any:
+    """
+    ``n`` entropy traces of ``length`` steps with an occasional late spike,
+    materialised as an ``(n, length)`` array.  Noise is drawn time-major, the
+    order :func:`fused_maxima` consumes it in, so both agree bit for bit.
+    """
+
+    base, spike = _row_draws(xp, rng, n, params)
+    noise = rng_normal(rng, (length, n), params.noise_sigma, params.dtype).T
+    traces = xp.clip(base[:, None] + noise.cumsum(axis=1) / length, 0, None)
+    traces[:, spike_column(length)] += spike
+    return traces
+
+
+def fused_maxima(xp: Any, rng: Any, n: int, length: int, params: SieveParams) -> Any:
+    """
+    Per-trace max of :func:`gen_traces` without building the trace matrix:
+    noise arrives in ``(chunk, n)`` blocks and only the running cumsum and
+    running max survive between blocks, so memory is O(n * chunk).
+    """
+
+    base, spike = _row_draws(xp, rng, n, params)
+    k = spike_column(length)
+    chunk = max(1, params.chunk)
+    carry = None
+    runmax = None
+    for j in range(0, length, chunk):
+        block = rng_normal(rng, (min(chunk, length - j), n), params.noise_sigma, params.dtype)
+        if carry is not None:
+            block[0] += carry  # sequential (carry + x0) + x1 ..., exactly as one cumsum
+        xp.cumsum(block, axis=0, out=block)
+        carry = block[-1].copy()
+        block /= length
+        block += base
+        xp.maximum(block, 0, out=block)
+        if j <= k < j + len(block):
+            block[k - j] += spike
+        peak = block.max(axis=0)
+        del block  # release before the next draw: one block alive at a time
+        runmax = peak if runmax is None else xp.maximum(runmax, peak, out=runmax)
+    if runmax is None:
+        return xp.zeros(n, dtype=params.dtype)
+    return runmax
+
+
+def batch_maxima(
+    xp: Any, seed: int, batch: int, n: int, length: int, params: SieveParams
+) -> Any:
+    """Per-trace max ΔΦ of batch ``batch`` (``n`` traces), fused or dense per ``params``."""
+
+    rng = batch_rng(xp, seed, batch)
+    if params.fused:
+        return fused_maxima(xp, rng, n, length, params)
+    return gen_traces(xp, rng, n, length, params).max(axis=1)
+
+
+def bytes_per_trace(length: int, params: SieveParams) -> int:
+    """Approximate peak working set per trace of one batch, outputs included."""
+
+    item = np.dtype(params.dtype).itemsize
+    out = 8 + 1  # float64 max + hit flag handed to the writer
+    if params.fused:
+        # noise block (cumsum in place) + its max + base, spike, carry, runmax
+        return item * (min(params.chunk, length) + 5) + out
+    # noise, cumsum, clipped traces (+ one expression temporary)
+    return item * (4 * length + 3) + out
+
+
+def auto_batch(budget_bytes: int, length: int, params: SieveParams) -> int:
+    """
+    Largest batch whose working set fits ``budget_bytes`` (per process),
+    rounded down to a multiple of 1024 once it exceeds that.
+    """
+
+    size = max(1, int(budget_bytes) // bytes_per_trace(max(1, length), params))
+    return size - size % 1024 if size > 1024 else size
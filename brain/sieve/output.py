@@ -0,0 +1,447 @@
+"""Pluggable per-trace output writers for the entropy sieve.
+
+Three layouts share one column set (``trace_id``, ``max_delta_phi``,
+``np_hit``) plus the per-run constants ``length`` and ``backend``:
+
+``csv``
+    The historical ``trace_id,max_delta_phi,np_hit,length,backend`` file,
+    byte-for-byte what ``csv.writer`` produced, but rendered a batch at a time.
+``npy``
+    A directory of ``.npy`` columns preallocated with ``open_memmap`` and filled
+    in place, plus ``columns.json``.  Readers can memory-map single columns.
+``npz``
+    A deflate-compressed zip holding one ``<column>/<chunk>.npy`` entry per
+    batch plus ``manifest.json``; written as a stream, never held in memory.
+
+The ``summary`` output mode writes no per-trace file at all; the run is then
+described only by the sketch in the meta JSON (:mod:`brain.sieve.sketch`).
+
+Every writer can ``checkpoint()``: make what it has written durable and return
+a small JSON-able state (rows, byte offsets, zip entries).  Passing that state
+back as ``resume=`` reopens the output, drops anything written after the
+checkpoint and carries on appending.
+
+:func:`load_columns` and :func:`summarize` read any of them back.
+"""
+
+from __future__ import annotations
+
+import abc
+import csv
+import json
+import os
+import struct
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+
+FORMATS = ("csv", "npy", "npz")
+SUMMARY = "summary"
+OUTPUT_MODES = FORMATS + (SUMMARY,)
+COLUMNS = ("trace_id", "max_delta_phi", "np_hit")
+CSV_HEADER = ("trace_id", "max_delta_phi", "np_hit", "length", "backend")
+MANIFEST_VERSION = "sieve-columns-1"
+
+_DTYPES = {"trace_id": np.int64, "max_delta_phi": np.float64, "np_hit": np.uint8}
+
+PathLike = Union[str, os.PathLike]
+
+
+def default_output_path(csv_path: PathLike, fmt: str) -> str:
+    """Output location for ``fmt`` next to the configured ``CSV_PATH``."""
+
+    if fmt == "csv":
+        return str(csv_path)
+    if fmt == SUMMARY:
+        return ""
+    base, _ = os.path.splitext(str(csv_path))
+    return base + (".cols" if fmt == "npy" else ".npz")
+
+
+def _manifest(n_traces: int, length: int, backend: str) -> Dict[str, Any]:
+    return {
+        "format": MANIFEST_VERSION,
+        "n_traces": n_traces,
+        "length": length,
+        "backend": backend,
+        "columns": {name: np.dtype(dt).str for name, dt in _DTYPES.items()},
+    }
+
+
+def _truncate_npy(path: str, rows: int) -> None:
+    # Shrink a preallocated 1-D .npy to its first ``rows`` in place: rewrite the
+    # shape in the header (space-padded to the same length) and cut the data.
+    fmt = np.lib.format
+    with open(path, "r+b") as f:
+        version = fmt.read_magic(f)
+        read = fmt.read_array_header_1_0 if version == (1, 0) else fmt.read_array_header_2_0
+        shape, fortran, dtype = read(f)
+        offset = f.tell()
+        if shape[0] <= rows:
+            return
+        text = "{'descr': %r, 'fortran_order': %r, 'shape': (%d,), }" % (
+            fmt.dtype_to_descr(dtype), fortran, rows
+        )
+        size_fmt = "<H" if version == (1, 0) else "<I"
+        header_len = offset - fmt.MAGIC_LEN - struct.calcsize(size_fmt)
+        prefix = fmt.magic(*version) + struct.pack(size_fmt, header_len)
+        body = text.encode("latin1").ljust(offset - len(prefix) - 1) + b"\n"
+        f.seek(0)
+        f.write(prefix + body)
+        f.truncate(offset + rows * dtype.itemsize)
+
+
+class SieveWriter(abc.ABC):
+    """Base class: ``write`` one batch at a time, then ``close``."""
+
+    format = ""
+
+    def __init__(
+        self,
+        path: PathLike,
+        n_traces: int,
+        length: int,
+        backend: str,
+        resume: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.path = str(path)
+        self.n_traces = n_traces
+        self.length = length
+        self.backend = backend
+        self.written = int(resume["rows"]) if resume else 0
+
+    @abc.abstractmethod
+    def write(self, start: int, maxvals: np.ndarray, np_hits: np.ndarray) -> None:
+        """Store rows ``start .. start + len(maxvals)``."""
+
+    def checkpoint(self) -> Dict[str, Any]:
+        """Flush and fsync the output; returns the state ``resume=`` accepts."""
+
+        return {"rows": self.written}
+
+    def close(self) -> Dict[str, Any]:
+        """Finish the output; returns its description for the meta JSON."""
+
+        return {"format": self.format, "path": self.path, "rows": self.written}
+
+    def __enter__(self) -> "SieveWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+class CsvSieveWriter(SieveWriter):
+    """Vectorised CSV: one ``str.join`` per batch instead of a writerow per trace."""
+
+    format = "csv"
+
+    def __init__(
+        self,
+        path: PathLike,
+        n_traces: int,
+        length: int,
+        backend: str,
+        resume: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        super().__init__(path, n_traces, length, backend, resume)
+        if resume:
+            os.truncate(self.path, int(resume["offset"]))
+            self._f = open(self.path, "a", newline="")
+        else:
+            self._f = open(self.path, "w", newline="")
+            self._f.write(",".join(CSV_HEADER) + "\r\n")
+        self._suffix = f",{length},{backend}\r\n"
+
+    def write(self, start: int, maxvals: np.ndarray, np_hits: np.ndarray) -> None:
+        n = len(maxvals)
+        if not n:
+            return
+        # repr(float) is what csv.writer emits for floats, so bytes are unchanged.
+        rows = map(
+            "{},{!r},{}".format,
+            range(start, start + n),
+            np.asarray(maxvals, dtype=np.float64).tolist(),
+            np.asarray(np_hits).astype(np.int64).tolist(),
+        )
+        self._f.write(self._suffix.join(rows) + self._suffix)
+        self.written += n
+
+    def checkpoint(self) -> Dict[str, Any]:
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        return {"rows": self.written, "offset": os.fstat(self._f.fileno()).st_size}
+
+    def close(self) -> Dict[str, Any]:
+        if not self._f.closed:
+            self._f.close()
+        return super().close()
+
+
+class NpySieveWriter(SieveWriter):
+    """Memory-mapped ``.npy`` columns in a directory, sized up front."""
+
+    format = "npy"
+
+    def __init__(
+        self,
+        path: PathLike,
+        n_traces: int,
+        length: int,
+        backend: str,
+        resume: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        super().__init__(path, n_traces, length, backend, resume)
+        os.makedirs(self.path, exist_ok=True)
+        self._cols: Dict[str, np.ndarray] = {}
+        for name, dt in _DTYPES.items():
+            col_path = os.path.join(self.path, f"{name}.npy")
+            if not n_traces:  # zero-length files cannot be mapped
+                np.save(col_path, np.empty(0, dtype=dt))
+            elif resume:
+                # Preallocated: rows past the checkpoint are simply rewritten.
+                col = np.lib.format.open_memmap(col_path, mode="r+")
+                if col.shape != (n_traces,) or col.dtype != dt:
+                    raise ValueError(f"{col_path} does not match the resumed run")
+                self._cols[name] = col
+            else:
+                self._cols[name] = np.lib.format.open_memmap(
+                    col_path, mode="w+", dtype=dt, shape=(n_traces,)
+                )
+        self._open = True
+
+    def write(self, start: int, maxvals: np.ndarray, np_hits: np.ndarray) -> None:
+        n = len(maxvals)
+        stop = start + n
+        self._cols["trace_id"][start:stop] = np.arange(start, stop, dtype=np.int64)
+        self._cols["max_delta_phi"][start:stop] = maxvals
+        self._cols["np_hit"][start:stop] = np_hits
+        self.written += n
+
+    def checkpoint(self) -> Dict[str, Any]:
+        for col in self._cols.values():
+            col.flush()
+        return {"rows": self.written}
+
+    def close(self) -> Dict[str, Any]:
+        if self._open:
+            for col in self._cols.values():
+                col.flush()
+            self._cols = {}
+            self._open = False
+            if self.written < self.n_traces:  # early stop: drop the unused tail
+                for name in _DTYPES:
+                    _truncate_npy(os.path.join(self.path, f"{name}.npy"), self.written)
+            man = _manifest(self.written, self.length, self.backend)
+            with open(os.path.join(self.path, "columns.json"), "w", encoding="utf-8") as f:
+                json.dump(man, f, indent=2)
+        return super().close()
+
+
+_ZIPINFO_FIELDS = (
+    "filename",
+    "date_time",
+    "compress_type",
+    "CRC",
+    "compress_size",
+    "file_size",
+    "header_offset",
+    "flag_bits",
+    "extract_version",
+    "create_version",
+    "external_attr",
+)
+
+
+def _zipinfo(entry: list) -> zipfile.ZipInfo:
+    info = zipfile.ZipInfo(entry[0], tuple(entry[1]))
+    for field, value in zip(_ZIPINFO_FIELDS[2:], entry[2:]):
+        setattr(info, field, value)
+    return info
+
+
+class NpzSieveWriter(SieveWriter):
+    """Compressed columnar zip, one ``.npy`` entry per column per batch."""
+
+    format = "npz"
+
+    def __init__(
+        self,
+        path: PathLike,
+        n_traces: int,
+        length: int,
+        backend: str,
+        resume: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        super().__init__(path, n_traces, length, backend, resume)
+        if resume:
+            # Cut the torn tail, then start a fresh archive at the offset and
+            # re-register the checkpointed entries so the central directory
+            # written at close covers them too.
+            os.truncate(self.path, int(resume["offset"]))
+            self._fh = open(self.path, "r+b")
+            self._fh.seek(int(resume["offset"]))
+        else:
+            self._fh = open(self.path, "w+b")
+        self._zip: Optional[zipfile.ZipFile] = zipfile.ZipFile(
+            self._fh, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=6
+        )
+        self._chunk = 0
+        if resume:
+            for entry in resume["entries"]:
+                info = _zipinfo(entry)
+                self._zip.filelist.append(info)
+                self._zip.NameToInfo[info.filename] = info
+            self._chunk = int(resume["chunks"])
+
+    def _put(self, name: str, arr: np.ndarray) -> None:
+        assert self._zip is not None
+        with self._zip.open(f"{name}/{self._chunk:06d}.npy", "w", force_zip64=True) as f:
+            np.lib.format.write_array(f, arr, allow_pickle=False)
+
+    def write(self, start: int, maxvals: np.ndarray, np_hits: np.ndarray) -> None:
+        n = len(maxvals)
+        self._put("trace_id", np.arange(start, start + n, dtype=np.int64))
+        self._put("max_delta_phi", np.asarray(maxvals, dtype=np.float64))
+        self._put("np_hit", np.asarray(np_hits, dtype=np.uint8))
+        self._chunk += 1
+        self.written += n
+
+    def checkpoint(self) -> Dict[str, Any]:
+        assert self._zip is not None
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        return {
+            "rows": self.written,
+            "chunks": self._chunk,
+            "offset": self._fh.tell(),
+            "entries": [[getattr(i, f) for f in _ZIPINFO_FIELDS] for i in self._zip.filelist],
+        }
+
+    def close(self) -> Dict[str, Any]:
+        if self._zip is not None:
+            man = _manifest(self.written, self.length, self.backend)
+            self._zip.writestr("manifest.json", json.dumps(man, indent=2))
+            self._zip.close()
+            self._zip = None
+            self._fh.close()
+        return super().close()
+
+
+class NullSieveWriter(SieveWriter):
+    """Summary-only runs: counts rows, writes nothing."""
+
+    format = SUMMARY
+
+    def write(self, start: int, maxvals: np.ndarray, np_hits: np.ndarray) -> None:
+        self.written += len(maxvals)
+
+
+_WRITERS = {
+    "csv": CsvSieveWriter,
+    "npy": NpySieveWriter,
+    "npz": NpzSieveWriter,
+    SUMMARY: NullSieveWriter,
+}
+
+
+def open_writer(
+    fmt: str,
+    path: PathLike,
+    n_traces: int,
+    length: int,
+    backend: str,
+    resume: Optional[Dict[str, Any]] = None,
+) -> SieveWriter:
+    """Writer for ``fmt`` (one of :data:`OUTPUT_MODES`), resuming from a checkpoint state."""
+
+    try:
+        cls = _WRITERS[fmt]
+    except KeyError:
+        raise ValueError(
+            f"unknown sieve output format {fmt!r}; expected one of {OUTPUT_MODES}"
+        ) from None
+    d = os.path.dirname(str(path))
+    if d:
+        os.makedirs(d, exist_ok=True)
+    return cls(path, n_traces, length, backend, resume)
+
+
+def detect_format(path: PathLike) -> str:
+    """Infer the layout of an existing sieve output."""
+
+    p = Path(path)
+    if p.is_dir():
+        return "npy"
+    if zipfile.is_zipfile(p):
+        return "npz"
+    return "csv"
+
+
+def load_columns(path: PathLike, mmap: bool = True) -> Dict[str, Any]:
+    """
+    Read any sieve output back as ``{column: ndarray, "length": int,
+    "backend": str}``.  ``npy`` columns are memory-mapped unless ``mmap=False``.
+    """
+
+    fmt = detect_format(path)
+    if fmt == "npy":
+        with open(os.path.join(path, "columns.json"), encoding="utf-8") as f:
+            man = json.load(f)
+        out: Dict[str, Any] = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r" if mmap else None)[
+                : man["n_traces"]
+            ]
+            for name in COLUMNS
+        }
+        out.update(length=man["length"], backend=man["backend"])
+        return out
+    if fmt == "npz":
+        with zipfile.ZipFile(path) as zf:
+            man = json.loads(zf.read("manifest.json"))
+            names = sorted(n for n in zf.namelist() if n.endswith(".npy"))
+            parts: Dict[str, list] = {name: [] for name in COLUMNS}
+            for entry in names:
+                col = entry.split("/", 1)[0]
+                with zf.open(entry) as f:
+                    parts[col].append(np.lib.format.read_array(f, allow_pickle=False))
+        out = {
+            name: np.concatenate(chunks) if chunks else np.empty(0, dtype=_DTYPES[name])
+            for name, chunks in parts.items()
+        }
+        out.update(length=man["length"], backend=man["backend"])
+        return out
+    ids, vals, hits = [], [], []
+    length, backend = 0, ""
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        for row in reader:
+            ids.append(int(row[0]))
+            vals.append(float(row[1]))
+            hits.append(int(row[2]))
+            length, backend = int(row[3]), row[4]
+    return {
+        "trace_id": np.asarray(ids, dtype=np.int64),
+        "max_delta_phi": np.asarray(vals, dtype=np.float64),
+        "np_hit": np.asarray(hits, dtype=np.uint8),
+        "length": length,
+        "backend": backend,
+    }
+
+
+def summarize(path: PathLike) -> Dict[str, Any]:
+    """Row count, NP hits and max ΔΦ of any sieve output (format auto-detected)."""
+
+    cols = load_columns(path)
+    n = int(len(cols["trace_id"]))
+    hits = int(np.count_nonzero(cols["np_hit"]))
+    return {
+        "format": detect_format(path),
+        "n_traces": n,
+        "np_hits": hits,
+        "np_hits_pct": (100.0 * hits / n) if n else 0.0,
+        "max_delta_phi": float(cols["max_delta_phi"].max()) if n else 0.0,
+    }
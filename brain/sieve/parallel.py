@@ -0,0 +1,173 @@
+"""Multi-core CPU sieve: batches fan out to a process pool.
+
+Workers write per-trace maxima and NP-hit flags straight into shared-memory
+slot buffers; the parent hands each finished slot to the output writer in
+batch order and then reuses it.  Memory stays at ``window`` batches however
+long the run, and because every batch owns its RNG stream (see
+:mod:`brain.sieve.kernel`) the output is bit-identical for any worker count.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from brain.sieve.kernel import SieveParams, batch_maxima
+from brain.sieve.sketch import SieveSketch
+
+# Per-worker views onto the parent's shared buffers (set by _init_worker).
+_WORKER: Dict[str, Any] = {}
+
+
+def _watch_parent(ppid: int, interval: float = 1.0) -> None:
+    # A SIGKILLed parent (e.g. a preempted node) leaves pool workers blocked
+    # on the call queue forever; exit once the parent is gone.
+    def watch() -> None:
+        while True:
+            time.sleep(interval)
+            if os.getppid() != ppid:
+                os._exit(1)
+
+    threading.Thread(target=watch, name="sieve-parent-watch", daemon=True).start()
+
+
+def _init_worker(
+    max_name: str,
+    hit_name: str,
+    window: int,
+    batch: int,
+    seed: int,
+    length: int,
+    params: SieveParams,
+    sketch: Optional[SieveSketch],
+) -> None:
+    _watch_parent(os.getppid())
+    # Workers share the parent's resource tracker (fork and spawn alike), so
+    # attaching here needs no unregister; the parent alone unlinks.
+    max_shm = shared_memory.SharedMemory(name=max_name)
+    hit_shm = shared_memory.SharedMemory(name=hit_name)
+    _WORKER.update(
+        shms=(max_shm, hit_shm),
+        maxvals=np.ndarray((window, batch), dtype=np.float64, buffer=max_shm.buf),
+        hits=np.ndarray((window, batch), dtype=np.uint8, buffer=hit_shm.buf),
+        seed=seed,
+        length=length,
+        params=params,
+        sketch=sketch,
+    )
+
+
+def _run_batch(b: int, slot: int, size: int) -> Tuple[int, Optional[SieveSketch]]:
+    w: Dict[str, Any] = _WORKER
+    params: SieveParams = w["params"]
+    m = batch_maxima(np, w["seed"], b, size, w["length"], params)
+    hits = m > params.np_threshold
+    w["maxvals"][slot, :size] = m
+    w["hits"][slot, :size] = hits
+    sketch = None
+    if w["sketch"] is not None:
+        sketch = w["sketch"].empty()
+        sketch.update(m)
+    return int(np.count_nonzero(hits)), sketch
+
+
+def iter_batches(
+    n_traces: int,
+    batch: int,
+    length: int,
+    seed: int,
+    params: SieveParams,
+    workers: int,
+    prefetch: int = 2,
+    sketch: Optional[SieveSketch] = None,
+    first_batch: int = 0,
+) -> Iterator[Tuple[int, np.ndarray, np.ndarray, int, Optional[SieveSketch]]]:
+    """
+    Yield ``(start, maxvals, np_hits, hit_count, batch_sketch)`` per batch
+    from ``first_batch`` on, in batch order; ``batch_sketch`` is an
+    ``sketch.empty()`` filled by the worker (None without ``sketch``).  The
+    arrays are views into a reused shared slot: consume (write) them before
+    advancing the iterator.
+    """
+
+    n_batches = -(-n_traces // batch) if n_traces else 0
+    if first_batch >= n_batches:
+        return
+    window = max(1, min(n_batches - first_batch, workers * prefetch))
+    max_shm = shared_memory.SharedMemory(create=True, size=window * batch * 8)
+    hit_shm = shared_memory.SharedMemory(create=True, size=window * batch)
+    try:
+        maxvals = np.ndarray((window, batch), dtype=np.float64, buffer=max_shm.buf)
+        hits = np.ndarray((window, batch), dtype=np.uint8, buffer=hit_shm.buf)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(
+                max_shm.name, hit_shm.name, window, batch, seed, length, params, sketch
+            ),
+        ) as pool:
+            pending: Deque[Tuple[int, int, Future]] = deque()
+
+            def submit(b: int) -> None:
+                size = min(batch, n_traces - b * batch)
+                pending.append((b, size, pool.submit(_run_batch, b, b % window, size)))
+
+            for b in range(first_batch, first_batch + window):
+                submit(b)
+            next_b = first_batch + window
+            try:
+                while pending:
+                    b, size, fut = pending.popleft()
+                    count, batch_sketch = fut.result()
+                    slot = b % window
+                    yield b * batch, maxvals[slot, :size], hits[slot, :size], count, batch_sketch
+                    if next_b < n_batches:
+                        submit(next_b)
+                        next_b += 1
+            finally:
+                # Consumer stopped early (or failed): drop queued batches so
+                # shutdown only waits for the ones already running.
+                for _, _, fut in pending:
+                    fut.cancel()
+        del maxvals, hits
+    finally:
+        max_shm.close()
+        max_shm.unlink()
+        hit_shm.close()
+        hit_shm.unlink()
+
+
+def run_parallel(
+    write: Callable[[int, np.ndarray, np.ndarray], None],
+    n_traces: int,
+    batch: int,
+    length: int,
+    seed: int,
+    params: SieveParams,
+    workers: int,
+    progress: Optional[Callable[[int], None]] = None,
+    sketch: Optional[SieveSketch] = None,
+) -> Tuple[int, int]:
+    """
+    Run every batch on ``workers`` processes, feeding ``write`` in order;
+    returns (total, hits).  Per-batch sketches are merged into ``sketch``.
+    """
+
+    total = hits_total = 0
+    batches = iter_batches(n_traces, batch, length, seed, params, workers, sketch=sketch)
+    for start, m, h, count, batch_sketch in batches:
+        write(start, m, h)
+        if sketch is not None and batch_sketch is not None:
+            sketch.merge(batch_sketch)
+        total += len(m)
+        hits_total += count
+        if progress is not None:
+            progress(total)
+    return total, hits_total
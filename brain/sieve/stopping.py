@@ -0,0 +1,172 @@
+"""Confidence intervals for the NP hit rate and adaptive early stopping.
+
+``sieve.py`` with ``STOP_HALF_WIDTH`` set treats ``N_TRACES`` as a cap: after
+every batch it computes a Wilson or Clopper-Pearson interval for the hit rate
+and stops at the first batch boundary where the interval's half-width is at
+or below the target.  Batches are the unit of work (and of reproducibility),
+so a run never stops mid-batch.
+
+Checking after every batch is sequential testing: the realised coverage can
+sit slightly below the nominal confidence.  Clopper-Pearson is the
+conservative choice when that matters.  Both are pure Python (no SciPy).
+"""
+
+from __future__ import annotations
+
+import math
+from statistics import NormalDist
+from typing import Any, Callable, Dict, Optional, Tuple
+
+Interval = Tuple[float, float]
+
+
+def wilson_interval(k: int, n: int, confidence: float = 0.95) -> Interval:
+    """Wilson score interval for ``k`` successes out of ``n``."""
+
+    if n <= 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2.0)
+    p = k / n
+    z2n = z * z / n
+    centre = (p + z2n / 2.0) / (1.0 + z2n)
+    half = z * math.sqrt(p * (1.0 - p) / n + z2n / (4.0 * n)) / (1.0 + z2n)
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def _betacf(a: float, b: float, x: float) -> float:
+    # Continued fraction for the incomplete beta function (modified Lentz).
+    tiny = 1e-300
+    qab, qap, qam = a + b, a + 1.0, a - 1.0
+    c = 1.0
+    d = 1.0 - qab * x / qap
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    h = d
+    max_iter = 200 + int(10 * math.sqrt(max(a, b)))
+    for m in range(1, max_iter + 1):
+        m2 = 2 * m
+        for num in (
+            m * (b - m) * x / ((qam + m2) * (a + m2)),
+            -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2)),
+        ):
+            d = 1.0 + num * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + num / c
+            c = c if abs(c) > tiny else tiny
+            h *= d * c
+        if abs(d * c - 1.0) < 1e-15:
+            break
+    return h
+
+
+def betainc(a: float, b: float, x: float) -> float:
+    """Regularised incomplete beta ``I_x(a, b)``."""
+
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    log_front = (
+        math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b)
+        + a * math.log(x) + b * math.log1p(-x)
+    )
+    if x < (a + 1.0) / (a + b + 2.0):
+        return math.exp(log_front) * _betacf(a, b, x) / a
+    return 1.0 - math.exp(log_front) * _betacf(b, a, 1.0 - x) / b
+
+
+def beta_ppf(q: float, a: float, b: float, lo: float = 0.0, hi: float = 1.0) -> float:
+    """Inverse of :func:`betainc` in ``x`` by bisection within ``[lo, hi]``."""
+
+    for _ in range(200):
+        mid = 0.5 * (lo + hi)
+        if betainc(a, b, mid) < q:
+            lo = mid
+        else:
+            hi = mid
+        if hi - lo <= 1e-15 * max(hi, 1e-300):
+            break
+    return 0.5 * (lo + hi)
+
+
+def clopper_pearson_interval(k: int, n: int, confidence: float = 0.95) -> Interval:
+    """Exact (conservative) binomial interval for ``k`` successes out of ``n``."""
+
+    if n <= 0:
+        return 0.0, 1.0
+    alpha = 1.0 - confidence
+    # The Wilson interval, widened, brackets the exact bounds and keeps
+    # bisection short even for billions of trials.
+    wlo, whi = wilson_interval(k, n, 1.0 - alpha / 100.0)
+    lo = 0.0 if k == 0 else beta_ppf(alpha / 2.0, k, n - k + 1, 0.0, min(1.0, whi))
+    hi = 1.0 if k == n else beta_ppf(1.0 - alpha / 2.0, k + 1, n - k, max(0.0, wlo), 1.0)
+    return lo, hi
+
+
+METHODS: Dict[str, Callable[[int, int, float], Interval]] = {
+    "wilson": wilson_interval,
+    "clopper-pearson": clopper_pearson_interval,
+}
+
+
+class EarlyStop:
+    """
+    Stop rule on the hit-rate interval half-width (a proportion, e.g. 0.001
+    for ±0.1 percentage points).
+    - `method`: "wilson" or "clopper-pearson"
+    - `min_traces`: never stop before this many traces
+    check() is called at batch boundaries with running totals.
+    """
+
+    def __init__(
+        self,
+        half_width: float,
+        method: str = "wilson",
+        confidence: float = 0.95,
+        min_traces: int = 0,
+    ) -> None:
+        if method not in METHODS:
+            raise ValueError(
+                f"unknown interval method {method!r}; expected one of {tuple(METHODS)}"
+            )
+        if not 0.0 < confidence < 1.0 or half_width <= 0.0:
+            raise ValueError("need 0 < confidence < 1 and half_width > 0")
+        self.half_width = half_width
+        self.method = method
+        self.confidence = confidence
+        self.min_traces = min_traces
+        self.interval: Interval = (0.0, 1.0)
+        self.hits = 0
+        self.n = 0
+        self.batch: Optional[int] = None  # batch index the rule fired on
+        self._interval = METHODS[method]
+
+    def check(self, hits: int, n: int, batch: int) -> bool:
+        """Update with running totals; True when the run may stop after ``batch``."""
+
+        self.hits, self.n = hits, n
+        self.interval = self._interval(hits, n, self.confidence)
+        if n >= self.min_traces and self.achieved <= self.half_width:
+            self.batch = batch
+            return True
+        return False
+
+    @property
+    def achieved(self) -> float:
+        lo, hi = self.interval
+        return (hi - lo) / 2.0
+
+    def record(self) -> Dict[str, Any]:
+        """Meta JSON block (percent units, like ``np_hits_pct``)."""
+
+        lo, hi = self.interval
+        return {
+            "method": self.method,
+            "confidence": self.confidence,
+            "target_half_width_pct": 100.0 * self.half_width,
+            "half_width_pct": 100.0 * self.achieved,
+            "interval_pct": [100.0 * lo, 100.0 * hi],
+            "stopped_early": self.batch is not None,
+            "stopped_at_batch": self.batch,
+            "traces_used": self.n,
+            "min_traces": self.min_traces,
+        }
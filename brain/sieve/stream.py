@@ -0,0 +1,310 @@
+"""Online sieve over live entropy series (``time_index,entropy`` rows).
+
+Each series keeps a sliding window of its last ``window`` finite samples.
+Window max and min come from monotonic deques (O(1) amortised per row), so
+the windowed ΔΦ (the window max, the quantity ``sieve.py`` thresholds as
+``max_delta_phi``) and the normalised spread are available after every row.
+When ΔΦ crosses ``NP_THRESHOLD`` or ``P_THRESHOLD`` an event is emitted on the
+row that caused it.  Memory is O(window) per series, and at most
+``max_series`` series are tracked (least recently updated ones are evicted).
+
+Usage::
+
+    python -m brain.sieve.stream data/market-nphard-*.csv --window 8
+    tail -f feed.csv | python -m brain.sieve.stream - --follow   # series,time_index,entropy
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from collections import OrderedDict, deque
+from dataclasses import asdict, dataclass
+from typing import IO, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+Row = Tuple[str, float, float]  # (series, time_index, entropy)
+
+
+@dataclass(frozen=True)
+class StreamEvent:
+    """Windowed ΔΦ crossed ``threshold`` (``"NP"`` or ``"P"``) going ``up`` or ``down``."""
+
+    series: str
+    time_index: float
+    threshold: str
+    direction: str
+    delta_phi: float
+    window_min: float
+    spread: float
+
+
+class SlidingWindow:
+    """Max / min of the last ``size`` values via two monotonic deques."""
+
+    __slots__ = ("size", "seq", "_max", "_min")
+
+    def __init__(self, size: int) -> None:
+        if size < 1:
+            raise ValueError("window size must be >= 1")
+        self.size = size
+        self.seq = 0
+        self._max: Deque[Tuple[int, float]] = deque()
+        self._min: Deque[Tuple[int, float]] = deque()
+
+    def push(self, value: float) -> Tuple[float, float]:
+        """Add ``value``; returns the window ``(max, min)``."""
+
+        seq = self.seq
+        self.seq = seq + 1
+        mx, mn = self._max, self._min
+        while mx and mx[-1][1] <= value:
+            mx.pop()
+        mx.append((seq, value))
+        while mn and mn[-1][1] >= value:
+            mn.pop()
+        mn.append((seq, value))
+        oldest = seq - self.size
+        if mx[0][0] <= oldest:
+            mx.popleft()
+        if mn[0][0] <= oldest:
+            mn.popleft()
+        return mx[0][1], mn[0][1]
+
+    def __len__(self) -> int:
+        return min(self.seq, self.size)
+
+
+def spread(hi: float, lo: float) -> float:
+    """Normalised spread, as :func:`brain.core.entropy_delta` defines it."""
+
+    if hi == lo:
+        return 0.0
+    return (hi - lo) / max(abs(hi), 1e-9)
+
+
+class _Series:
+    __slots__ = ("window", "above", "last")
+
+    def __init__(self, size: int) -> None:
+        self.window = SlidingWindow(size)
+        self.above = 0  # bit i set: window max above thresholds[i]
+        self.last: Optional[Tuple[float, float, float]] = None  # (time_index, hi, lo)
+
+
+class StreamingSieve:
+    """
+    Sliding-window detector for many concurrent series.
+    - `window`: samples per window (non-finite entropy values are skipped)
+    - events fire on the row whose window max crosses a threshold; a series
+      starts "below" both, so its first spike above NP yields P-up and NP-up
+    - `max_series`: tracked-series cap; the least recently updated series is
+      evicted (and forgets its window) when a new one arrives
+    """
+
+    def __init__(
+        self,
+        window: int = 16,
+        np_threshold: float = 0.09,
+        p_threshold: float = 0.045,
+        max_series: int = 100_000,
+    ) -> None:
+        if window < 1 or max_series < 1:
+            raise ValueError("window and max_series must be >= 1")
+        self.window = window
+        self.thresholds: Tuple[Tuple[str, float], ...] = (
+            ("P", p_threshold),
+            ("NP", np_threshold),
+        )
+        self._p, self._np = p_threshold, np_threshold
+        self.max_series = max_series
+        self._series: "OrderedDict[str, _Series]" = OrderedDict()
+        self.rows = 0
+        self.skipped = 0
+        self.evicted = 0
+        self.events = 0
+
+    def push(self, series: str, time_index: float, entropy: float) -> List[StreamEvent]:
+        """Ingest one row; returns the crossing events it triggered (usually none)."""
+
+        self.rows += 1
+        if not math.isfinite(entropy):
+            self.skipped += 1
+            return []
+        state = self._series.get(series)
+        if state is None:
+            if len(self._series) >= self.max_series:
+                self._series.popitem(last=False)
+                self.evicted += 1
+            state = self._series[series] = _Series(self.window)
+        else:
+            self._series.move_to_end(series)
+        hi, lo = state.window.push(entropy)
+        state.last = (time_index, hi, lo)
+        above = (hi > self._p) | (hi > self._np) << 1
+        changed = above ^ state.above
+        if not changed:
+            return []
+        state.above = above
+        out: List[StreamEvent] = []
+        for bit, (name, _) in enumerate(self.thresholds):
+            if changed >> bit & 1:
+                direction = "up" if above >> bit & 1 else "down"
+                out.append(
+                    StreamEvent(series, time_index, name, direction, hi, lo, spread(hi, lo))
+                )
+        self.events += len(out)
+        return out
+
+    def push_many(self, rows: Iterable[Row]) -> Iterator[StreamEvent]:
+        for series, t, e in rows:
+            yield from self.push(series, t, e)
+
+    def stats(self, series: str) -> Optional[Dict[str, float]]:
+        """Current window of ``series``: time_index, delta_phi (max), min, spread, count."""
+
+        state = self._series.get(series)
+        if state is None or state.last is None:
+            return None
+        t, hi, lo = state.last
+        return {
+            "time_index": t,
+            "delta_phi": hi,
+            "window_min": lo,
+            "spread": spread(hi, lo),
+            "count": len(state.window),
+        }
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            "rows": self.rows,
+            "skipped": self.skipped,
+            "series": len(self._series),
+            "evicted": self.evicted,
+            "events": self.events,
+        }
+
+
+def parse_row(line: str, series: Optional[str]) -> Optional[Row]:
+    """
+    ``time_index,entropy`` for a named file series, or ``series,time_index,entropy``
+    for a multiplexed stream (``series=None``).  Headers and malformed lines → None.
+    """
+
+    parts = line.strip().split(",")
+    try:
+        if series is None:
+            if len(parts) < 3:
+                return None
+            return parts[0], _index(parts[1]), float(parts[2])
+        if len(parts) < 2:
+            return None
+        return series, _index(parts[0]), float(parts[1])
+    except ValueError:
+        return None
+
+
+def _index(text: str) -> float:
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def series_name(path: str) -> str:
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+class _Source:
+    __slots__ = ("f", "series", "partial")
+
+    def __init__(self, path: str) -> None:
+        if path == "-":
+            self.f: IO[str] = sys.stdin
+            self.series: Optional[str] = None
+        else:
+            self.f = open(path, encoding="utf-8", newline="")
+            self.series = series_name(path)
+        self.partial = ""
+
+    def close(self) -> None:
+        if self.f is not sys.stdin:
+            self.f.close()
+
+
+def read_rows(
+    paths: Sequence[str], follow: bool = False, poll_s: float = 0.25
+) -> Iterator[Row]:
+    """
+    Rows from each path (``-`` is stdin, multiplexed ``series,time_index,entropy``),
+    interleaved line by line.  With ``follow`` the files are tailed until
+    interrupted; only complete lines are parsed.
+    """
+
+    sources: List[_Source] = [_Source(p) for p in paths]
+    try:
+        while sources:
+            progressed = False
+            for src in list(sources):
+                line = src.f.readline()
+                if not line:
+                    if follow and src.f is not sys.stdin:
+                        continue  # no new data yet
+                    sources.remove(src)
+                    src.close()
+                    line, src.partial = src.partial, ""  # unterminated last line
+                    if not line:
+                        continue
+                elif not line.endswith("\n"):
+                    src.partial += line  # writer is mid-line; wait for the rest
+                    continue
+                else:
+                    progressed = True
+                    line, src.partial = src.partial + line, ""
+                row = parse_row(line, src.series)
+                if row is not None:
+                    yield row
+            if follow and not progressed:
+                time.sleep(poll_s)
+    finally:
+        for src in sources:
+            src.close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Streaming entropy sieve (JSON-lines events)")
+    ap.add_argument("paths", nargs="+", help="time_index,entropy CSVs, or - for stdin")
+    ap.add_argument("--window", type=int, default=int(os.getenv("STREAM_WINDOW", "16")))
+    ap.add_argument("--np-threshold", type=float, default=float(os.getenv("NP_THRESHOLD", "0.09")))
+    ap.add_argument("--p-threshold", type=float, default=float(os.getenv("P_THRESHOLD", "0.045")))
+    ap.add_argument("--max-series", type=int, default=100_000)
+    ap.add_argument("--follow", action="store_true", help="keep tailing the inputs")
+    ap.add_argument("--out", help="append events here instead of stdout")
+    ap.add_argument("--summary", help="write the run summary JSON here")
+    args = ap.parse_args(argv)
+
+    sieve = StreamingSieve(args.window, args.np_threshold, args.p_threshold, args.max_series)
+    out = open(args.out, "a", encoding="utf-8") if args.out else sys.stdout
+    try:
+        for event in sieve.push_many(read_rows(args.paths, follow=args.follow)):
+            out.write(json.dumps(asdict(event)) + "\n")
+            if args.follow:
+                out.flush()  # bounded latency: each event leaves as soon as it fires
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    summary = sieve.summary()
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+    print(f"[stream] {json.dumps(summary)}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
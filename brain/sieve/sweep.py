@@ -0,0 +1,77 @@
+"""Threshold sweeps: hit counts for a whole grid of thresholds in one pass.
+
+Inside ``sieve.py`` (``SWEEP=...``) the grid rides on the run's sketch: each
+batch's maxima are sorted once and a single ``searchsorted`` gives the exact
+``max_delta_phi > t`` count for every grid point, merged across batches and
+workers like the rest of the sketch.  A 200-point sweep therefore costs one
+run, not 200.  The table lands in the meta JSON under ``"sweep"``.
+
+The traces themselves depend on ``NP_THRESHOLD`` (it sets the spike height),
+so a sweep answers "how would these traces classify at threshold t", which
+is what tuning P/NP against a fixed population needs.
+
+Saved per-trace outputs can be swept offline without regenerating anything::
+
+    python -m brain.sieve.sweep data/entropy_sieve_ci.csv --grid 0.03:0.15:200
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from brain.sieve.output import load_columns
+from brain.sieve.sketch import exceedance_counts
+
+
+def parse_grid(spec: str) -> List[float]:
+    """``lo:hi:n`` (``n`` evenly spaced points, inclusive) or ``t1,t2,...``."""
+
+    spec = spec.strip()
+    if not spec:
+        return []
+    if ":" in spec:
+        lo, hi, n = spec.split(":")
+        if int(n) < 1:
+            raise ValueError(f"sweep grid {spec!r}: need at least one point")
+        return [float(x) for x in np.linspace(float(lo), float(hi), int(n))]
+    return [float(x) for x in spec.split(",") if x.strip()]
+
+
+def sweep_table(values: np.ndarray, grid: Sequence[float]) -> List[Dict[str, Any]]:
+    """Exact ``value > t`` hits for every ``t`` in ``grid`` (one sort, one searchsorted)."""
+
+    s = np.sort(np.asarray(values, dtype=np.float64))
+    thresholds = sorted(set(float(t) for t in grid))
+    n = len(s)
+    return [
+        {"threshold": t, "hits": int(c), "hits_pct": (100.0 * int(c) / n) if n else 0.0}
+        for t, c in zip(thresholds, exceedance_counts(s, thresholds))
+    ]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Threshold sweep over a saved sieve output")
+    ap.add_argument("path", help="per-trace sieve output (csv / npy dir / npz)")
+    ap.add_argument("--grid", required=True, help="lo:hi:n or t1,t2,...")
+    ap.add_argument("--out", help="write the table as JSON here (default: stdout)")
+    args = ap.parse_args(argv)
+
+    cols = load_columns(args.path)
+    table = sweep_table(cols["max_delta_phi"], parse_grid(args.grid))
+    doc = {"source": args.path, "n_traces": int(len(cols["max_delta_phi"])), "table": table}
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(doc, f, indent=2)
+    else:
+        json.dump(doc, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,4 +4,18 @@ from pkgutil import extend_path
 
 __path__ = extend_path(__path__, __name__)
 
-__all__ = ["core", "unified_engine"]
+__all__ = [
+    "async_engine",
+    "cache",
+    "capsule_codec",
+    "capsule_log",
+    "cdcl",
+    "core",
+    "forks",
+    "glyphs",
+    "instrumentation",
+    "literals",
+    "rules",
+    "sharded",
+    "unified_engine",
+]
@@ -0,0 +1,109 @@
+# Asyncio front-end for UnifiedEngine: stream motif lists in, capsules out.
+# The synchronous pipeline runs in an executor so the event loop never blocks.
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterable as _AsyncIterableABC
+from concurrent.futures import Executor
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Deque,
+    Iterable,
+    List,
+    Optional,
+    Union,
+)
+
+from .unified_engine import Capsule, UnifiedEngine
+
+MotifSource = Union[AsyncIterable[List[str]], Iterable[List[str]]]
+
+_DONE = object()
+
+
+async def _aiter_sync(items: Iterable[List[str]]) -> AsyncIterator[List[str]]:
+    for item in items:
+        yield item
+
+
+async def _next_or_done(it: AsyncIterator[List[str]]) -> Any:
+    try:
+        return await it.__anext__()
+    except StopAsyncIteration:
+        return _DONE
+
+
+class AsyncUnifiedEngine:
+    """
+    Bounded-concurrency streaming wrapper around UnifiedEngine.run_engine.
+    - At most `max_in_flight` motif lists are running or finished-but-unread;
+      the source is only pulled when a slot frees up, so a slow consumer
+      applies backpressure all the way to the feed.
+    - `ordered=True` yields capsules in input order, otherwise in completion
+      order.
+    - Each run_engine call (translation, SAT solving, hashing) executes on
+      `executor` (the loop's default thread pool when None).
+    """
+
+    def __init__(
+        self,
+        engine: Optional[UnifiedEngine] = None,
+        max_in_flight: int = 8,
+        ordered: bool = True,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be >= 1")
+        self.engine = engine if engine is not None else UnifiedEngine()
+        self.max_in_flight = max_in_flight
+        self.ordered = ordered
+        self.executor = executor
+
+    async def stream(self, source: MotifSource) -> AsyncIterator[Capsule]:
+        loop = asyncio.get_running_loop()
+        if isinstance(source, _AsyncIterableABC):
+            it = source.__aiter__()
+        else:
+            it = _aiter_sync(source).__aiter__()
+        run = self.engine.run_engine
+        pending: Deque[asyncio.Future] = deque()
+        next_item: Optional[asyncio.Future] = None
+        exhausted = False
+        try:
+            while True:
+                if next_item is None and not exhausted and len(pending) < self.max_in_flight:
+                    next_item = asyncio.ensure_future(_next_or_done(it))
+                waitables = set(pending)
+                if next_item is not None:
+                    waitables.add(next_item)
+                if not waitables:
+                    return
+                done, _ = await asyncio.wait(waitables, return_when=asyncio.FIRST_COMPLETED)
+
+                if next_item is not None and next_item in done:
+                    item = next_item.result()
+                    next_item = None
+                    if item is _DONE:
+                        exhausted = True
+                    else:
+                        pending.append(loop.run_in_executor(self.executor, run, item))
+
+                if self.ordered:
+                    while pending and pending[0].done():
+                        yield pending.popleft().result()
+                else:
+                    for fut in [f for f in pending if f.done()]:
+                        pending.remove(fut)
+                        yield fut.result()
+        finally:
+            if next_item is not None:
+                next_item.cancel()
+            for fut in pending:
+                fut.cancel()
+
+    async def run_all(self, source: MotifSource) -> List[Capsule]:
+        return [cap async for cap in self.stream(source)]
@@ -0,0 +1,131 @@
+# Bounded memoization for the deterministic stages of UnifiedEngine.
+# LRU + optional TTL, capped by entry count and (approximate) bytes.
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+def approx_size(obj: Any) -> int:
+    """Rough deep size in bytes of JSON-like data (dict/list/tuple/str/number)."""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            size += approx_size(k) + approx_size(v)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for v in obj:
+            size += approx_size(v)
+    return size
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int  # dropped to respect max_entries / max_bytes
+    expirations: int  # dropped because the TTL elapsed
+    entries: int
+    bytes: Optional[int]  # summed approx_size; None when max_bytes is off (sizes not taken)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class StageCache:
+    """
+    Thread-safe LRU cache with optional TTL.
+    - `max_entries`: entry cap (None → unbounded)
+    - `max_bytes`: cap on the summed approx_size of cached values (None → off;
+      values are then not sized and the bytes stat is None)
+    - `ttl`: seconds an entry stays valid after insertion (None → forever)
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = 4096,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, Tuple[Any, int, float]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._evictions = self._expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            value, size, expires = entry
+            if expires and self._clock() >= expires:
+                del self._data[key]
+                self._bytes -= size
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, size: Optional[int] = None) -> None:
+        if size is None:
+            size = approx_size(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return  # would evict everything and still not fit
+        expires = self._clock() + self.ttl if self.ttl is not None else 0.0
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._data[key] = (value, size, expires)
+            self._bytes += size
+            while (self.max_entries is not None and len(self._data) > self.max_entries) or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                _, (_, old_size, _) = self._data.popitem(last=False)
+                self._bytes -= old_size
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                entries=len(self._data),
+                bytes=self._bytes if self.max_bytes is not None else None,
+            )
+
+    def snapshot(self) -> Dict[str, Any]:
+        st = self.stats()
+        return {
+            "hits": st.hits,
+            "misses": st.misses,
+            "evictions": st.evictions,
+            "expirations": st.expirations,
+            "entries": st.entries,
+            "bytes": st.bytes,
+            "hit_rate": st.hit_rate,
+        }
@@ -0,0 +1,233 @@
+# Canonical binary capsule encoding (deterministic CBOR subset, RFC 8949),
+# and capsule ids streamed into hashlib without building the full blob.
+
+from __future__ import annotations
+
+import hashlib
+import json
+import struct
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Encoding rules (one byte string per value, no choices left open):
+# - None / False / True → simple values 0xf6 / 0xf4 / 0xf5
+# - int → major type 0 / 1 with the shortest argument (64-bit range only)
+# - float → always IEEE 754 binary64 (0xfb + 8 bytes, big-endian)
+# - str → major type 3 (UTF-8); bytes → major type 2
+# - list / tuple → major type 4 (definite length)
+# - dict → major type 5 with str keys, ordered by their encoded bytes
+#   (RFC 8949 §4.2.1 core deterministic ordering)
+
+_CHUNK = 1 << 16
+_JSON_ID_ENCODER = json.JSONEncoder(ensure_ascii=False, sort_keys=True)
+# capsule_id hashes lists longer than this a slice at a time.
+STREAM_ITEMS = 2048
+_SEQUENCES = (list, tuple)
+_CONTAINERS = (dict, list, tuple)
+_pack_f64 = struct.Struct(">d").pack
+_SMALL_HEADS = [[bytes([(major << 5) | n]) for n in range(24)] for major in range(8)]
+
+
+def _head(major: int, n: int) -> bytes:
+    if n < 24:
+        return _SMALL_HEADS[major][n]
+    if n < 0x100:
+        return bytes(((major << 5) | 24, n))
+    if n < 0x10000:
+        return bytes(((major << 5) | 25,)) + n.to_bytes(2, "big")
+    if n < 0x100000000:
+        return bytes(((major << 5) | 26,)) + n.to_bytes(4, "big")
+    if n < 0x10000000000000000:
+        return bytes(((major << 5) | 27,)) + n.to_bytes(8, "big")
+    raise ValueError("integer out of 64-bit CBOR range")
+
+
+class _Encoder:
+    def __init__(self) -> None:
+        self.buf = bytearray()
+        self.text: Dict[str, bytes] = {}  # per-encode memo; motif strings repeat a lot
+
+    def _text(self, s: str) -> bytes:
+        enc = self.text.get(s)
+        if enc is None:
+            raw = s.encode("utf-8")
+            enc = self.text[s] = _head(3, len(raw)) + raw
+        return enc
+
+    def encode(self, obj: Any) -> None:
+        buf = self.buf
+        if obj is None:
+            buf.append(0xF6)
+        elif obj is True:
+            buf.append(0xF5)
+        elif obj is False:
+            buf.append(0xF4)
+        elif isinstance(obj, str):
+            buf += self._text(obj)
+        elif isinstance(obj, int):
+            buf += _head(0, obj) if obj >= 0 else _head(1, -1 - obj)
+        elif isinstance(obj, float):
+            buf.append(0xFB)
+            buf += _pack_f64(obj)
+        elif isinstance(obj, (list, tuple)):
+            buf += _head(4, len(obj))
+            memo = self.text
+            # Inline the common shapes (strings, clause lists of strings) to
+            # skip a recursive call per literal.
+            for item in obj:
+                t = type(item)
+                if t is str:
+                    buf += memo.get(item) or self._text(item)
+                elif t is list and all(type(x) is str for x in item):
+                    buf += _head(4, len(item))
+                    for x in item:
+                        buf += memo.get(x) or self._text(x)
+                else:
+                    self.encode(item)
+        elif isinstance(obj, dict):
+            buf += _head(5, len(obj))
+            items: List[Tuple[bytes, Any]] = []
+            for k, v in obj.items():
+                if not isinstance(k, str):
+                    raise TypeError(f"capsule map keys must be str, got {type(k).__name__}")
+                items.append((self._text(k), v))
+            items.sort(key=lambda kv: kv[0])
+            for kb, v in items:
+                buf += kb
+                self.encode(v)
+        elif isinstance(obj, (bytes, bytearray)):
+            buf += _head(2, len(obj))
+            buf += obj
+        else:
+            raise TypeError(f"cannot encode {type(obj).__name__} canonically")
+
+
+def dumps(obj: Any) -> bytes:
+    """Canonical encoding of JSON-like data as one bytes object."""
+    enc = _Encoder()
+    enc.encode(obj)
+    return bytes(enc.buf)
+
+
+def _decode(data: bytes, pos: int) -> Tuple[Any, int]:
+    ib = data[pos]
+    pos += 1
+    major, info = ib >> 5, ib & 0x1F
+    if major == 7:
+        if info == 20:
+            return False, pos
+        if info == 21:
+            return True, pos
+        if info == 22:
+            return None, pos
+        if info == 27:
+            return struct.unpack_from(">d", data, pos)[0], pos + 8
+        raise ValueError(f"unsupported simple/float value 0x{ib:02x}")
+    if info < 24:
+        n = info
+    elif 24 <= info <= 27:
+        width = 1 << (info - 24)
+        n = int.from_bytes(data[pos : pos + width], "big")
+        pos += width
+    else:
+        raise ValueError(f"indefinite or reserved length 0x{ib:02x}")
+    if major == 0:
+        return n, pos
+    if major == 1:
+        return -1 - n, pos
+    if major == 2:
+        return bytes(data[pos : pos + n]), pos + n
+    if major == 3:
+        return data[pos : pos + n].decode("utf-8"), pos + n
+    if major == 4:
+        out = []
+        for _ in range(n):
+            item, pos = _decode(data, pos)
+            out.append(item)
+        return out, pos
+    if major == 5:
+        obj: Dict[str, Any] = {}
+        for _ in range(n):
+            k, pos = _decode(data, pos)
+            obj[k], pos = _decode(data, pos)
+        return obj, pos
+    raise ValueError(f"unsupported CBOR major type {major}")
+
+
+def loads(data: bytes) -> Any:
+    """Decode one canonical value; rejects trailing bytes."""
+    data = bytes(data)
+    obj, pos = _decode(data, 0)
+    if pos != len(data):
+        raise ValueError(f"{len(data) - pos} trailing byte(s) after canonical value")
+    return obj
+
+
+def _streams(obj: Any) -> bool:
+    """True when `obj` holds a list long enough to be hashed in slices,
+    looking through dicts and lists that start with a dict. Only a
+    heuristic for piece size; the hashed text never depends on it."""
+    if type(obj) is dict:
+        for v in obj.values():
+            if type(v) in _CONTAINERS and _streams(v):
+                return True
+    elif type(obj) in _SEQUENCES:
+        if len(obj) > STREAM_ITEMS:
+            return True
+        if obj and type(obj[0]) is dict:
+            return any(_streams(v) for v in obj)
+    return False
+
+
+def _json_pieces(obj: Any) -> Iterator[str]:
+    """json.dumps(obj, ensure_ascii=False, sort_keys=True) in pieces, each
+    produced by the C encoder: containers holding a long list are walked
+    (dicts in key order) and the long lists encoded `STREAM_ITEMS` elements
+    at a time; everything else is one piece."""
+    encode = _JSON_ID_ENCODER.encode
+    if not _streams(obj) or (isinstance(obj, dict) and any(type(k) is not str for k in obj)):
+        yield encode(obj)
+    elif isinstance(obj, dict):
+        sep = "{"
+        for k in sorted(obj):
+            yield sep + encode(k) + ": "
+            yield from _json_pieces(obj[k])
+            sep = ", "
+        yield "}"
+    elif len(obj) > STREAM_ITEMS:
+        sep = "["
+        for i in range(0, len(obj), STREAM_ITEMS):
+            yield sep + encode(obj[i : i + STREAM_ITEMS])[1:-1]
+            sep = ", "
+        yield "]"
+    else:
+        sep = "["
+        for item in obj:
+            yield sep
+            yield from _json_pieces(item)
+            sep = ", "
+        yield "]"
+
+
+def capsule_id(payload: Dict[str, Any], stream: Optional[bool] = None) -> str:
+    """
+    sha256 hex id of a capsule payload: sha256 of
+    json.dumps(payload, ensure_ascii=False, sort_keys=True), the scheme every
+    capsule has been issued under (the CBOR bytes above are for storage only).
+    - `stream`: feed the JSON text to the hash in ~`_CHUNK`-character pieces
+      so large clause lists are never one string; None scans the payload for
+      lists longer than `STREAM_ITEMS`. The id is the same either way.
+    """
+    if not (_streams(payload) if stream is None else stream):
+        return hashlib.sha256(_JSON_ID_ENCODER.encode(payload).encode("utf-8")).hexdigest()
+    h = hashlib.sha256()
+    parts: List[str] = []
+    size = 0
+    for piece in _json_pieces(payload):
+        parts.append(piece)
+        size += len(piece)
+        if size >= _CHUNK:
+            h.update("".join(parts).encode("utf-8"))
+            parts.clear()
+            size = 0
+    h.update("".join(parts).encode("utf-8"))
+    return h.hexdigest()
@@ -0,0 +1,508 @@
+# Append-only capsule log: length-prefixed records in rolling segment files,
+# an mmap'd hash index capsule_id → (segment, offset), batched fsync and
+# compaction. Replaces one-JSON-file-per-capsule for large runs.
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .unified_engine import Capsule
+
+# Record: <u32 payload length><u32 crc32(kind + payload)><u8 kind> payload
+# - kind 0: capsule, payload = Capsule.to_bytes() (canonical CBOR)
+# - kind 1: tombstone, payload = capsule_id (UTF-8)
+_REC = struct.Struct("<IIB")
+_KIND_CAPSULE = 0
+_KIND_TOMBSTONE = 1
+
+# Index file: header + open-addressing table of 32-byte slots.
+# Header: magic, version, capacity, used slots, live entries, the
+# (segment, offset) watermark up to which the log has been indexed, and a
+# clean flag set only by close() (older files read it as 0, i.e. dirty).
+_IDX_MAGIC = b"BRAINIDX"
+_IDX_HEAD = struct.Struct("<8sIQQQIQI")
+_IDX_HEAD_SIZE = 64
+# Slot: 16-byte blake2b key, u32 state (0 empty, _DEAD deleted, else
+# segment + 1), 4 pad bytes, u64 offset.
+_SLOT = struct.Struct("<16sI4xQ")
+_DEAD = 0xFFFFFFFF
+_MIN_CAPACITY = 1024
+
+SEGMENT_SUFFIX = ".seg"
+
+
+def _key(capsule_id: str) -> bytes:
+    return hashlib.blake2b(capsule_id.encode("utf-8"), digest_size=16).digest()
+
+
+class _Index:
+    """Linear-probing hash table over an mmap'd file; ≤ 50% load factor."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._f = None
+        self._mm: Optional[mmap.mmap] = None
+        self.capacity = 0
+        self.used = 0
+        self.live = 0
+        self.watermark = (0, 0)
+        self.clean = False
+
+    # ---- lifecycle ----
+
+    def open(self) -> bool:
+        """Map an existing index; False when missing or unreadable."""
+        if not self.path.exists():
+            return False
+        f = open(self.path, "r+b")
+        size = os.fstat(f.fileno()).st_size
+        if size < _IDX_HEAD_SIZE:
+            f.close()
+            return False
+        mm = mmap.mmap(f.fileno(), 0)
+        magic, version, cap, used, live, wseg, woff, clean = _IDX_HEAD.unpack_from(mm, 0)
+        if magic != _IDX_MAGIC or version != 1 or size != _IDX_HEAD_SIZE + cap * _SLOT.size:
+            mm.close()
+            f.close()
+            return False
+        self._f, self._mm = f, mm
+        self.capacity, self.used, self.live = cap, used, live
+        self.watermark = (wseg, woff)
+        self.clean = clean == 1
+        return True
+
+    def create(self, capacity: int = _MIN_CAPACITY) -> None:
+        self.close()
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            f.truncate(_IDX_HEAD_SIZE + capacity * _SLOT.size)
+        os.replace(tmp, self.path)
+        self._f = open(self.path, "r+b")
+        self._mm = mmap.mmap(self._f.fileno(), 0)
+        self.capacity, self.used, self.live = capacity, 0, 0
+        self.watermark = (0, 0)
+        self.clean = False
+        self._write_header()
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._write_header(clean=True)
+            self._mm.flush()
+            self._mm.close()
+            self._mm = None
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+
+    def _write_header(self, clean: bool = False) -> None:
+        assert self._mm is not None
+        wseg, woff = self.watermark
+        _IDX_HEAD.pack_into(
+            self._mm, 0, _IDX_MAGIC, 1, self.capacity, self.used, self.live, wseg, woff,
+            int(clean),
+        )
+
+    def flush(self) -> None:
+        if self._mm is not None:
+            self._write_header()
+            self._mm.flush()
+
+    # ---- table ----
+
+    def _probe(self, key: bytes) -> Tuple[int, int, int]:
+        """(slot of key or -1, first reusable slot, state of the key's slot)."""
+        mm = self._mm
+        assert mm is not None
+        mask = self.capacity - 1
+        i = int.from_bytes(key[:8], "little") & mask
+        reuse = -1
+        while True:
+            pos = _IDX_HEAD_SIZE + i * _SLOT.size
+            k, state, _ = _SLOT.unpack_from(mm, pos)
+            if state == 0:
+                return -1, (reuse if reuse >= 0 else i), 0
+            if k == key:
+                return i, i, state
+            if state == _DEAD and reuse < 0:
+                reuse = i
+            i = (i + 1) & mask
+
+    def get(self, key: bytes) -> Optional[Tuple[int, int]]:
+        slot, _, state = self._probe(key)
+        if slot < 0 or state == _DEAD:
+            return None
+        _, state, off = _SLOT.unpack_from(self._mm, _IDX_HEAD_SIZE + slot * _SLOT.size)
+        return state - 1, off
+
+    def put(self, key: bytes, seg: int, off: int) -> None:
+        if 2 * (self.used + 1) > self.capacity:
+            self._grow()
+        slot, free, state = self._probe(key)
+        if slot < 0:
+            slot = free
+            _, old_state, _ = _SLOT.unpack_from(self._mm, _IDX_HEAD_SIZE + slot * _SLOT.size)
+            if old_state == 0:
+                self.used += 1
+            self.live += 1
+        elif state == _DEAD:
+            self.live += 1
+        _SLOT.pack_into(self._mm, _IDX_HEAD_SIZE + slot * _SLOT.size, key, seg + 1, off)
+
+    def remove(self, key: bytes) -> bool:
+        slot, _, state = self._probe(key)
+        if slot < 0 or state == _DEAD:
+            return False
+        _SLOT.pack_into(self._mm, _IDX_HEAD_SIZE + slot * _SLOT.size, key, _DEAD, 0)
+        self.live -= 1
+        return True
+
+    def entries(self) -> Iterator[Tuple[bytes, int, int]]:
+        mm = self._mm
+        for i in range(self.capacity):
+            k, state, off = _SLOT.unpack_from(mm, _IDX_HEAD_SIZE + i * _SLOT.size)
+            if state and state != _DEAD:
+                yield k, state - 1, off
+
+    def prune(self, ends: Dict[int, int]) -> int:
+        """Kill slots pointing past their segment's end; recount used/live."""
+        mm = self._mm
+        assert mm is not None
+        used = live = dropped = 0
+        for i in range(self.capacity):
+            pos = _IDX_HEAD_SIZE + i * _SLOT.size
+            k, state, off = _SLOT.unpack_from(mm, pos)
+            if not state:
+                continue
+            used += 1
+            if state == _DEAD:
+                continue
+            if off + _REC.size > ends.get(state - 1, 0):
+                _SLOT.pack_into(mm, pos, k, _DEAD, 0)
+                dropped += 1
+            else:
+                live += 1
+        self.used, self.live = used, live
+        return dropped
+
+    def _grow(self) -> None:
+        live = list(self.entries())
+        cap = _MIN_CAPACITY  # dead slots are dropped, so size for live entries
+        while 4 * (len(live) + 1) > cap:
+            cap *= 2
+        watermark = self.watermark
+        self.create(cap)
+        self.watermark = watermark
+        for k, seg, off in live:
+            self.put(k, seg, off)
+
+
+class CapsuleLog:
+    """
+    Capsule store in a directory of append-only segment files.
+    - `get(capsule_id)` is one index probe plus one positioned read
+    - `append` skips capsule_ids already present (ids are content hashes)
+    - segments roll over past `max_segment_bytes`; appends are fsync'd every
+      `sync_every` records or `sync_interval` seconds, and on sync()/close()
+    - a torn record at the tail (crash mid-write) is truncated on open, the
+      index catches up from its watermark, and after an unclean shutdown any
+      slot pointing past the recovered end of the log is dropped
+    - compact() rewrites only live records (no duplicates or deletions)
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_segment_bytes: int = 64 << 20,
+        sync_every: int = 256,
+        sync_interval: Optional[float] = 1.0,
+    ) -> None:
+        if max_segment_bytes < _REC.size + 1:
+            raise ValueError("max_segment_bytes is too small for any record")
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_segment_bytes = max_segment_bytes
+        self.sync_every = max(1, sync_every)
+        self.sync_interval = sync_interval
+        self._lock = threading.RLock()
+        self._readers: Dict[int, int] = {}
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._index = _Index(self.path / "index.bin")
+        segs = self._segments()
+        self._active = segs[-1] if segs else 0
+        self._recover(segs)
+        self._writer = open(self._segment_path(self._active), "ab")
+
+    # ---- segments ----
+
+    def _segment_path(self, seg: int) -> Path:
+        return self.path / f"{seg:08d}{SEGMENT_SUFFIX}"
+
+    def _segments(self) -> List[int]:
+        return sorted(int(p.stem) for p in self.path.glob(f"*{SEGMENT_SUFFIX}"))
+
+    def _reader(self, seg: int) -> int:
+        fd = self._readers.get(seg)
+        if fd is None:
+            fd = self._readers[seg] = os.open(self._segment_path(seg), os.O_RDONLY)
+        return fd
+
+    def _records(
+        self, seg: int, start: int = 0
+    ) -> Iterator[Tuple[int, int, bytes]]:
+        """(offset, kind, payload) of each intact record from `start`."""
+        with open(self._segment_path(seg), "rb") as f:
+            f.seek(start)
+            off = start
+            while True:
+                head = f.read(_REC.size)
+                if len(head) < _REC.size:
+                    return
+                length, crc, kind = _REC.unpack(head)
+                payload = f.read(length)
+                if len(payload) < length or zlib.crc32(payload, zlib.crc32(head[8:])) != crc:
+                    return
+                yield off, kind, payload
+                off += _REC.size + length
+
+    def _recover(self, segs: List[int]) -> None:
+        idx = self._index
+        wseg, woff = idx.watermark if idx.open() else (-1, 0)
+        # The mmap may reach disk ahead of the segment data; an index whose
+        # watermark points past the log is rebuilt from scratch.
+        if wseg not in segs or woff > os.path.getsize(self._segment_path(wseg)):
+            idx.create()
+            wseg, woff = (segs[0] if segs else 0), 0
+        for seg in segs:
+            if seg < wseg:
+                continue
+            end = woff if seg == wseg else 0
+            for off, kind, payload in self._records(seg, end):
+                self._apply(kind, payload, seg, off)
+                end = off + _REC.size + len(payload)
+            if os.path.getsize(self._segment_path(seg)) != end:
+                with open(self._segment_path(seg), "r+b") as f:
+                    f.truncate(end)  # drop a torn tail record
+            idx.watermark = (seg, end)
+        if not idx.clean:
+            # Slots written after the last sync may have reached disk while
+            # the records they point at did not.
+            idx.prune({s: os.path.getsize(self._segment_path(s)) for s in segs})
+        idx.flush()
+
+    def _apply(self, kind: int, payload: bytes, seg: int, off: int) -> None:
+        if kind == _KIND_CAPSULE:
+            cid = Capsule.from_bytes(payload).capsule_id
+            self._index.put(_key(cid), seg, off)
+        elif kind == _KIND_TOMBSTONE:
+            self._index.remove(_key(payload.decode("utf-8")))
+
+    # ---- writes ----
+
+    def _write(self, kind: int, payload: bytes) -> Tuple[int, int]:
+        size = _REC.size + len(payload)
+        off = self._writer.tell()
+        if off and off + size > self.max_segment_bytes:
+            self._roll()
+            off = 0
+        kind_b = bytes((kind,))
+        crc = zlib.crc32(payload, zlib.crc32(kind_b))
+        self._writer.write(_REC.pack(len(payload), crc, kind))
+        self._writer.write(payload)
+        # Hand the bytes to the OS before the caller's index update can reach
+        # the mmap, so a killed process never leaves a slot without its record.
+        self._writer.flush()
+        self._index.watermark = (self._active, off + size)
+        self._unsynced += 1
+        if self._unsynced >= self.sync_every or (
+            self.sync_interval is not None
+            and time.monotonic() - self._last_sync >= self.sync_interval
+        ):
+            self.sync()
+        return self._active, off
+
+    def _roll(self) -> None:
+        self._fsync_writer()
+        self._writer.close()
+        self._active += 1
+        self._writer = open(self._segment_path(self._active), "ab")
+
+    def _fsync_writer(self) -> None:
+        self._writer.flush()
+        os.fsync(self._writer.fileno())
+
+    def append(self, capsule: Capsule) -> bool:
+        """Append one capsule; False if its capsule_id is already stored."""
+        key = _key(capsule.capsule_id)
+        with self._lock:
+            if self._index.get(key) is not None:
+                return False
+            seg, off = self._write(_KIND_CAPSULE, capsule.to_bytes())
+            self._index.put(key, seg, off)
+            return True
+
+    def extend(self, capsules: Iterable[Capsule]) -> int:
+        return sum(1 for cap in capsules if self.append(cap))
+
+    def delete(self, capsule_id: str) -> bool:
+        """Tombstone a capsule; its bytes go away at the next compact()."""
+        key = _key(capsule_id)
+        with self._lock:
+            if self._index.get(key) is None:
+                return False
+            self._write(_KIND_TOMBSTONE, capsule_id.encode("utf-8"))
+            self._index.remove(key)
+            return True
+
+    def sync(self) -> None:
+        """fsync the active segment, then persist the index and watermark."""
+        with self._lock:
+            self._fsync_writer()
+            self._index.flush()
+            self._unsynced = 0
+            self._last_sync = time.monotonic()
+
+    # ---- reads ----
+
+    def __len__(self) -> int:
+        return self._index.live
+
+    def __contains__(self, capsule_id: object) -> bool:
+        return isinstance(capsule_id, str) and self._index.get(_key(capsule_id)) is not None
+
+    def get(self, capsule_id: str) -> Optional[Capsule]:
+        with self._lock:
+            loc = self._index.get(_key(capsule_id))
+            if loc is None:
+                return None
+            seg, off = loc
+            fd = self._reader(seg)
+            head = os.pread(fd, _REC.size, off)
+            if len(head) < _REC.size:
+                return None
+            length, _, _ = _REC.unpack(head)
+            payload = os.pread(fd, length, off + _REC.size)
+            if len(payload) < length:
+                return None
+        cap = Capsule.from_bytes(payload)
+        return cap if cap.capsule_id == capsule_id else None
+
+    def _live(self, segs: List[int]) -> Iterator[Tuple[Capsule, bytes]]:
+        for seg in segs:
+            for off, kind, payload in self._records(seg):
+                if kind != _KIND_CAPSULE:
+                    continue
+                cap = Capsule.from_bytes(payload)
+                if self._index.get(_key(cap.capsule_id)) == (seg, off):
+                    yield cap, payload
+
+    def scan(self) -> Iterator[Capsule]:
+        """Live capsules in append order, streamed one segment at a time."""
+        with self._lock:
+            self._writer.flush()
+            segs = self._segments()
+        for cap, _ in self._live(segs):
+            yield cap
+
+    # ---- maintenance ----
+
+    def compact(self) -> int:
+        """
+        Rewrite live records into fresh segments (numbered after the current
+        ones, so append order is preserved) and delete the old segments.
+        Returns the number of bytes reclaimed.
+        """
+        with self._lock:
+            self._writer.flush()
+            old = self._segments()
+            before = sum(os.path.getsize(self._segment_path(s)) for s in old)
+            self._roll()
+            for cap, payload in self._live(old):
+                seg, off = self._write(_KIND_CAPSULE, payload)
+                self._index.put(_key(cap.capsule_id), seg, off)
+            self.sync()
+            for seg in old:
+                fd = self._readers.pop(seg, None)
+                if fd is not None:
+                    os.close(fd)
+                os.remove(self._segment_path(seg))
+            after = sum(os.path.getsize(self._segment_path(s)) for s in self._segments())
+            return before - after
+
+    def export_files(self, dest: Union[str, Path], prefix: str = "brain-") -> int:
+        """Write every live capsule as `<prefix><capsule_id>.json` (Capsule.to_json)."""
+        out = Path(dest)
+        out.mkdir(parents=True, exist_ok=True)
+        n = 0
+        for cap in self.scan():
+            (out / f"{prefix}{cap.capsule_id}.json").write_text(
+                cap.to_json() + "\n", encoding="utf-8"
+            )
+            n += 1
+        return n
+
+    def close(self) -> None:
+        with self._lock:
+            if self._writer.closed:
+                return
+            self.sync()
+            self._writer.close()
+            for fd in self._readers.values():
+                os.close(fd)
+            self._readers.clear()
+            self._index.close()
+
+    def __enter__(self) -> "CapsuleLog":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Capsule log maintenance.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    ing = sub.add_parser("ingest", help="Append capsules from JSONL (e.g. brain-shard output)")
+    ing.add_argument("log")
+    ing.add_argument("jsonl", help="Capsule JSONL ('-' for stdin)")
+    exp = sub.add_parser("export", help="Write live capsules as one JSON file each")
+    exp.add_argument("log")
+    exp.add_argument("dest")
+    exp.add_argument("--prefix", default="brain-")
+    cmp_ = sub.add_parser("compact", help="Drop deleted and duplicate records")
+    cmp_.add_argument("log")
+    return ap.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+    with CapsuleLog(args.log) as log:
+        if args.cmd == "ingest":
+            src = sys.stdin if args.jsonl == "-" else open(args.jsonl, encoding="utf-8")
+            try:
+                added = log.extend(Capsule(**json.loads(line)) for line in src if line.strip())
+            finally:
+                if src is not sys.stdin:
+                    src.close()
+            print(f"[capsule-log] appended={added} total={len(log)}", file=sys.stderr)
+        elif args.cmd == "export":
+            n = log.export_files(args.dest, args.prefix)
+            print(f"[capsule-log] exported={n} → {args.dest}", file=sys.stderr)
+        else:
+            print(f"[capsule-log] reclaimed={log.compact()} bytes", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,502 @@
+# CDCL SAT solver — pure Python, dependency-free.
+# Backend for TranslatorCore.minisat_solve; also usable directly on DIMACS CNF.
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from heapq import heappush, heappop, heapify
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+# Literals use DIMACS ints at the API boundary (v / -v, v >= 1). Internally a
+# literal is the code 2*v (positive) or 2*v + 1 (negative), so negation is
+# ``lit ^ 1`` and the variable is ``lit >> 1``.
+
+_TRUE = 1
+_FALSE = -1
+_UNDEF = 0
+
+_VAR_DECAY = 0.95
+_RESCALE_LIMIT = 1e100
+_RESTART_BASE = 100
+
+
+def _code(lit: int) -> int:
+    return 2 * lit if lit > 0 else -2 * lit + 1
+
+
+def _dimacs(code: int) -> int:
+    return -(code >> 1) if code & 1 else code >> 1
+
+
+def _luby(i: int) -> int:
+    # Luby sequence 1,1,2,1,1,2,4,... (0-based index).
+    size, seq = 1, 0
+    while size < i + 1:
+        seq += 1
+        size = 2 * size + 1
+    while size - 1 != i:
+        size = (size - 1) >> 1
+        seq -= 1
+        i = i % size
+    return 1 << seq
+
+
+@dataclass
+class SolverStats:
+    decisions: int = 0
+    propagations: int = 0
+    conflicts: int = 0
+    restarts: int = 0
+    learnts: int = 0
+    reductions: int = 0
+
+
+class CDCLSolver:
+    """
+    Conflict-driven clause-learning solver in the MiniSat mould:
+    - two-watched-literal unit propagation
+    - VSIDS branching with phase saving
+    - first-UIP learning with local clause minimization
+    - Luby restarts and LBD-based learnt-clause reduction
+    - incremental use: add_clause() between solve(assumptions=...) calls
+    """
+
+    def __init__(self, clauses: Iterable[Iterable[int]] = ()) -> None:
+        self.stats = SolverStats()
+        self.num_vars = 0
+        self.ok = True
+        self.model: List[bool] = []
+        self.failed_assumptions: List[int] = []
+
+        self._val: List[int] = [_UNDEF, _UNDEF]
+        self._level: List[int] = [0]
+        self._reason: List[Optional[List[int]]] = [None]
+        self._activity: List[float] = [0.0]
+        self._phase: List[int] = [1]  # 1 → try negative first (MiniSat default)
+        self._seen: List[int] = [0]
+        self._watches: List[List[List[int]]] = [[], []]
+        self._heap: List[Tuple[float, int]] = []
+        self._var_inc = 1.0
+
+        self._clauses: List[List[int]] = []
+        self._learnts: List[List[int]] = []
+        self._lbd: dict = {}
+        self._max_learnts = 0.0
+
+        self._trail: List[int] = []
+        self._trail_lim: List[int] = []
+        self._qhead = 0
+
+        for clause in clauses:
+            self.add_clause(clause)
+
+    # ----------------------------
+    # Problem construction
+    # ----------------------------
+
+    def _ensure_var(self, v: int) -> None:
+        while self.num_vars < v:
+            self.num_vars += 1
+            self._val.extend((_UNDEF, _UNDEF))
+            self._level.append(0)
+            self._reason.append(None)
+            self._activity.append(0.0)
+            self._phase.append(1)
+            self._seen.append(0)
+            self._watches.extend(([], []))
+            heappush(self._heap, (0.0, self.num_vars))
+
+    def add_clause(self, clause: Iterable[int]) -> bool:
+        """Add a clause of DIMACS literals; returns False once the formula is UNSAT."""
+        if not self.ok:
+            return False
+        self._cancel_until(0)
+        lits: List[int] = []
+        seen = set()
+        for lit in clause:
+            lit = int(lit)
+            if lit == 0:
+                raise ValueError("0 is not a valid literal")
+            self._ensure_var(abs(lit))
+            code = _code(lit)
+            if code ^ 1 in seen or self._val[code] == _TRUE:
+                return True  # tautology or already satisfied at level 0
+            if code in seen or self._val[code] == _FALSE:
+                continue
+            seen.add(code)
+            lits.append(code)
+        if not lits:
+            self.ok = False
+        elif len(lits) == 1:
+            self._enqueue(lits[0], None)
+            self.ok = self._propagate() is None
+        else:
+            self._clauses.append(lits)
+            self._watches[lits[0]].append(lits)
+            self._watches[lits[1]].append(lits)
+        return self.ok
+
+    # ----------------------------
+    # Assignment & propagation
+    # ----------------------------
+
+    def _enqueue(self, code: int, reason: Optional[List[int]]) -> None:
+        v = code >> 1
+        self._val[code] = _TRUE
+        self._val[code ^ 1] = _FALSE
+        self._level[v] = len(self._trail_lim)
+        self._reason[v] = reason
+        self._trail.append(code)
+
+    def _propagate(self) -> Optional[List[int]]:
+        val = self._val
+        watches = self._watches
+        trail = self._trail
+        level = self._level
+        reason = self._reason
+        dl = len(self._trail_lim)
+        qhead = self._qhead
+        props = 0
+        confl: Optional[List[int]] = None
+        while qhead < len(trail):
+            false_lit = trail[qhead] ^ 1
+            qhead += 1
+            props += 1
+            ws = watches[false_lit]
+            n = len(ws)
+            i = j = 0
+            while i < n:
+                c = ws[i]
+                i += 1
+                if c[0] == false_lit:
+                    c[0] = c[1]
+                    c[1] = false_lit
+                first = c[0]
+                if val[first] == _TRUE:
+                    ws[j] = c
+                    j += 1
+                    continue
+                for k in range(2, len(c)):
+                    lk = c[k]
+                    if val[lk] != _FALSE:
+                        c[1] = lk
+                        c[k] = false_lit
+                        watches[lk].append(c)
+                        break
+                else:
+                    ws[j] = c
+                    j += 1
+                    if val[first] == _FALSE:
+                        confl = c
+                        while i < n:
+                            ws[j] = ws[i]
+                            j += 1
+                            i += 1
+                    else:
+                        v = first >> 1
+                        val[first] = _TRUE
+                        val[first ^ 1] = _FALSE
+                        level[v] = dl
+                        reason[v] = c
+                        trail.append(first)
+            del ws[j:]
+            if confl is not None:
+                qhead = len(trail)
+                break
+        self._qhead = qhead
+        self.stats.propagations += props
+        return confl
+
+    def _cancel_until(self, lvl: int) -> None:
+        if len(self._trail_lim) <= lvl:
+            return
+        val = self._val
+        phase = self._phase
+        act = self._activity
+        heap = self._heap
+        stop = self._trail_lim[lvl]
+        trail = self._trail
+        for idx in range(len(trail) - 1, stop - 1, -1):
+            code = trail[idx]
+            v = code >> 1
+            val[code] = _UNDEF
+            val[code ^ 1] = _UNDEF
+            phase[v] = code & 1
+            heappush(heap, (-act[v], v))
+        del trail[stop:]
+        del self._trail_lim[lvl:]
+        self._qhead = len(trail)
+
+    # ----------------------------
+    # Branching heuristic (VSIDS)
+    # ----------------------------
+
+    def _bump(self, v: int) -> None:
+        act = self._activity
+        act[v] += self._var_inc
+        if act[v] > _RESCALE_LIMIT:
+            for i in range(1, self.num_vars + 1):
+                act[i] *= 1e-100
+            self._var_inc *= 1e-100
+            self._rebuild_heap()
+        elif self._val[2 * v] == _UNDEF:
+            heappush(self._heap, (-act[v], v))
+
+    def _rebuild_heap(self) -> None:
+        act = self._activity
+        val = self._val
+        self._heap = [(-act[v], v) for v in range(1, self.num_vars + 1) if val[2 * v] == _UNDEF]
+        heapify(self._heap)
+
+    def _pick_branch(self) -> int:
+        heap = self._heap
+        act = self._activity
+        val = self._val
+        if len(heap) > 8 * self.num_vars + 64:
+            self._rebuild_heap()
+            heap = self._heap
+        while heap:
+            a, v = heappop(heap)
+            if val[2 * v] == _UNDEF and -a == act[v]:
+                return 2 * v + self._phase[v]
+        return -1
+
+    # ----------------------------
+    # Conflict analysis
+    # ----------------------------
+
+    def _analyze(self, confl: List[int]) -> Tuple[List[int], int]:
+        seen = self._seen
+        level = self._level
+        reason = self._reason
+        trail = self._trail
+        dl = len(self._trail_lim)
+        learnt: List[int] = [0]
+        path = 0
+        p = -1
+        idx = len(trail) - 1
+        while True:
+            for q in confl if p == -1 else confl[1:]:
+                v = q >> 1
+                if not seen[v] and level[v] > 0:
+                    self._bump(v)
+                    seen[v] = 1
+                    if level[v] >= dl:
+                        path += 1
+                    else:
+                        learnt.append(q)
+            while not seen[trail[idx] >> 1]:
+                idx -= 1
+            p = trail[idx]
+            idx -= 1
+            seen[p >> 1] = 0
+            path -= 1
+            if path == 0:
+                break
+            confl = reason[p >> 1]  # type: ignore[assignment]
+        learnt[0] = p ^ 1
+
+        # Local minimization: drop literals implied by other learnt literals.
+        kept = [learnt[0]]
+        for q in learnt[1:]:
+            r = reason[q >> 1]
+            if r is None or not all(seen[x >> 1] or level[x >> 1] == 0 for x in r[1:]):
+                kept.append(q)
+        for q in learnt[1:]:
+            seen[q >> 1] = 0
+
+        bt = 0
+        if len(kept) > 1:
+            best = 1
+            for k in range(2, len(kept)):
+                if level[kept[k] >> 1] > level[kept[best] >> 1]:
+                    best = k
+            kept[1], kept[best] = kept[best], kept[1]
+            bt = level[kept[1] >> 1]
+        return kept, bt
+
+    def _analyze_final(self, failed: int) -> List[int]:
+        # Assumptions (including ``failed`` itself) that force ``failed`` false.
+        out = [failed]
+        if not self._trail_lim:
+            return out
+        seen = self._seen
+        seen[failed >> 1] = 1
+        for idx in range(len(self._trail) - 1, self._trail_lim[0] - 1, -1):
+            x = self._trail[idx]
+            v = x >> 1
+            if seen[v]:
+                r = self._reason[v]
+                if r is None:
+                    out.append(x)
+                else:
+                    for q in r[1:]:
+                        if self._level[q >> 1] > 0:
+                            seen[q >> 1] = 1
+                seen[v] = 0
+        seen[failed >> 1] = 0
+        return out
+
+    # ----------------------------
+    # Learnt clause database
+    # ----------------------------
+
+    def _reduce_db(self) -> None:
+        val = self._val
+        reason = self._reason
+        lbd = self._lbd
+        learnts = self._learnts
+        locked = {
+            id(c) for c in learnts if val[c[0]] == _TRUE and reason[c[0] >> 1] is c
+        }
+        ranked = sorted(learnts, key=lambda c: (lbd[id(c)], len(c)))
+        keep_n = len(ranked) // 2
+        kept = []
+        for i, c in enumerate(ranked):
+            if i < keep_n or lbd[id(c)] <= 2 or id(c) in locked:
+                kept.append(c)
+            else:
+                del lbd[id(c)]
+        self._learnts = kept
+        watches = self._watches
+        for ws in watches:
+            ws.clear()
+        for c in self._clauses:
+            watches[c[0]].append(c)
+            watches[c[1]].append(c)
+        for c in kept:
+            watches[c[0]].append(c)
+            watches[c[1]].append(c)
+        self.stats.reductions += 1
+
+    # ----------------------------
+    # Search
+    # ----------------------------
+
+    def _search(self, budget: int, assumptions: List[int]) -> Optional[bool]:
+        stats = self.stats
+        conflicts = 0
+        while True:
+            confl = self._propagate()
+            if confl is not None:
+                stats.conflicts += 1
+                conflicts += 1
+                if not self._trail_lim:
+                    self.ok = False
+                    return False
+                learnt, bt = self._analyze(confl)
+                self._cancel_until(bt)
+                if len(learnt) == 1:
+                    self._enqueue(learnt[0], None)
+                else:
+                    lv = {self._level[q >> 1] for q in learnt}
+                    self._lbd[id(learnt)] = len(lv)
+                    self._learnts.append(learnt)
+                    self._watches[learnt[0]].append(learnt)
+                    self._watches[learnt[1]].append(learnt)
+                    self._enqueue(learnt[0], learnt)
+                    stats.learnts += 1
+                self._var_inc /= _VAR_DECAY
+                continue
+
+            if conflicts >= budget:
+                self._cancel_until(0)
+                return None
+            if len(self._learnts) - len(self._trail) >= self._max_learnts:
+                self._reduce_db()
+                self._max_learnts *= 1.1
+
+            nxt = -1
+            while len(self._trail_lim) < len(assumptions):
+                p = assumptions[len(self._trail_lim)]
+                if self._val[p] == _TRUE:
+                    self._trail_lim.append(len(self._trail))
+                elif self._val[p] == _FALSE:
+                    self.failed_assumptions = [_dimacs(x) for x in self._analyze_final(p)]
+                    return False
+                else:
+                    nxt = p
+                    break
+            if nxt == -1:
+                stats.decisions += 1
+                nxt = self._pick_branch()
+                if nxt == -1:
+                    return True  # all variables assigned
+            self._trail_lim.append(len(self._trail))
+            self._enqueue(nxt, None)
+
+    def solve(
+        self, assumptions: Sequence[int] = (), conflict_limit: Optional[int] = None
+    ) -> Optional[bool]:
+        """
+        Decide the formula under ``assumptions`` (DIMACS literals).
+        Returns True (SAT; see ``model``), False (UNSAT; under assumptions see
+        ``failed_assumptions``) or None when ``conflict_limit`` is exhausted.
+        """
+        self.model = []
+        self.failed_assumptions = []
+        if not self.ok:
+            return False
+        for lit in assumptions:
+            self._ensure_var(abs(int(lit)))
+        assumed = [_code(int(lit)) for lit in assumptions]
+        self._max_learnts = max(self._max_learnts, len(self._clauses) / 3.0, 100.0)
+        start = self.stats.conflicts
+        status: Optional[bool] = None
+        restart = 0
+        while status is None:
+            budget = _luby(restart) * _RESTART_BASE
+            if conflict_limit is not None:
+                left = conflict_limit - (self.stats.conflicts - start)
+                if left <= 0:
+                    break
+                budget = min(budget, left)
+            status = self._search(budget, assumed)
+            restart += 1
+            if status is None:
+                self.stats.restarts += 1
+        if status:
+            val = self._val
+            self.model = [False] + [val[2 * v] == _TRUE for v in range(1, self.num_vars + 1)]
+        self._cancel_until(0)
+        return status
+
+
+# ----------------------------
+# Helpers
+# ----------------------------
+
+
+def solve_cnf(clauses: Iterable[Iterable[int]]) -> bool:
+    """One-shot satisfiability check for DIMACS-style integer clauses."""
+    solver = CDCLSolver(clauses)
+    return bool(solver.solve())
+
+
+def parse_dimacs(source: Union[str, Path]) -> Tuple[int, List[List[int]]]:
+    """Parse DIMACS CNF from a path or text; returns ``(num_vars, clauses)``."""
+    if isinstance(source, Path) or "\n" not in str(source):
+        text = Path(source).read_text(encoding="utf-8")
+    else:
+        text = str(source)
+    num_vars = 0
+    clauses: List[List[int]] = []
+    cur: List[int] = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line[0] in "c%":
+            continue
+        if line[0] == "p":
+            num_vars = int(line.split()[2])
+            continue
+        for tok in line.split():
+            lit = int(tok)
+            if lit == 0:
+                clauses.append(cur)
+                cur = []
+            else:
+                cur.append(lit)
+    if cur:
+        clauses.append(cur)
+    return num_vars, clauses
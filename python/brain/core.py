@@ -1,4 +1,5 @@
 from math import isfinite
+from typing import Any, Optional
 
 
 def entropy_delta(series: list[float]) -> float:
@@ -11,3 +12,52 @@ def entropy_delta(series: list[float]) -> float:
         return 0.0
     denom = max(abs(hi), 1e-9)
     return (hi - lo) / denom
+
+
+def entropy_delta_batch(values: Any, offsets: Optional[Any] = None) -> Any:
+    """
+    `entropy_delta` for many series in one vectorized pass (requires numpy).
+    - `values`: (n_series, length) array, or flat values with CSR `offsets`
+      (n_series + 1 ascending indices; series i is values[offsets[i]:offsets[i+1]])
+    - non-finite entries are skipped (nanmin/nanmax semantics, ±inf too)
+    Returns a float64 array bit-identical to calling `entropy_delta` per series
+    (bools count as 0/1; integers are compared as float64).
+    """
+    import numpy as np
+
+    a = np.asarray(values, dtype=np.float64)
+    finite = np.isfinite(a)
+    clean = a if finite.all() else np.where(finite, a, np.nan)
+    if offsets is None:
+        if a.ndim != 2:
+            raise ValueError("values must be 2-D unless offsets are given")
+        n = a.shape[0]
+        if not a.shape[1]:
+            return np.zeros(n)
+        count = np.count_nonzero(finite, axis=1)
+        hi = np.fmax.reduce(clean, axis=1)
+        lo = np.fmin.reduce(clean, axis=1)
+    else:
+        off = np.asarray(offsets, dtype=np.intp)
+        if a.ndim != 1 or off.ndim != 1 or not len(off):
+            raise ValueError("ragged input needs 1-D values and 1-D offsets")
+        if np.any(np.diff(off) < 0) or off[0] < 0 or off[-1] > len(a):
+            raise ValueError("offsets must be ascending indices into values")
+        n = len(off) - 1
+        csum = np.concatenate(([0], np.cumsum(finite, dtype=np.int64)))
+        count = csum[off[1:]] - csum[off[:-1]]
+        hi = np.full(n, np.nan)
+        lo = np.full(n, np.nan)
+        full = np.flatnonzero(off[1:] > off[:-1])
+        if len(full):
+            # reduceat runs from each start to the next; empty series in
+            # between have zero width, and the slice ends the last one.
+            starts = off[full]
+            part = clean[: off[-1]]
+            hi[full] = np.fmax.reduceat(part, starts)
+            lo[full] = np.fmin.reduceat(part, starts)
+    out = np.zeros(n)
+    ok = (count >= 2) & (hi != lo)
+    top, bottom = hi[ok], lo[ok]
+    out[ok] = (top - bottom) / np.maximum(np.abs(top), 1e-9)
+    return out
@@ -0,0 +1,223 @@
+# Fork exploration for contradictory clause sets: a bounded tree of repair
+# branches, deduplicated by canonical hash, pruned by unit propagation and
+# evaluated on an optional worker pool.
+
+from __future__ import annotations
+
+import hashlib
+from array import array
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .literals import ClauseStore, SymbolTable
+
+Clauses = Tuple[Tuple[int, ...], ...]
+Move = Tuple[str, Tuple[int, ...]]  # ("flip", (lit,)) or ("drop", clause)
+
+
+def canonical_key(clauses: Iterable[Sequence[int]]) -> bytes:
+    """
+    Order-insensitive digest of a clause set: literals sorted inside each
+    clause, duplicate clauses collapsed, clauses sorted. Equivalent clause
+    sets reached through different move orders hash the same.
+    """
+    flat = array("i")
+    for clause in sorted({tuple(sorted(set(c))) for c in clauses}):
+        flat.extend(clause)
+        flat.append(0)
+    return hashlib.blake2b(flat.tobytes(), digest_size=16).digest()
+
+
+def unit_propagate(clauses: Clauses) -> Tuple[bool, List[int]]:
+    """
+    Unit propagation to fixpoint. Returns (True, []) when no conflict
+    arises, else (False, core) with the indices of the conflicting clause
+    and every clause whose implication led to it.
+    """
+    occ: Dict[int, List[int]] = {}
+    queue: List[Tuple[int, int]] = []
+    for i, clause in enumerate(clauses):
+        if not clause:
+            return False, [i]
+        for lit in clause:
+            occ.setdefault(lit, []).append(i)
+        if len(clause) == 1:
+            queue.append((clause[0], i))
+
+    true: Set[int] = set()
+    reason: Dict[int, int] = {}
+
+    def core(start: List[int]) -> List[int]:
+        seen = set(start)
+        stack = list(start)
+        while stack:
+            for lit in clauses[stack.pop()]:
+                j = reason.get(-lit)
+                if j is not None and j not in seen:
+                    seen.add(j)
+                    stack.append(j)
+        return sorted(seen)
+
+    qi = 0
+    while qi < len(queue):
+        lit, why = queue[qi]
+        qi += 1
+        if lit in true:
+            continue
+        if -lit in true:
+            return False, core([why, reason[-lit]])
+        true.add(lit)
+        reason[lit] = why
+        for j in occ.get(-lit, ()):
+            clause = clauses[j]
+            if any(x in true for x in clause):
+                continue
+            free = [x for x in clause if -x not in true]
+            if not free:
+                return False, core([j])
+            if len(free) == 1:
+                queue.append((free[0], j))
+    return True, []
+
+
+class ForkExplorer:
+    """
+    Breadth-first repair search over a contradictory clause set.
+    - moves come from the unit-propagation conflict core: a unit clause is
+      flipped (A → ¬A), a longer clause is dropped
+    - at most `breadth` moves per node, `max_depth` moves per branch and
+      `max_branches` evaluated branches per call
+    - branches are deduplicated by canonical_key before evaluation
+    - a branch that propagates without conflict is HarmonicViable and
+      becomes a leaf; a branch still UNSAT under unit propagation is pruned
+      from the results and only expanded while depth allows
+      (`keep_unviable=True` reports the dead ends at max depth as well)
+    - each level is evaluated on `executor` (or a pool of `workers`
+      processes, created lazily and kept until close())
+    Results are ranked viable first, then by depth, then by canonical key.
+    """
+
+    def __init__(
+        self,
+        max_depth: int = 2,
+        breadth: int = 4,
+        max_branches: int = 256,
+        workers: int = 1,
+        executor: Optional[Executor] = None,
+        keep_unviable: bool = False,
+    ) -> None:
+        if max_depth < 1 or breadth < 1 or max_branches < 1:
+            raise ValueError("max_depth, breadth and max_branches must be >= 1")
+        self.max_depth = max_depth
+        self.breadth = breadth
+        self.max_branches = max_branches
+        self.workers = max(1, workers)
+        self.keep_unviable = keep_unviable
+        self._executor = executor
+        self._owns_executor = False
+
+    def close(self) -> None:
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+            self._owns_executor = False
+
+    def __enter__(self) -> "ForkExplorer":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Executors do not pickle; a copy evaluates in-process until given one.
+        state = self.__dict__.copy()
+        state["_executor"] = None
+        state["_owns_executor"] = False
+        return state
+
+    def _map(self, branches: List[Clauses]) -> List[Tuple[bool, List[int]]]:
+        if self._executor is None and self.workers > 1 and len(branches) > 1:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            self._owns_executor = True
+        if self._executor is None or len(branches) < 2:
+            return [unit_propagate(b) for b in branches]
+        chunk = max(1, len(branches) // (4 * self.workers))
+        return list(self._executor.map(unit_propagate, branches, chunksize=chunk))
+
+    @staticmethod
+    def _moves(clauses: Clauses, core: List[int]) -> Iterable[Tuple[Clauses, Move]]:
+        for i in core:
+            if i >= len(clauses):
+                continue  # a fixed clause: part of the conflict, never repaired
+            clause = clauses[i]
+            if len(clause) == 1:
+                yield clauses[:i] + ((-clause[0],),) + clauses[i + 1 :], ("flip", clause)
+            else:
+                yield clauses[:i] + clauses[i + 1 :], ("drop", clause)
+
+    def explore_ints(
+        self, clauses: Iterable[Sequence[int]], fixed: Iterable[Sequence[int]] = ()
+    ) -> List[Tuple[Clauses, bool, List[Move]]]:
+        """
+        Integer-level search: ranked (clauses, viable, moves) triples.
+        `fixed` clauses constrain every branch but are never flipped or
+        dropped, and are left out of the returned clause sets.
+        """
+        root: Clauses = tuple(tuple(c) for c in clauses)
+        tail: Clauses = tuple(tuple(c) for c in fixed)
+        sat, core = unit_propagate(root + tail)
+        if sat:
+            return []
+        seen = {canonical_key(root)}
+        found: List[Tuple[bytes, Clauses, bool, List[Move], int]] = []
+        frontier: List[Tuple[Clauses, List[int], List[Move]]] = [(root, core, [])]
+        budget = self.max_branches
+        for depth in range(1, self.max_depth + 1):
+            batch: List[Tuple[Clauses, bytes, List[Move]]] = []
+            for clauses_, core_, path in frontier:
+                taken = 0
+                for child, move in self._moves(clauses_, core_):
+                    if taken >= self.breadth or len(batch) >= budget:
+                        break
+                    key = canonical_key(child)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    batch.append((child, key, path + [move]))
+                    taken += 1
+            if not batch:
+                break
+            budget -= len(batch)
+            results = self._map([b[0] + tail for b in batch])
+            frontier = []
+            for (child, key, path), (ok, child_core) in zip(batch, results):
+                if ok:
+                    found.append((key, child, True, path, depth))
+                elif depth < self.max_depth and budget > 0:
+                    frontier.append((child, child_core, path))
+                elif self.keep_unviable:
+                    found.append((key, child, False, path, depth))
+            if not frontier or budget <= 0:
+                break
+        found.sort(key=lambda f: (not f[2], f[4], f[0]))
+        return [(c, viable, path) for _, c, viable, path, _ in found]
+
+    def explore(self, store: ClauseStore, symbols: SymbolTable) -> List[Dict[str, Any]]:
+        """Fork paths in capsule form: text clauses plus the moves taken."""
+        # Stacked negations ("¬¬X" vs "¬X") only clash through the table's
+        # link clauses; a flip may introduce either polarity, so link both.
+        lits = set(store.data)
+        links = symbols.links(lits | {-x for x in lits})
+        text = symbols.text
+        out: List[Dict[str, Any]] = []
+        for clauses, viable, path in self.explore_ints(store, links):
+            moves = [f"{kind}:" + " ∨ ".join(text(x) for x in lits) for kind, lits in path]
+            out.append(
+                {
+                    "clauses": [[text(x) for x in c] for c in clauses],
+                    "HarmonicViable": viable,
+                    "depth": len(path),
+                    "moves": moves,
+                }
+            )
+        return out
@@ -0,0 +1,231 @@
+# Compact glyph storage: slotted, interned Glyph objects with narrative tags as
+# a bitmask, plus a columnar GlyphBatch for bulk evaluation.
+
+from __future__ import annotations
+
+import sys
+from array import array
+from dataclasses import FrozenInstanceError
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Bit i of a tag mask ↔ TAG_VOCABULARY[i]. Masks render back in vocabulary
+# order, which is also the order the engine has always emitted tags in.
+# Unknown tags are registered on first use; once all 64 bits are taken they
+# have no bit and only survive in a Glyph's own tag tuple.
+TAG_VOCABULARY: List[str] = ["proof-out", "np-wall-signal", "collapse", "hedge-signal"]
+_TAG_BITS: Dict[str, int] = {t: 1 << i for i, t in enumerate(TAG_VOCABULARY)}
+_MASK_TAGS: Dict[int, Tuple[str, ...]] = {}
+
+
+def register_tag(name: str) -> int:
+    """Add `name` to the vocabulary (idempotent); returns its bit."""
+    bit = _TAG_BITS.get(name)
+    if bit is None:
+        if len(TAG_VOCABULARY) >= 64:
+            raise ValueError("tag vocabulary is limited to 64 entries")
+        bit = _TAG_BITS[name] = 1 << len(TAG_VOCABULARY)
+        TAG_VOCABULARY.append(name)
+    return bit
+
+
+def tags_to_mask(tags: Iterable[str]) -> int:
+    mask = 0
+    for t in tags:
+        bit = _TAG_BITS.get(t)
+        if bit is None:
+            bit = register_tag(t) if len(TAG_VOCABULARY) < 64 else 0
+        mask |= bit
+    return mask
+
+
+def mask_to_tags(mask: int) -> Tuple[str, ...]:
+    tags = _MASK_TAGS.get(mask)
+    if tags is None:
+        tags = _MASK_TAGS[mask] = tuple(
+            t for i, t in enumerate(TAG_VOCABULARY) if mask >> i & 1
+        )
+    return tags
+
+
+class Glyph:
+    """
+    Immutable glyph: interned symbol, entropy and a narrative-tag bitmask.
+    Accepts `narrative_tags` like the original dataclass; the tags read back
+    as a fresh list in the caller's order. That order (or a duplicate, or a
+    tag past the 64-bit vocabulary) is kept in a side tuple only when it
+    differs from the mask's vocabulary-order rendering.
+    """
+
+    __slots__ = ("symbol", "entropy", "tag_mask", "_tags")
+
+    symbol: str
+    entropy: float
+    tag_mask: int
+    _tags: Optional[Tuple[str, ...]]
+
+    def __init__(
+        self,
+        symbol: str,
+        entropy: float,
+        narrative_tags: Iterable[str] = (),
+        tag_mask: Optional[int] = None,
+    ) -> None:
+        tags = tuple(narrative_tags)
+        mask = tag_mask if tag_mask is not None else tags_to_mask(tags)
+        object.__setattr__(self, "symbol", sys.intern(symbol))
+        object.__setattr__(self, "entropy", entropy)
+        object.__setattr__(self, "tag_mask", mask)
+        object.__setattr__(self, "_tags", tags if tags and tags != mask_to_tags(mask) else None)
+
+    @property
+    def tags(self) -> Tuple[str, ...]:
+        """Narrative tags in the caller's order, as a shared tuple."""
+        return self._tags if self._tags is not None else mask_to_tags(self.tag_mask)
+
+    @property
+    def narrative_tags(self) -> List[str]:
+        return list(self.tags)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise FrozenInstanceError(f"cannot assign to field {name!r}")
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete field {name!r}")
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.symbol, self.entropy, self.tag_mask, self._tags) == (
+            other.symbol,  # type: ignore[attr-defined]
+            other.entropy,  # type: ignore[attr-defined]
+            other.tag_mask,  # type: ignore[attr-defined]
+            other._tags,  # type: ignore[attr-defined]
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.symbol, self.entropy, self.tag_mask, self._tags))
+
+    def __repr__(self) -> str:
+        return (
+            f"Glyph(symbol={self.symbol!r}, entropy={self.entropy!r}, "
+            f"narrative_tags={self.narrative_tags!r})"
+        )
+
+    def __reduce__(self) -> Any:
+        return (self.__class__, (self.symbol, self.entropy, self._tags or (), self.tag_mask))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "symbol": self.symbol,
+            "entropy": self.entropy,
+            "narrative_tags": list(self.tags),
+        }
+
+
+class GlyphBatch:
+    """
+    Columnar glyph storage: per-batch symbol table plus parallel arrays of
+    symbol ids (uint32), entropies (float64) and tag masks (uint64).
+    Set-style queries (`has`, `has_all`, `tags_union`) answer from the symbol
+    table / mask column without materialising Glyph objects. Rows whose
+    glyph keeps its own tag order carry it in a sparse row → tags dict.
+    """
+
+    __slots__ = ("symbols", "symbol_ids", "entropy", "tag_masks", "_ids", "_tag_order")
+
+    def __init__(self) -> None:
+        self.symbols: List[str] = []
+        self.symbol_ids = array("I")
+        self.entropy = array("d")
+        self.tag_masks = array("Q")
+        self._ids: Dict[str, int] = {}
+        self._tag_order: Dict[int, Tuple[str, ...]] = {}
+
+    @classmethod
+    def from_glyphs(cls, glyphs: Iterable[Glyph]) -> "GlyphBatch":
+        batch = cls()
+        batch.extend(glyphs)
+        return batch
+
+    def _symbol_id(self, symbol: str) -> int:
+        sid = self._ids.get(symbol)
+        if sid is None:
+            sid = self._ids[symbol] = len(self.symbols)
+            self.symbols.append(sys.intern(symbol))
+        return sid
+
+    def append(self, glyph: Glyph) -> None:
+        if glyph._tags is not None:
+            self._tag_order[len(self.symbol_ids)] = glyph._tags
+        self.symbol_ids.append(self._symbol_id(glyph.symbol))
+        self.entropy.append(glyph.entropy)
+        self.tag_masks.append(glyph.tag_mask)
+
+    def extend(self, glyphs: Iterable[Glyph]) -> None:
+        for g in glyphs:
+            self.append(g)
+
+    def __len__(self) -> int:
+        return len(self.symbol_ids)
+
+    def __getitem__(self, i: int) -> Glyph:
+        if i < 0:
+            i += len(self.symbol_ids)
+        return Glyph(
+            self.symbols[self.symbol_ids[i]],
+            self.entropy[i],
+            self._tag_order.get(i, ()),
+            self.tag_masks[i],
+        )
+
+    def __iter__(self) -> Iterator[Glyph]:
+        syms = self.symbols
+        order = self._tag_order
+        rows = zip(self.symbol_ids, self.entropy, self.tag_masks)
+        if not order:
+            for sid, ent, mask in rows:
+                yield Glyph(syms[sid], ent, tag_mask=mask)
+            return
+        for i, (sid, ent, mask) in enumerate(rows):
+            yield Glyph(syms[sid], ent, order.get(i, ()), mask)
+
+    # ---- bulk queries ----
+
+    def symbol_set(self) -> frozenset:
+        return frozenset(self.symbols)
+
+    def has(self, symbol: str) -> bool:
+        return symbol in self._ids
+
+    def has_all(self, symbols: Iterable[str]) -> bool:
+        ids = self._ids
+        return all(s in ids for s in symbols)
+
+    def tags_union(self) -> int:
+        mask = 0
+        for m in set(self.tag_masks):
+            mask |= m
+        return mask
+
+    def max_entropy(self) -> float:
+        return max(self.entropy) if self.entropy else 0.0
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [g.to_dict() for g in self]
+
+    def as_numpy(self) -> Dict[str, Any]:
+        """Zero-copy NumPy views of the columns (requires numpy)."""
+        import numpy as np
+
+        return {
+            "symbol_ids": np.frombuffer(self.symbol_ids, dtype=np.uint32),
+            "entropy": np.frombuffer(self.entropy, dtype=np.float64),
+            "tag_masks": np.frombuffer(self.tag_masks, dtype=np.uint64),
+        }
+
+
+def symbols_of(glyphs: "Sequence[Glyph] | GlyphBatch") -> frozenset:
+    """Distinct symbols of a glyph list or batch."""
+    if isinstance(glyphs, GlyphBatch):
+        return glyphs.symbol_set()
+    return frozenset([g.symbol for g in glyphs])
@@ -0,0 +1,217 @@
+# Per-stage instrumentation for UnifiedEngine: wall time, call counts,
+# clause/glyph counts and optional tracemalloc deltas, fanned out to hooks.
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+import tracemalloc
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+# The six numbered stages of UnifiedEngine, in pipeline order.
+STAGES = ("translator", "fork", "forecast", "audit", "crystal", "capsule")
+
+_SUB_BUCKETS = 8  # log2 resolution: 8 buckets per doubling → ≤ ~4.4% error
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed histogram of durations in seconds (mergeable, O(#buckets)).
+    Percentiles come back as the geometric midpoint of the matching bucket;
+    min / max / sum are exact.
+    """
+
+    __slots__ = ("buckets", "count", "total", "min", "max")
+
+    def __init__(self) -> None:
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        ns = seconds * 1e9
+        idx = int(math.log2(ns) * _SUB_BUCKETS) if ns >= 1.0 else 0
+        self.buckets[idx] = self.buckets.get(idx, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for idx, n in other.buckets.items():
+            self.buckets[idx] = self.buckets.get(idx, 0) + n
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q / 100.0 * self.count))
+        seen = 0
+        for idx in sorted(self.buckets):
+            seen += self.buckets[idx]
+            if seen >= rank:
+                mid = 2.0 ** ((idx + 0.5) / _SUB_BUCKETS) / 1e9
+                return min(max(mid, self.min), self.max)
+        return self.max
+
+
+class StageHook:
+    """
+    Receives one call per executed stage. Subclass and override on_stage
+    (the default ignores the call); hooks run synchronously on the engine
+    thread, so keep them cheap.
+    - `counts`: stage-specific sizes (clauses, glyphs, forks, motifs)
+    - `alloc_bytes`: net traced-memory delta, or None without trace_memory
+    """
+
+    def on_stage(
+        self,
+        stage: str,
+        elapsed_s: float,
+        counts: Mapping[str, int],
+        alloc_bytes: Optional[int],
+    ) -> None:
+        return None
+
+
+class StageMetrics(StageHook):
+    """Aggregating hook: per-stage call counts, latency histograms and totals."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hist: Dict[str, LatencyHistogram] = {}
+            self._counts: Dict[str, Dict[str, int]] = {}
+            self._alloc: Dict[str, int] = {}
+
+    def on_stage(
+        self,
+        stage: str,
+        elapsed_s: float,
+        counts: Mapping[str, int],
+        alloc_bytes: Optional[int],
+    ) -> None:
+        with self._lock:
+            hist = self._hist.get(stage)
+            if hist is None:
+                hist = self._hist[stage] = LatencyHistogram()
+                self._counts[stage] = {}
+            hist.add(elapsed_s)
+            totals = self._counts[stage]
+            for k, v in counts.items():
+                totals[k] = totals.get(k, 0) + v
+            if alloc_bytes is not None:
+                self._alloc[stage] = self._alloc.get(stage, 0) + alloc_bytes
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Stage → {calls, total_s, mean_s, p50_s, p99_s, max_s, counts, alloc_bytes}."""
+        with self._lock:
+            out: Dict[str, Dict[str, Any]] = {}
+            for stage in sorted(self._hist, key=_stage_order):
+                hist = self._hist[stage]
+                out[stage] = {
+                    "calls": hist.count,
+                    "total_s": hist.total,
+                    "mean_s": hist.total / hist.count,
+                    "p50_s": hist.percentile(50),
+                    "p99_s": hist.percentile(99),
+                    "max_s": hist.max,
+                    "counts": dict(self._counts[stage]),
+                    "alloc_bytes": self._alloc.get(stage),
+                }
+            return out
+
+
+def _stage_order(stage: str) -> int:
+    return STAGES.index(stage) if stage in STAGES else len(STAGES)
+
+
+class Instrumentation:
+    """
+    Stage recorder handed to UnifiedEngine(instrument=...).
+    - `hooks`: extra StageHook receivers; `metrics` (a StageMetrics) is
+      always attached and backs snapshot()
+    - `trace_memory`: record tracemalloc deltas per stage (starts tracing
+      if it is off; noticeably slower, meant for diagnosis)
+    An engine without instrumentation never touches this module's clocks.
+    """
+
+    def __init__(
+        self, hooks: Iterable[StageHook] = (), trace_memory: bool = False
+    ) -> None:
+        self.metrics = StageMetrics()
+        self.hooks: List[StageHook] = [self.metrics, *hooks]
+        self.trace_memory = trace_memory
+        self._started_tracing = trace_memory and not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+
+    def close(self) -> None:
+        """Stop tracemalloc if this instance started it."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self.trace_memory = False
+
+    def add_hook(self, hook: StageHook) -> None:
+        self.hooks.append(hook)
+
+    def lap(self) -> "StageLap":
+        """Start a lap timer for consecutive stages of one engine run."""
+        return StageLap(self)
+
+    def memory(self) -> Optional[int]:
+        return tracemalloc.get_traced_memory()[0] if self.trace_memory else None
+
+    def record(
+        self,
+        stage: str,
+        elapsed_s: float,
+        counts: Mapping[str, int],
+        mem_before: Optional[int] = None,
+    ) -> None:
+        alloc = None
+        if mem_before is not None:
+            alloc = tracemalloc.get_traced_memory()[0] - mem_before
+        for hook in self.hooks:
+            hook.on_stage(stage, elapsed_s, counts, alloc)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return self.metrics.snapshot()
+
+    def reset(self) -> None:
+        self.metrics.reset()
+
+
+class StageLap:
+    """
+    Times back-to-back stages against one Instrumentation: each stop()
+    records the stage since the previous stop (or creation) and restarts
+    the clock, so hook time is never billed to the next stage.
+    """
+
+    __slots__ = ("_ins", "_mem", "_t0")
+
+    def __init__(self, ins: Instrumentation) -> None:
+        self._ins = ins
+        self.restart()
+
+    def restart(self) -> None:
+        """Drop the time spent since the last stop (work outside any stage)."""
+        self._mem = self._ins.memory()
+        self._t0 = time.perf_counter()
+
+    def stop(self, stage: str, counts: Mapping[str, int]) -> None:
+        self._ins.record(stage, time.perf_counter() - self._t0, counts, self._mem)
+        self.restart()
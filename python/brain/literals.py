@@ -0,0 +1,190 @@
+# Integer-interned literals and a compact DIMACS-style clause store.
+# Motif atoms are numbered once; clauses travel as signed ints and are only
+# rendered back to "A" / "¬A" strings at the capsule boundary.
+
+from __future__ import annotations
+
+import threading
+from array import array
+from typing import Dict, Iterable, Iterator, List, Sequence
+
+NEG = "¬"
+
+
+class SymbolTable:
+    """
+    Bidirectional map between motif atoms and variable ids (1, 2, ...).
+    A text literal is an atom with at most one leading "¬": "¬X" is the
+    negation of atom "X", so "¬¬X" is the negation of atom "¬X". That keeps
+    the string ⇄ int round trip lossless for every input.
+    As with the original string literals, the complement of a text adds or
+    removes one "¬": "¬X" clashes with both "X" and "¬¬X". `negate` follows
+    that rule, and `links` gives the clauses that carry it into a SAT solver.
+    """
+
+    def __init__(self) -> None:
+        self._ids: Dict[str, int] = {}
+        self._atoms: List[str] = [""]  # index 0 is never a variable
+        self._flips: Dict[int, int] = {}  # -var("¬X") → literal("¬X")
+        self._lock = threading.RLock()  # inserts only; lookups stay lock-free
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getstate__(self) -> Dict[str, object]:
+        return {"_ids": self._ids, "_atoms": self._atoms, "_flips": self._flips}
+
+    def __setstate__(self, state: Dict[str, object]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def var(self, atom: str) -> int:
+        v = self._ids.get(atom)
+        if v is None:
+            with self._lock:
+                v = self._ids.get(atom)
+                if v is None:
+                    flip = -self.var(atom[1:]) if atom.startswith(NEG) else 0
+                    v = len(self._atoms)
+                    self._atoms.append(atom)
+                    if flip:
+                        self._flips[-v] = flip
+                    self._ids[atom] = v  # published last for lock-free readers
+        return v
+
+    def atom(self, var: int) -> str:
+        return self._atoms[var]
+
+    def literal(self, text: str) -> int:
+        if text.startswith(NEG):
+            return -self.var(text[1:])
+        return self.var(text)
+
+    def text(self, lit: int) -> str:
+        return NEG + self._atoms[-lit] if lit < 0 else self._atoms[lit]
+
+    @property
+    def stacked(self) -> bool:
+        """True once any atom starts with "¬" (so `negate` differs from -lit)."""
+        return bool(self._flips)
+
+    def negate(self, lit: int) -> int:
+        """Literal of the complementary text: "X" ⇄ "¬X", "¬¬X" → "¬X"."""
+        return self._flips.get(lit, -lit)
+
+    def links(self, lits: Iterable[int]) -> List[List[int]]:
+        """Clauses barring each stacked literal in `lits` together with its
+        text complement (int negation already covers every other pair)."""
+        flips = self._flips
+        if not flips:
+            return []
+        return [[-lit, -flips[lit]] for lit in set(lits) if lit in flips]
+
+
+class ClauseStore:
+    """
+    Clauses as one zero-terminated ``array('i')`` stream (the DIMACS body
+    layout), plus an index of clause end offsets for O(1) access.
+    Integer clause lists such as ``tseitin_cnf`` output load directly.
+    """
+
+    __slots__ = ("data", "_ends")
+
+    def __init__(self) -> None:
+        self.data = array("i")
+        self._ends = array("I")
+
+    @classmethod
+    def from_clauses(cls, clauses: Iterable[Iterable[int]]) -> "ClauseStore":
+        store = cls()
+        for clause in clauses:
+            store.append(clause)
+        return store
+
+    @classmethod
+    def from_units(cls, lits: Sequence[int]) -> "ClauseStore":
+        store = cls()
+        data = store.data = array("i", bytes(8 * len(lits)))
+        data[::2] = array("i", lits)
+        store._ends = array("I", range(1, 2 * len(lits), 2))
+        return store
+
+    @classmethod
+    def from_text(
+        cls, clauses: Iterable[Iterable[str]], symbols: SymbolTable
+    ) -> "ClauseStore":
+        store = cls()
+        for clause in clauses:
+            store.append([symbols.literal(lit) for lit in clause])
+        return store
+
+    def append(self, clause: Iterable[int]) -> None:
+        self.data.extend(clause)
+        self.data.append(0)
+        self._ends.append(len(self.data) - 1)
+
+    def append_unit(self, lit: int) -> None:
+        self.data.append(lit)
+        self.data.append(0)
+        self._ends.append(len(self.data) - 1)
+
+    def __len__(self) -> int:
+        return len(self._ends)
+
+    def __getitem__(self, i: int) -> List[int]:
+        n = len(self._ends)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("clause index out of range")
+        start = self._ends[i - 1] + 1 if i else 0
+        return self.data[start : self._ends[i]].tolist()
+
+    def __iter__(self) -> Iterator[List[int]]:
+        data = self.data
+        start = 0
+        for end in self._ends:
+            yield data[start:end].tolist()
+            start = end + 1
+
+    def first_literals(self) -> List[int]:
+        """First literal of every non-empty clause (the unit backend's view)."""
+        data = self.data
+        out: List[int] = []
+        start = 0
+        for end in self._ends:
+            if end > start:
+                out.append(data[start])
+            start = end + 1
+        return out
+
+    def num_vars(self) -> int:
+        return max((abs(x) for x in self.data), default=0)
+
+    def to_strings(self, symbols: SymbolTable) -> List[List[str]]:
+        text = symbols.text
+        out: List[List[str]] = []
+        cur: List[str] = []
+        for lit in self.data:
+            if lit:
+                cur.append(text(lit))
+            else:
+                out.append(cur)
+                cur = []
+        return out
+
+    def to_dimacs(self, num_vars: int | None = None) -> str:
+        nv = self.num_vars() if num_vars is None else num_vars
+        lines = [f"p cnf {nv} {len(self)}"]
+        lines.extend(" ".join(map(str, clause)) + " 0" for clause in self)
+        return "\n".join(lines) + "\n"
+
+
+def as_int_clauses(
+    clauses: Iterable[Sequence[object]], symbols: SymbolTable
+) -> List[List[int]]:
+    """Normalise clauses of text ("A" / "¬A") or DIMACS-int literals to ints."""
+    return [
+        [lit if isinstance(lit, int) else symbols.literal(str(lit)) for lit in clause]
+        for clause in clauses
+    ]
@@ -0,0 +1,438 @@
+# Config-driven decision rules for TraderEngine / GlyphMutator, compiled into
+# per-feature rule bitsets so evaluation cost tracks the input, not the rule
+# count; tables of a few rules are scanned directly. The engine's historical
+# behaviour ships as DEFAULT_RULE_PACK.
+
+from __future__ import annotations
+
+import json
+import operator
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple, Union
+
+from .glyphs import Glyph, GlyphBatch, symbols_of, tags_to_mask
+
+STAGES = ("forecast", "audit")
+
+_OPS = {"gt": operator.gt, "ge": operator.ge, "lt": operator.lt, "le": operator.le}
+_MEMO_LIMIT = 65536
+# Up to this many rules a table is scanned rule by rule: building the bins and
+# memo key would cost more than the comparisons it saves.
+_SCAN_RULES = 8
+
+# Rule pack format (JSON / dict):
+# {"stages": {"forecast": {"default": {...}, "default_emit": [...], "rules": [
+#     {"name": ..., "priority": 0,
+#      "when": {"all_symbols": [...], "any_symbols": [...], "none_symbols": [...],
+#               "tags": [...], "max_entropy": {"ge": 0.1},
+#               "forecast": {"action": "buy", "confidence": {"gt": 0.9}}},
+#      "result": {...}, "emit": [{"symbol": ..., "entropy": ..., "narrative_tags": [...]}]},
+# ]}}}
+# Numeric predicates use {"gt"|"ge"|"lt"|"le": value}; anything else is equality.
+# The highest priority matching rule wins; ties go to the earlier rule.
+
+DEFAULT_RULE_PACK: Dict[str, Any] = {
+    "stages": {
+        "forecast": {
+            "default": {
+                "action": "hold",
+                "market": "SPY",
+                "confidence": 0.55,
+                "thesis": "neutral",
+            },
+            "default_emit": [],
+            "rules": [
+                {
+                    "name": "np-wall-hedge",
+                    "when": {"all_symbols": ["⥁", "⚛"]},
+                    "result": {
+                        "action": "hedge",
+                        "market": "SPY",
+                        "confidence": 0.93,
+                        "thesis": "entropy-collapse",
+                    },
+                    "emit": [
+                        {
+                            "symbol": "☑",
+                            "entropy": 0.15,
+                            "narrative_tags": ["collapse", "hedge-signal"],
+                        }
+                    ],
+                }
+            ],
+        },
+        "audit": {
+            "default": {"status": "Harmonic", "reason": "Audit passed"},
+            "rules": [
+                {
+                    "name": "unconfirmed-buy",
+                    "when": {
+                        "none_symbols": ["⥁"],
+                        "forecast": {"action": "buy", "confidence": {"gt": 0.9}},
+                    },
+                    "result": {
+                        "status": "Warning",
+                        "reason": "High-confidence buy without entropic (⥁) confirmation",
+                    },
+                }
+            ],
+        },
+    }
+}
+
+
+def _ops(spec: Any) -> Optional[Dict[str, float]]:
+    """Numeric predicate dict, or None when `spec` is an equality value."""
+    if isinstance(spec, Mapping) and spec and set(spec) <= set(_OPS):
+        return {op: float(v) for op, v in spec.items()}
+    return None
+
+
+def _satisfies(value: Any, ops: Mapping[str, float]) -> bool:
+    if not isinstance(value, (int, float)):
+        return False
+    return all(_OPS[op](value, t) for op, t in ops.items())
+
+
+def _max_entropy(glyphs: Union[List[Glyph], GlyphBatch]) -> float:
+    # Same rule for lists and batches: the true maximum, 0.0 without glyphs.
+    if isinstance(glyphs, GlyphBatch):
+        return glyphs.max_entropy()
+    return max([g.entropy for g in glyphs]) if glyphs else 0.0
+
+
+def _fields_match(
+    rule: "Rule", fields: Mapping[str, Any], glyphs: Union[List[Glyph], GlyphBatch]
+) -> bool:
+    # The scan path's forecast / max_entropy predicates; a missing (None)
+    # field matches no constant, as in _EqualityFeature.
+    for name, want in rule.equals.items():
+        got = fields.get(name)
+        if got is None or got != want:
+            return False
+    for name, ops in rule.ranges.items():
+        value = _max_entropy(glyphs) if name == "max_entropy" else fields.get(name)
+        if not isinstance(value, (int, float)):
+            return False
+        for op, t in ops.items():
+            if not _OPS[op](value, t):
+                return False
+    return True
+
+
+def _tag_union(glyphs: Union[List[Glyph], GlyphBatch]) -> int:
+    if isinstance(glyphs, GlyphBatch):
+        return glyphs.tags_union()
+    tags = 0
+    for g in glyphs:
+        tags |= g.tag_mask
+    return tags
+
+
+@dataclass(frozen=True)
+class Rule:
+    name: str
+    result: Dict[str, Any]
+    emit: Tuple[Glyph, ...] = ()
+    priority: int = 0
+    all_symbols: FrozenSet[str] = frozenset()
+    any_symbols: FrozenSet[str] = frozenset()
+    none_symbols: FrozenSet[str] = frozenset()
+    tag_mask: int = 0
+    ranges: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    equals: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_config(cls, spec: Mapping[str, Any]) -> "Rule":
+        when = spec.get("when", {})
+        unknown = set(when) - {
+            "all_symbols", "any_symbols", "none_symbols", "tags", "max_entropy", "forecast"
+        }
+        if unknown:
+            raise ValueError(f"rule {spec.get('name')!r}: unknown predicate(s) {sorted(unknown)}")
+        ranges: Dict[str, Dict[str, float]] = {}
+        equals: Dict[str, Any] = {}
+        if "max_entropy" in when:
+            ops = _ops(when["max_entropy"])
+            if ops is None:
+                raise ValueError("max_entropy needs a {'gt'|'ge'|'lt'|'le': value} range")
+            ranges["max_entropy"] = ops
+        for name, pred in when.get("forecast", {}).items():
+            ops = _ops(pred)
+            if ops is None:
+                equals[name] = pred
+            else:
+                ranges[name] = ops
+        return cls(
+            name=spec["name"],
+            result=dict(spec["result"]),
+            emit=tuple(
+                Glyph(g["symbol"], g["entropy"], g.get("narrative_tags", ()))
+                for g in spec.get("emit", ())
+            ),
+            priority=int(spec.get("priority", 0)),
+            all_symbols=frozenset(when.get("all_symbols", ())),
+            any_symbols=frozenset(when.get("any_symbols", ())),
+            none_symbols=frozenset(when.get("none_symbols", ())),
+            tag_mask=tags_to_mask(when.get("tags", ())),
+            ranges=ranges,
+            equals=equals,
+        )
+
+
+class _NumericFeature:
+    """Thresholds split the line into 2k+1 bins; each bin maps to a rule bitset."""
+
+    def __init__(self, name: str, rules: List[Rule]) -> None:
+        self.name = name
+        self.thresholds = sorted({t for r in rules for t in r.ranges.get(name, {}).values()})
+        ts = self.thresholds
+        reps: List[float] = []
+        for i, t in enumerate(ts):
+            lo = ts[i - 1] if i else t - 1.0
+            reps.extend(((lo + t) / 2.0, t))
+        reps.append(ts[-1] + 1.0)
+        self.bins = [
+            sum(
+                1 << i
+                for i, r in enumerate(rules)
+                if name not in r.ranges or _satisfies(v, r.ranges[name])
+            )
+            for v in reps
+        ]
+        self.missing = sum(1 << i for i, r in enumerate(rules) if name not in r.ranges)
+
+    def bin(self, value: Any) -> int:
+        # Non-numbers and NaN fail every comparison, like the Python operators.
+        if not isinstance(value, (int, float)) or value != value:
+            return -1
+        i = bisect_left(self.thresholds, value)
+        return 2 * i + 1 if i < len(self.thresholds) and self.thresholds[i] == value else 2 * i
+
+    def rules_for(self, b: int) -> int:
+        return self.missing if b < 0 else self.bins[b]
+
+
+class _EqualityFeature:
+    def __init__(self, name: str, rules: List[Rule]) -> None:
+        self.name = name
+        self.missing = sum(1 << i for i, r in enumerate(rules) if name not in r.equals)
+        self.values: Dict[Any, int] = {}
+        for i, r in enumerate(rules):
+            if name in r.equals:
+                v = r.equals[name]
+                self.values[v] = self.values.get(v, self.missing) | 1 << i
+
+    def bin(self, value: Any) -> Any:
+        try:
+            return value if value in self.values else None
+        except TypeError:  # unhashable value never equals a rule constant
+            return None
+
+    def rules_for(self, b: Any) -> int:
+        return self.missing if b is None else self.values[b]
+
+
+class RuleTable:
+    """
+    One stage's rules compiled for evaluation.
+    - symbols: `requirers[s]` / `forbidders[s]` are rule bitsets, so only the
+      symbols present in the input are touched
+    - forecast fields and max_entropy: value → bin → rule bitset
+    - the winning rule per feature signature is memoized, so repeated glyph
+      sets cost one dict lookup whatever the number of rules
+    - up to _SCAN_RULES rules skip all of the above and are tested in order
+    """
+
+    def __init__(
+        self,
+        rules: Iterable[Rule],
+        default: Mapping[str, Any],
+        default_emit: Iterable[Glyph] = (),
+    ) -> None:
+        order = list(rules)
+        self.rules: List[Rule] = sorted(order, key=lambda r: -r.priority)
+        self.default = dict(default)
+        self.default_emit = tuple(default_emit)
+        self._sym_bits: Dict[str, int] = {}
+        self._requirers: Dict[str, int] = {}
+        self._forbidders: Dict[str, int] = {}
+        self._no_req = 0
+        self._req_masks: List[int] = []
+        self._any_masks: List[int] = []
+        for i, r in enumerate(self.rules):
+            for s in r.all_symbols | r.any_symbols | r.none_symbols:
+                self._sym_bits.setdefault(s, 1 << len(self._sym_bits))
+            for s in r.all_symbols:
+                self._requirers[s] = self._requirers.get(s, 0) | 1 << i
+            for s in r.none_symbols:
+                self._forbidders[s] = self._forbidders.get(s, 0) | 1 << i
+            if not r.all_symbols:
+                self._no_req |= 1 << i
+            self._req_masks.append(self._mask(r.all_symbols))
+            self._any_masks.append(self._mask(r.any_symbols))
+        self._bit_syms = list(self._sym_bits)  # bit position → symbol
+        self._uses_tags = any(r.tag_mask for r in self.rules)
+        numeric = sorted({f for r in self.rules for f in r.ranges})
+        equality = sorted({f for r in self.rules for f in r.equals})
+        self._numeric = [_NumericFeature(f, self.rules) for f in numeric]
+        self._equality = [_EqualityFeature(f, self.rules) for f in equality]
+        self._memo: Dict[Tuple[Any, ...], int] = {}
+        self._scan = len(self.rules) <= _SCAN_RULES
+
+    def _mask(self, symbols: Iterable[str]) -> int:
+        m = 0
+        for s in symbols:
+            m |= self._sym_bits[s]
+        return m
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def match(
+        self,
+        glyphs: Union[List[Glyph], GlyphBatch],
+        forecast: Optional[Mapping[str, Any]] = None,
+    ) -> Optional[Rule]:
+        """Highest-priority rule matching `glyphs` (and `forecast`), else None."""
+        if self._scan:
+            return self._match_scan(glyphs, forecast)
+        sym_bits = self._sym_bits
+        present = 0
+        if isinstance(glyphs, GlyphBatch):
+            for s in glyphs.symbols:
+                present |= sym_bits.get(s, 0)
+        else:
+            for g in glyphs:
+                present |= sym_bits.get(g.symbol, 0)
+        tags = _tag_union(glyphs) if self._uses_tags else 0
+        max_entropy = _max_entropy(glyphs) if self._numeric else 0.0
+        fields = forecast or {}
+        bins = tuple(
+            f.bin(max_entropy if f.name == "max_entropy" else fields.get(f.name))
+            for f in self._numeric
+        ) + tuple(f.bin(fields.get(f.name)) for f in self._equality)
+        key = (present, tags, bins)
+        idx = self._memo.get(key)
+        if idx is None:
+            idx = self._resolve(present, tags, bins)
+            if len(self._memo) >= _MEMO_LIMIT:
+                self._memo.clear()
+            self._memo[key] = idx
+        return self.rules[idx] if idx >= 0 else None
+
+    def _match_scan(
+        self,
+        glyphs: Union[List[Glyph], GlyphBatch],
+        forecast: Optional[Mapping[str, Any]],
+    ) -> Optional[Rule]:
+        # Rules are priority-sorted, so the first full match wins; glyph
+        # features are computed only once a rule needs them.
+        fields = forecast or {}
+        syms: Optional[FrozenSet[str]] = None
+        for rule in self.rules:
+            if (rule.equals or rule.ranges) and not _fields_match(rule, fields, glyphs):
+                continue
+            if rule.all_symbols or rule.any_symbols or rule.none_symbols:
+                if syms is None:
+                    syms = symbols_of(glyphs)
+                if not rule.all_symbols <= syms or not rule.none_symbols.isdisjoint(syms):
+                    continue
+                if rule.any_symbols and rule.any_symbols.isdisjoint(syms):
+                    continue
+            if rule.tag_mask and _tag_union(glyphs) & rule.tag_mask != rule.tag_mask:
+                continue
+            return rule
+        return None
+
+    def _resolve(self, present: int, tags: int, bins: Tuple[Any, ...]) -> int:
+        cand = self._no_req
+        banned = 0
+        rest = present
+        while rest:
+            low = rest & -rest
+            rest ^= low
+            s = self._bit_syms[low.bit_length() - 1]
+            cand |= self._requirers.get(s, 0)
+            banned |= self._forbidders.get(s, 0)
+        cand &= ~banned
+        features = [*self._numeric, *self._equality]
+        for f, b in zip(features, bins):
+            cand &= f.rules_for(b)
+        while cand:
+            low = cand & -cand
+            i = low.bit_length() - 1
+            cand ^= low
+            req, any_ = self._req_masks[i], self._any_masks[i]
+            if present & req != req or (any_ and not present & any_):
+                continue
+            mask = self.rules[i].tag_mask
+            if tags & mask != mask:
+                continue
+            return i
+        return -1
+
+    def evaluate(
+        self,
+        glyphs: Union[List[Glyph], GlyphBatch],
+        forecast: Optional[Mapping[str, Any]] = None,
+    ) -> Tuple[Dict[str, Any], List[Glyph]]:
+        """(result dict, glyphs to emit) of the winning rule or the stage default."""
+        if self._scan:
+            rule = self._match_scan(glyphs, forecast)
+        else:
+            rule = self.match(glyphs, forecast)
+        if rule is None:
+            return dict(self.default), list(self.default_emit)
+        return dict(rule.result), list(rule.emit)
+
+
+class RulePack:
+    """Compiled rule tables for every stage (see the format notes above)."""
+
+    def __init__(self, config: Mapping[str, Any]) -> None:
+        stages = config.get("stages", {})
+        unknown = set(stages) - set(STAGES)
+        if unknown:
+            raise ValueError(f"unknown rule stage(s) {sorted(unknown)}; expected {STAGES}")
+        self.tables: Dict[str, RuleTable] = {}
+        for stage in STAGES:
+            spec = stages.get(stage, DEFAULT_RULE_PACK["stages"][stage])
+            self.tables[stage] = RuleTable(
+                (Rule.from_config(r) for r in spec.get("rules", ())),
+                spec["default"],
+                (
+                    Glyph(g["symbol"], g["entropy"], g.get("narrative_tags", ()))
+                    for g in spec.get("default_emit", ())
+                ),
+            )
+
+    def table(self, stage: str) -> RuleTable:
+        return self.tables[stage]
+
+
+_DEFAULT_PACK: Optional[RulePack] = None
+
+
+def default_rule_pack() -> RulePack:
+    """The built-in pack (compiled once, shared)."""
+    global _DEFAULT_PACK
+    if _DEFAULT_PACK is None:
+        _DEFAULT_PACK = RulePack(DEFAULT_RULE_PACK)
+    return _DEFAULT_PACK
+
+
+def load_rule_pack(path: Union[str, Path]) -> RulePack:
+    """Read a rule pack from JSON (or TOML when the file ends in .toml)."""
+    p = Path(path)
+    if p.suffix == ".toml":
+        try:
+            import tomllib
+        except ImportError:  # Python 3.10
+            raise ValueError("TOML rule packs need Python 3.11+; use JSON") from None
+        with open(p, "rb") as f:
+            return RulePack(tomllib.load(f))
+    with open(p, encoding="utf-8") as f:
+        return RulePack(json.load(f))
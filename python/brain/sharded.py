@@ -0,0 +1,148 @@
+# Multi-core runner: shard a motif corpus across a process pool of warm engines.
+# Results come back in input order; one timestamp per run keeps capsule_ids
+# stable regardless of worker count or chunking.
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import asdict
+from itertools import islice
+from typing import Any, Deque, Iterable, Iterator, List, Optional, TextIO
+
+from .unified_engine import Capsule, TranslatorCore, UnifiedEngine
+
+# One warm engine per worker process (set by the pool initializer).
+_WORKER_ENGINE: Optional[UnifiedEngine] = None
+
+
+def _init_worker(solver: str) -> None:
+    global _WORKER_ENGINE
+    _WORKER_ENGINE = UnifiedEngine(solver=solver)
+
+
+def _run_batch(engine: UnifiedEngine, chunk: List[List[str]], timestamp: str) -> List[Capsule]:
+    # Feedback summaries go to stderr so JSONL on stdout stays clean.
+    with contextlib.redirect_stdout(sys.stderr):
+        return engine.run_engine_batch(chunk, timestamp=timestamp)
+
+
+def _run_chunk(chunk: List[List[str]], timestamp: str) -> List[Capsule]:
+    assert _WORKER_ENGINE is not None, "worker not initialised"
+    return _run_batch(_WORKER_ENGINE, chunk, timestamp)
+
+
+def _chunked(items: Iterable[List[str]], size: int) -> Iterator[List[List[str]]]:
+    it = iter(items)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def read_motif_jsonl(stream: TextIO) -> Iterator[List[str]]:
+    """Yield motif lists from JSONL: each line is a JSON array or {"motifs": [...]}."""
+    for lineno, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        obj: Any = json.loads(line)
+        if isinstance(obj, dict):
+            obj = obj.get("motifs")
+        if not isinstance(obj, list) or not all(isinstance(m, str) for m in obj):
+            raise ValueError(f"line {lineno}: expected a list of motif strings")
+        yield obj
+
+
+class ShardedEngineRunner:
+    """
+    Fan motif lists out to `workers` processes in chunks of `chunk_size`.
+    - each worker holds one UnifiedEngine for its lifetime
+    - at most `prefetch` chunks per worker are queued, so huge corpora
+      stream through in bounded memory
+    - workers=1 runs in-process (no pool), which is the scaling baseline
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        chunk_size: int = 256,
+        solver: str = "unit",
+        prefetch: int = 2,
+    ) -> None:
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1")
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.chunk_size = chunk_size
+        self.solver = solver
+        self.prefetch = max(1, prefetch)
+
+    def iter_run(
+        self, motif_lists: Iterable[List[str]], timestamp: Optional[str] = None
+    ) -> Iterator[Capsule]:
+        ts = timestamp if timestamp is not None else UnifiedEngine()._utc_now()
+        chunks = _chunked(motif_lists, self.chunk_size)
+        if self.workers == 1:
+            engine = UnifiedEngine(solver=self.solver)
+            for chunk in chunks:
+                yield from _run_batch(engine, chunk, ts)
+            return
+
+        window = self.workers * self.prefetch
+        with ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_worker, initargs=(self.solver,)
+        ) as pool:
+            pending: Deque[Future] = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(_run_chunk, chunk, ts))
+                if len(pending) >= window:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+    def run(
+        self, motif_lists: Iterable[List[str]], timestamp: Optional[str] = None
+    ) -> List[Capsule]:
+        return list(self.iter_run(motif_lists, timestamp))
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    ap = argparse.ArgumentParser(
+        description="Run UnifiedEngine over a JSONL motif corpus on a process pool."
+    )
+    ap.add_argument("corpus", help="JSONL of motif lists ('-' for stdin)")
+    ap.add_argument("--out", default="-", help="Capsule JSONL output ('-' for stdout)")
+    ap.add_argument("--workers", type=int, default=None, help="Processes (default: all cores)")
+    ap.add_argument("--chunk-size", type=int, default=256, help="Motif lists per task")
+    ap.add_argument("--solver", choices=TranslatorCore.SOLVER_BACKENDS, default="unit")
+    ap.add_argument("--timestamp", default=None, help="Fixed capsule timestamp (default: now)")
+    return ap.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+    runner = ShardedEngineRunner(args.workers, args.chunk_size, args.solver)
+    src: TextIO = sys.stdin if args.corpus == "-" else open(args.corpus, encoding="utf-8")
+    dst: TextIO = sys.stdout if args.out == "-" else open(args.out, "w", encoding="utf-8")
+    count = 0
+    try:
+        for cap in runner.iter_run(read_motif_jsonl(src), args.timestamp):
+            dst.write(json.dumps(asdict(cap), ensure_ascii=False) + "\n")
+            count += 1
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+    print(f"[sharded] workers={runner.workers} capsules={count}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
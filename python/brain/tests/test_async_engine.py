@@ -0,0 +1,74 @@
+import asyncio
+import threading
+import time
+
+from brain.async_engine import AsyncUnifiedEngine
+from brain.unified_engine import UnifiedEngine
+
+BATCH = [["⥁", "⚛", "MARKET:SPY"], ["A", "NOT:A"], ["B"], ["⥁"], ["C", "NOT:D"]]
+
+
+def _engine():
+    engine = UnifiedEngine()
+    engine._utc_now = lambda: "2025-01-01T00:00:00Z"
+    return engine
+
+
+def test_ordered_stream_matches_batch():
+    async def source():
+        for motifs in BATCH:
+            await asyncio.sleep(0)
+            yield motifs
+
+    engine = _engine()
+    caps = asyncio.run(AsyncUnifiedEngine(engine, max_in_flight=3).run_all(source()))
+    assert caps == engine.run_engine_batch(BATCH, timestamp="2025-01-01T00:00:00Z")
+
+
+def test_completion_order_yields_everything():
+    engine = AsyncUnifiedEngine(_engine(), max_in_flight=2, ordered=False)
+    caps = asyncio.run(engine.run_all(BATCH))
+    assert sorted(c.raw_inputs["motifs"] for c in caps) == sorted(BATCH)
+
+
+def test_backpressure_bounds_pulled_items():
+    pulled = []
+
+    async def source():
+        for i in range(100):
+            pulled.append(i)
+            yield ["A", f"SEQ:{i}"]
+
+    async def consume_slowly():
+        agen = AsyncUnifiedEngine(_engine(), max_in_flight=4).stream(source())
+        await agen.__anext__()
+        await asyncio.sleep(0.05)  # results pile up; the source must stall
+        seen = len(pulled)
+        await agen.aclose()
+        return seen
+
+    assert asyncio.run(consume_slowly()) <= 4 + 1
+
+
+def test_event_loop_stays_responsive():
+    class SlowEngine(UnifiedEngine):
+        def run_engine(self, motifs):
+            assert threading.current_thread() is not threading.main_thread()
+            time.sleep(0.02)
+            return super().run_engine(motifs)
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.001)
+
+        task = asyncio.ensure_future(ticker())
+        await AsyncUnifiedEngine(SlowEngine(), max_in_flight=1).run_all(BATCH)
+        task.cancel()
+        return ticks
+
+    assert asyncio.run(main()) > len(BATCH)
@@ -0,0 +1,41 @@
+from brain.cache import StageCache
+from brain.unified_engine import UnifiedEngine
+
+
+def test_lru_and_byte_limits_evict():
+    cache = StageCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" becomes least recently used
+    cache.put("c", 3)
+    assert cache.get("b") is None and cache.get("c") == 3
+    st = cache.stats()
+    assert (st.hits, st.misses, st.evictions, st.entries) == (2, 1, 1, 2)
+    assert st.bytes is None and cache.snapshot()["bytes"] is None
+
+    sized = StageCache(max_entries=None, max_bytes=100)
+    sized.put("x", "v", size=60)
+    sized.put("y", "v", size=60)
+    assert sized.get("x") is None and sized.stats().bytes == 60
+
+
+def test_ttl_expires_entries():
+    now = [0.0]
+    cache = StageCache(ttl=10, clock=lambda: now[0])
+    cache.put("k", "v")
+    now[0] = 9.9
+    assert cache.get("k") == "v"
+    now[0] = 10.0
+    assert cache.get("k") is None
+    assert cache.stats().expirations == 1
+
+
+def test_cached_engine_matches_uncached_and_counts_hits():
+    plain = UnifiedEngine()
+    cached = UnifiedEngine(cache=StageCache(max_entries=8))
+    for e in (plain, cached):
+        e._utc_now = lambda: "2025-01-01T00:00:00Z"
+    corpus = [["⥁", "⚛", "MARKET:SPY"], ["A", "NOT:A"]] * 3
+    assert [cached.run_engine(m) for m in corpus] == [plain.run_engine(m) for m in corpus]
+    st = cached.cache.stats()
+    assert (st.hits, st.misses) == (4, 2)
@@ -0,0 +1,39 @@
+import hashlib
+import json
+from dataclasses import asdict
+
+from brain import capsule_codec
+from brain.unified_engine import Capsule, UnifiedEngine
+
+
+def test_known_encodings_follow_deterministic_cbor():
+    assert capsule_codec.dumps(0) == b"\x00"
+    assert capsule_codec.dumps(-1) == b"\x20"
+    assert capsule_codec.dumps(500) == b"\x19\x01\xf4"
+    assert capsule_codec.dumps("a") == b"\x61a"
+    assert capsule_codec.dumps([True, None]) == b"\x82\xf5\xf6"
+    assert capsule_codec.dumps(0.5) == b"\xfb\x3f\xe0\x00\x00\x00\x00\x00\x00"
+    # keys ordered by encoded bytes: shorter keys first, then bytewise
+    assert capsule_codec.dumps({"bb": 1, "a": 2}) == b"\xa2\x61a\x02\x62bb\x01"
+
+
+def test_capsule_bytes_round_trip_and_streamed_json_ids():
+    engine = UnifiedEngine()
+    engine._utc_now = lambda: "2025-01-01T00:00:00Z"
+    cap = engine.run_engine(["A", "NOT:A", "MARKET:QQQ"])
+    assert Capsule.from_bytes(cap.to_bytes()) == cap
+
+    payload = {k: v for k, v in asdict(cap).items() if k != "capsule_id"}
+    legacy = json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    assert cap.capsule_id == hashlib.sha256(legacy).hexdigest()
+    # long lists are hashed slice by slice; the id must not move
+    for n in (2047, 2048, 2049, 9000):
+        big = dict(payload, clauses=[[f"X{i}", "¬Y"] for i in range(n)], empty=[], nested={})
+        legacy = json.dumps(big, ensure_ascii=False, sort_keys=True).encode("utf-8")
+        assert capsule_codec.capsule_id(big) == hashlib.sha256(legacy).hexdigest()
+        assert capsule_codec.capsule_id(big, stream=False) == capsule_codec.capsule_id(big)
+    many = [f"M{i}" if i % 2 else f"NOT:M{i}" for i in range(3000)]
+    cap = engine.run_engine(many)  # past STREAM_ITEMS: the engine streams the id
+    payload = {k: v for k, v in asdict(cap).items() if k != "capsule_id"}
+    legacy = json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    assert cap.capsule_id == hashlib.sha256(legacy).hexdigest()
@@ -0,0 +1,103 @@
+import json
+import os
+import pickle
+import subprocess
+import sys
+from pathlib import Path
+
+from brain.capsule_log import CapsuleLog
+from brain.unified_engine import UnifiedEngine
+
+
+def _capsules(n):
+    engine = UnifiedEngine()
+    batch = [[f"M{i}", "⥁", "⚛"] if i % 3 == 0 else [f"M{i}", "NOT:X"] for i in range(n)]
+    return engine.run_engine_batch(batch, timestamp="2025-01-01T00:00:00Z")
+
+
+def test_append_get_scan_rollover_and_reopen(tmp_path):
+    caps = _capsules(300)
+    with CapsuleLog(tmp_path / "log", max_segment_bytes=4096, sync_every=50) as log:
+        assert log.extend(caps) == 300
+        assert not log.append(caps[0])  # same capsule_id → stored once
+        assert log.get(caps[123].capsule_id) == caps[123]
+        assert log.get("missing") is None
+    assert len(list((tmp_path / "log").glob("*.seg"))) > 1
+    with CapsuleLog(tmp_path / "log") as log:
+        assert len(log) == 300
+        assert list(log.scan()) == caps
+        assert caps[-1].capsule_id in log
+
+
+def test_torn_tail_and_lost_index_are_recovered(tmp_path):
+    caps = _capsules(20)
+    with CapsuleLog(tmp_path, sync_every=1) as log:
+        log.extend(caps)
+    seg = sorted(tmp_path.glob("*.seg"))[-1]
+    with open(seg, "ab") as f:
+        f.write(b"\x40\x00\x00\x00garbage")  # half-written record
+    (tmp_path / "index.bin").unlink()
+    with CapsuleLog(tmp_path) as log:
+        assert list(log.scan()) == caps
+        assert log.get(caps[7].capsule_id) == caps[7]
+        log.append(_capsules(21)[-1])
+        assert len(log) == 21
+
+
+def test_delete_compact_and_export(tmp_path):
+    caps = _capsules(50)
+    with CapsuleLog(tmp_path / "log", max_segment_bytes=2048) as log:
+        log.extend(caps)
+        for cap in caps[:25]:
+            assert log.delete(cap.capsule_id)
+        assert log.compact() > 0
+        assert list(log.scan()) == caps[25:]
+        assert log.get(caps[0].capsule_id) is None
+        assert log.get(caps[30].capsule_id) == caps[30]
+        assert log.export_files(tmp_path / "out") == 25
+    exported = tmp_path / "out" / f"brain-{caps[30].capsule_id}.json"
+    assert json.loads(exported.read_text(encoding="utf-8"))["capsule_id"] == caps[30].capsule_id
+
+
+def _killed_between_syncs(path, caps, synced):
+    """Child appends `synced` capsules, syncs, appends the rest and dies."""
+    code = (
+        "import os, pickle, sys\n"
+        "from brain.capsule_log import CapsuleLog\n"
+        "caps, n = pickle.load(sys.stdin.buffer)\n"
+        "log = CapsuleLog(sys.argv[1], sync_every=10**6, sync_interval=None)\n"
+        "log.extend(caps[:n])\n"
+        "log.sync()\n"
+        "print(log._writer.tell(), flush=True)\n"
+        "log.extend(caps[n:])\n"
+        "os._exit(0)\n"
+    )
+    env = dict(os.environ, PYTHONPATH=str(Path(__file__).resolve().parents[2]))
+    out = subprocess.run(
+        [sys.executable, "-c", code, str(path)],
+        input=pickle.dumps((caps, synced)),
+        env=env,
+        capture_output=True,
+        check=True,
+    )
+    return int(out.stdout)
+
+
+def test_kill_between_syncs(tmp_path):
+    caps = _capsules(60)
+    _killed_between_syncs(tmp_path / "a", caps, 50)
+    with CapsuleLog(tmp_path / "a") as log:  # process died: flushed bytes survive
+        assert len(log) == 60 and list(log.scan()) == caps
+
+    # Power loss: the index slots hit the disk, the unsynced records did not.
+    synced_end = _killed_between_syncs(tmp_path / "b", caps, 50)
+    seg = sorted((tmp_path / "b").glob("*.seg"))[-1]
+    with open(seg, "r+b") as f:
+        f.truncate(synced_end)
+    with CapsuleLog(tmp_path / "b") as log:
+        assert len(log) == 50 and list(log.scan()) == caps[:50]
+        assert log.get(caps[59].capsule_id) is None
+        assert log.extend(caps[50:]) == 10
+        assert log.get(caps[59].capsule_id) == caps[59]
+    with CapsuleLog(tmp_path / "b") as log:
+        assert len(log) == 60 and list(log.scan()) == caps
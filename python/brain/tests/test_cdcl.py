@@ -0,0 +1,69 @@
+import time
+from itertools import product
+from pathlib import Path
+import random
+
+import pytest
+
+from brain.cdcl import CDCLSolver, parse_dimacs, solve_cnf
+from brain.unified_engine import TranslatorCore
+
+TSEITIN_N60 = Path(__file__).resolve().parents[3] / "capsules" / "tseitin_n60.cnf"
+
+
+def _brute_force(n, clauses):
+    return any(
+        all(any(bits[abs(lit) - 1] == (lit > 0) for lit in c) for c in clauses)
+        for bits in product((False, True), repeat=n)
+    )
+
+
+def test_matches_brute_force_on_random_3sat():
+    rng = random.Random(7)
+    for _ in range(200):
+        n = rng.randint(3, 8)
+        clauses = [
+            [rng.choice((-1, 1)) * rng.randint(1, n) for _ in range(3)]
+            for _ in range(rng.randint(1, 40))
+        ]
+        solver = CDCLSolver(clauses)
+        sat = solver.solve()
+        assert sat == _brute_force(n, clauses)
+        if sat:
+            assert all(any(solver.model[abs(lit)] == (lit > 0) for lit in c) for c in clauses)
+
+
+def test_pigeonhole_is_unsat():
+    # 4 pigeons, 3 holes: var(p, h) = 3 * p + h + 1
+    var = lambda p, h: 3 * p + h + 1  # noqa: E731
+    clauses = [[var(p, h) for h in range(3)] for p in range(4)]
+    for h in range(3):
+        for a in range(4):
+            for b in range(a + 1, 4):
+                clauses.append([-var(a, h), -var(b, h)])
+    assert solve_cnf(clauses) is False
+
+
+def test_incremental_assumptions():
+    solver = CDCLSolver([[1, 2], [-1, 3]])
+    assert solver.solve(assumptions=[1]) is True
+    assert solver.solve(assumptions=[1, -3]) is False
+    assert set(solver.failed_assumptions) <= {1, -3}
+    solver.add_clause([-2])
+    assert solver.solve(assumptions=[-1]) is False
+    assert solver.solve() is True
+
+
+def test_translator_cdcl_backend_on_strings():
+    tc = TranslatorCore(solver="cdcl")
+    assert tc.minisat_solve([["A"], ["¬A"]]) is False
+    assert tc.minisat_solve([["A", "B"], ["¬A"]]) is True
+    assert tc.minisat_solve([["A", "B"], ["¬A", "B"], ["A", "¬B"], ["¬A", "¬B"]]) is False
+
+
+@pytest.mark.skipif(not TSEITIN_N60.exists(), reason="Tseitin n=60 capsule CNF not found")
+def test_tseitin_n60_unsat_within_budget():
+    _, clauses = parse_dimacs(TSEITIN_N60)
+    t0 = time.perf_counter()
+    assert TranslatorCore(solver="cdcl").minisat_solve(clauses) is False
+    assert time.perf_counter() - t0 < 30.0
@@ -14,3 +14,51 @@ def test_entropy_delta_empty_and_nans_safe():
 
 def test_entropy_delta_ignores_internal_nans():
     assert entropy_delta([1.0, float("nan"), 5.0]) == pytest.approx(0.8)
+
+
+def _random_series(rng, n, length):
+    pool = [float("nan"), float("inf"), -float("inf"), 0.0, -0.0, 1e-12, -1e-12, 3.0, 3.0]
+    rows = []
+    for _ in range(n):
+        size = rng.integers(0, length + 1)
+        row = []
+        for _ in range(size):
+            if rng.random() < 0.35:
+                row.append(pool[rng.integers(len(pool))])
+            else:
+                row.append(float(rng.normal(0, 10.0 ** rng.integers(-10, 4))))
+        rows.append(row)
+    return rows
+
+
+def test_entropy_delta_batch_matches_scalar_on_2d():
+    np = pytest.importorskip("numpy")
+    from brain.core import entropy_delta_batch
+
+    rng = np.random.default_rng(7)
+    for length in (0, 1, 2, 5, 17):
+        rows = _random_series(rng, 300, length)
+        grid = np.full((len(rows), length), np.nan)
+        for i, row in enumerate(rows):
+            grid[i, : len(row)] = row  # NaN padding is ignored like any non-finite value
+        got = entropy_delta_batch(grid)
+        want = [entropy_delta(row) for row in rows]
+        assert got.tolist() == want  # exact, not approx
+
+
+def test_entropy_delta_batch_ragged_and_edge_cases():
+    np = pytest.importorskip("numpy")
+    from brain.core import entropy_delta_batch
+
+    rng = np.random.default_rng(11)
+    rows = _random_series(rng, 500, 9) + [[], [], [True, False], [2, 2], [1e-10, 2e-10]]
+    rows = [[]] + rows + [[]]
+    offsets = np.cumsum([0] + [len(r) for r in rows])
+    values = np.array([x for r in rows for x in r], dtype=np.float64)
+    got = entropy_delta_batch(values, offsets)
+    assert got.tolist() == [entropy_delta(r) for r in rows]
+    assert entropy_delta_batch(np.empty((3, 0))).tolist() == [0.0, 0.0, 0.0]
+    with pytest.raises(ValueError):
+        entropy_delta_batch(values, offsets[::-1])
+    with pytest.raises(ValueError):
+        entropy_delta_batch(values)
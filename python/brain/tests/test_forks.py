@@ -0,0 +1,36 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from brain.forks import ForkExplorer, canonical_key, unit_propagate
+from brain.unified_engine import UnifiedEngine
+
+
+def test_unit_propagation_core_and_canonical_key():
+    assert unit_propagate(((1,), (-1, 2), (3,))) == (True, [])
+    # 1 → 2 via clause 1, clashes with unit ¬2; clause 2 is not involved
+    assert unit_propagate(((1,), (-1, 2), (3,), (-2,))) == (False, [0, 1, 3])
+    assert canonical_key([[2, 1], [3]]) == canonical_key([(3,), (1, 2), (2, 1)])
+    assert canonical_key([[1]]) != canonical_key([[-1]])
+
+
+def test_explorer_ranks_dedups_and_prunes():
+    clauses = [(1,), (-1,), (1, 2), (-2,)]
+    with ForkExplorer(max_depth=2, breadth=4, keep_unviable=True) as explorer:
+        ranked = explorer.explore_ints(clauses)
+    viable = [r for r in ranked if r[1]]
+    assert viable and ranked[: len(viable)] == viable  # viable branches first
+    keys = [canonical_key(c) for c, _, _ in ranked]
+    assert len(keys) == len(set(keys))
+    assert all(unit_propagate(c)[0] == ok for c, ok, _ in ranked)
+    strict = ForkExplorer(max_depth=2, breadth=4).explore_ints(clauses)
+    assert strict == viable
+    assert ForkExplorer().explore_ints([(1,), (2,)]) == []
+
+
+def test_engine_fork_explorer_on_executor():
+    with ThreadPoolExecutor(2) as pool:
+        engine = UnifiedEngine(fork_explorer=ForkExplorer(executor=pool))
+        cap = engine.run_engine(["A", "NOT:A", "B"])
+    assert cap.proof_claim == "Contradiction"
+    assert [f["moves"] for f in cap.fork_paths] == [["flip:A"], ["flip:¬A"]]
+    assert all(f["HarmonicViable"] for f in cap.fork_paths)
+    assert cap.fork_paths[0]["clauses"] == [["¬A"], ["¬A"], ["B"]]
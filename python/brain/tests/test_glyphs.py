@@ -0,0 +1,66 @@
+import pickle
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+from brain import glyphs
+from brain.glyphs import Glyph, GlyphBatch, mask_to_tags, tags_to_mask
+from brain.unified_engine import GlyphMutator, TraderEngine
+
+
+def test_glyph_is_frozen_and_to_dict_unchanged():
+    g = Glyph(symbol="⥁", entropy=0.12, narrative_tags=["np-wall-signal", "proof-out"])
+    assert g.to_dict() == {
+        "symbol": "⥁",
+        "entropy": 0.12,
+        "narrative_tags": ["np-wall-signal", "proof-out"],  # caller's order
+    }
+    assert g != Glyph("⥁", 0.12, ["proof-out", "np-wall-signal"])
+    assert Glyph("⥁", 0.12, ["proof-out", "np-wall-signal"])._tags is None  # no side tuple
+    assert Glyph("⥁", 0.12, ["collapse", "collapse"]).narrative_tags == ["collapse", "collapse"]
+    with pytest.raises(FrozenInstanceError):
+        g.entropy = 0.5  # type: ignore[misc]
+    assert not hasattr(g, "__dict__")
+    assert pickle.loads(pickle.dumps(g)) == g
+    assert Glyph("".join(["MARKET", ":SPY"]), 0.08).symbol is Glyph("MARKET:SPY", 0.08).symbol
+
+
+def test_tag_mask_round_trip_and_unknown_tags(monkeypatch):
+    mask = tags_to_mask(["hedge-signal", "collapse"])
+    assert mask_to_tags(mask) == ("collapse", "hedge-signal")
+
+    vocab = list(glyphs.TAG_VOCABULARY)
+    monkeypatch.setattr(glyphs, "TAG_VOCABULARY", vocab)
+    monkeypatch.setattr(glyphs, "_TAG_BITS", {t: 1 << i for i, t in enumerate(vocab)})
+    monkeypatch.setattr(glyphs, "_MASK_TAGS", {})
+    g = Glyph("A", 0.1, ["no-such-tag", "proof-out"])  # registered on first use
+    assert vocab[-1] == "no-such-tag" and g.tag_mask == tags_to_mask(["proof-out", "no-such-tag"])
+    assert g.to_dict()["narrative_tags"] == ["no-such-tag", "proof-out"]
+    for i in range(len(vocab), 64):
+        glyphs.register_tag(f"t{i}")
+    full = Glyph("A", 0.1, ["proof-out", "overflow"])  # no bit left: kept on the glyph
+    assert full.tag_mask == tags_to_mask(["proof-out"]) and len(vocab) == 64
+    assert full.narrative_tags == ["proof-out", "overflow"]
+    batch = GlyphBatch.from_glyphs([Glyph("B", 0.2), full, g])
+    assert list(batch) == [Glyph("B", 0.2), full, g] and batch[-1] == g
+    assert pickle.loads(pickle.dumps(full)) == full
+
+
+def test_batch_columns_and_engine_parity():
+    glyphs = [
+        Glyph("⥁", 0.12, ["proof-out", "np-wall-signal"]),
+        Glyph("⚛", 0.12, ["proof-out", "np-wall-signal"]),
+        Glyph("⥁", 0.12, ["proof-out", "np-wall-signal"]),
+    ]
+    batch = GlyphBatch.from_glyphs(glyphs)
+    assert len(batch) == 3 and list(batch) == glyphs
+    assert list(batch.symbol_ids) == [0, 1, 0]
+    assert batch.has_all(["⥁", "⚛"]) and not batch.has("A")
+    assert mask_to_tags(batch.tags_union()) == ("proof-out", "np-wall-signal")
+
+    trader, mutator = TraderEngine(), GlyphMutator()
+    forecast, new = trader.forecast_and_act(batch)
+    assert (forecast, new) == trader.forecast_and_act(glyphs)
+    assert trader.export_crystal_patterns(GlyphBatch.from_glyphs(new)) == ["CRYSTAL:COLLAPSE☑"]
+    buy = {"action": "buy", "confidence": 0.95}
+    assert mutator.audit_narrative(buy, batch) == mutator.audit_narrative(buy, glyphs)
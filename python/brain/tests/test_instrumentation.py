@@ -0,0 +1,56 @@
+from brain.instrumentation import STAGES, Instrumentation, LatencyHistogram, StageHook
+from brain.unified_engine import UnifiedEngine
+
+
+class _Recorder(StageHook):
+    def __init__(self):
+        self.calls = []
+
+    def on_stage(self, stage, elapsed_s, counts, alloc_bytes):
+        self.calls.append((stage, dict(counts), alloc_bytes))
+
+
+def test_histogram_percentiles_within_bucket_error():
+    hist = LatencyHistogram()
+    for i in range(1, 1001):
+        hist.add(i * 1e-6)
+    assert hist.count == 1000 and hist.max == 1e-3
+    assert abs(hist.percentile(50) - 500e-6) / 500e-6 < 0.05
+    assert abs(hist.percentile(99) - 990e-6) / 990e-6 < 0.05
+    other = LatencyHistogram()
+    other.add(2.0)
+    hist.merge(other)
+    assert hist.percentile(100) == 2.0
+
+
+def test_engine_reports_all_six_stages_to_hooks_and_snapshot():
+    rec = _Recorder()
+    ins = Instrumentation(hooks=[rec], trace_memory=True)
+    engine = UnifiedEngine(instrument=ins)
+    engine.run_engine(["⥁", "⚛", "A", "NOT:A"])
+    engine.run_engine_batch([["B"], ["C", "D"]])
+    ins.close()
+    assert [c[0] for c in rec.calls[:6]] == list(STAGES)
+    assert rec.calls[0][1] == {"clauses": 4, "glyphs": 4}
+    assert all(isinstance(c[2], int) for c in rec.calls)
+    snap = ins.snapshot()
+    assert list(snap) == list(STAGES)
+    assert snap["translator"]["calls"] == 3
+    assert snap["translator"]["counts"]["clauses"] == 7
+    assert snap["fork"]["counts"]["forks"] == 2
+    assert 0 < snap["capsule"]["p50_s"] <= snap["capsule"]["p99_s"] <= snap["capsule"]["max_s"]
+
+
+def test_instrumented_capsules_match_plain_ones():
+    plain, timed = UnifiedEngine(), UnifiedEngine(instrument=Instrumentation())
+    batch = [["⥁", "⚛"], ["A", "NOT:A"]]
+    ts = "2025-01-01T00:00:00Z"
+    assert plain.run_engine_batch(batch, ts) == timed.run_engine_batch(batch, ts)
+
+
+def test_base_hook_is_a_noop_and_fixpoint_rounds_are_timed():
+    rec = _Recorder()
+    ins = Instrumentation(hooks=[StageHook(), rec])
+    UnifiedEngine(instrument=ins).run_until_fixpoint(["⥁", "⚛"], max_rounds=1)
+    assert [c[0] for c in rec.calls] == list(STAGES)
+    assert rec.calls[0][1] == {"clauses": 2, "glyphs": 2}
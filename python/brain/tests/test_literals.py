@@ -0,0 +1,90 @@
+from brain import unified_engine
+from brain.forks import ForkExplorer
+from brain.literals import ClauseStore, SymbolTable
+from brain.unified_engine import ParadoxForker, TranslatorCore, UnifiedEngine
+
+
+def test_text_round_trip_is_lossless():
+    symbols = SymbolTable()
+    clauses = [["A"], ["¬A", "B"], ["¬¬A"], ["¬"], ["MARKET:SPY", "¬⥁"]]
+    store = ClauseStore.from_text(clauses, symbols)
+    assert store.to_strings(symbols) == clauses
+    assert symbols.literal("¬A") == -symbols.literal("A")
+    assert store.data.tolist()[:2] == [symbols.var("A"), 0]
+
+
+def test_store_shares_dimacs_int_clauses():
+    clauses = [[1, 2, 3], [-1, -2, 3], [-3]]
+    store = ClauseStore.from_clauses(clauses)
+    assert list(store) == clauses
+    assert store[1] == [-1, -2, 3] and store[-1] == [-3]
+    assert store.to_dimacs().splitlines()[0] == "p cnf 3 3"
+    assert ClauseStore.from_units([4, -5]).data.tolist() == [4, 0, -5, 0]
+
+
+def test_translator_interns_motifs():
+    tc = TranslatorCore()
+    assert tc.motif_to_clauses(["A", " NOT:A ", "", "B"]) == [["A"], ["¬A"], ["B"]]
+    store = tc.motif_to_store(["A", "NOT:A"])
+    assert store.data.tolist() == [1, 0, -1, 0]
+    assert tc.minisat_solve(store) is False
+
+
+def test_forker_accepts_text_or_store():
+    tc = TranslatorCore()
+    store = tc.motif_to_store(["A", "NOT:A"])
+    forker = ParadoxForker()
+    from_store = forker.detect_and_fork("Contradiction", store, tc.symbols)
+    from_text = forker.detect_and_fork("Contradiction", [["A"], ["¬A"]])
+    assert from_store == from_text
+    assert from_store[0]["clauses"] == [["¬A"], ["¬A"]]
+
+
+def test_stacked_negation_keeps_string_semantics():
+    # as with the original string literals, "¬X" clashes with "X" and "¬¬X"
+    tc = TranslatorCore()
+    assert tc.motif_to_clauses(["¬¬X", "NOT:¬A"]) == [["¬¬X"], ["¬¬A"]]
+    cases = {
+        ("¬¬X", "¬X"): False,
+        ("NOT:¬A", "¬A"): False,
+        ("¬¬X", "X"): True,
+        ("¬¬¬X", "X"): True,
+        ("NOT:¬¬A", "NOT:¬A"): False,
+    }
+    for solver in TranslatorCore.SOLVER_BACKENDS:
+        tc = TranslatorCore(solver=solver)
+        for motifs, sat in cases.items():
+            assert tc.run_proof_store(list(motifs))[0] is sat, (solver, motifs)
+    engine = UnifiedEngine()
+    engine._utc_now = lambda: "2025-01-01T00:00:00Z"
+    for motifs in cases:
+        assert engine.run_until_fixpoint(list(motifs))[0] == engine.run_engine(list(motifs))
+    # the clash exists only through the link clauses; forks must see it too
+    tc = TranslatorCore()
+    sat, claim, store, _ = tc.run_proof_store(["¬¬X", "¬X"])
+    forks = ParadoxForker(ForkExplorer()).detect_and_fork(claim, store, tc.symbols)
+    assert not sat and forks and all(f["HarmonicViable"] for f in forks)
+    assert sorted(f["moves"] for f in forks) == [["flip:¬X"], ["flip:¬¬X"]]
+    assert all(f["clauses"] != [["¬¬X"], ["¬X"]] for f in forks)
+
+
+def test_translator_symbol_table_is_bounded(monkeypatch):
+    monkeypatch.setattr(unified_engine, "_MEMO_LIMIT", 6)
+    engine = UnifiedEngine()
+    engine.translator.max_symbols = 8
+    reference = UnifiedEngine()
+    batch = [[f"M{i}", f"NOT:M{i + 1}", "A"] for i in range(50)]
+    caps = engine.run_engine_batch(batch, timestamp="T")
+    assert caps == reference.run_engine_batch(batch, timestamp="T")
+    assert len(engine.translator.symbols) <= 8 + 3  # one motif list past the bound
+    for motifs in batch[:5]:
+        assert engine.run_engine(motifs) == reference.run_engine(motifs)
+    assert len(engine.translator.symbols) <= 8 + 3
+    assert len(reference.translator.symbols) > 50
+    # single calls share the translator's memo: a repeat encodes nothing new
+    memo = reference.translator.scope()[1]
+    assert 0 < len(memo) <= 6 + 3
+    reference.run_engine(batch[0])
+    before = dict(memo)
+    reference.run_engine(batch[0])
+    assert memo == before
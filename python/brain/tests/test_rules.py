@@ -0,0 +1,104 @@
+import json
+import random
+
+import pytest
+
+from brain import rules as rules_mod
+from brain.glyphs import Glyph, GlyphBatch
+from brain.rules import RulePack, load_rule_pack
+from brain.unified_engine import GlyphMutator, TraderEngine
+
+WALL = [Glyph("⥁", 0.12, ["proof-out", "np-wall-signal"]), Glyph("⚛", 0.12, ["proof-out"])]
+
+
+def test_default_pack_reproduces_builtin_rules():
+    trader, mutator = TraderEngine(), GlyphMutator()
+    forecast, new = trader.forecast_and_act(WALL)
+    assert forecast["action"] == "hedge" and [g.symbol for g in new] == ["☑"]
+    assert trader.forecast_and_act(WALL[1:])[0]["thesis"] == "neutral"
+    buy = {"action": "buy", "confidence": 0.95}
+    assert mutator.audit_narrative(buy, WALL[1:])["status"] == "Warning"
+    assert mutator.audit_narrative(buy, WALL)["status"] == "Harmonic"
+    assert mutator.audit_narrative({"action": "buy", "confidence": 0.9}, [])["status"] == "Harmonic"
+
+
+def test_priority_ranges_and_many_rules(tmp_path):
+    rules = [
+        {
+            "name": f"ticker-{i}",
+            "when": {"all_symbols": [f"MARKET:T{i}"], "max_entropy": {"ge": 0.1}},
+            "result": {"action": "buy", "market": f"T{i}", "confidence": 0.7},
+        }
+        for i in range(2000)
+    ]
+    rules.append(
+        {
+            "name": "override",
+            "priority": 5,
+            "when": {"any_symbols": ["MARKET:T7", "MARKET:T8"], "tags": ["collapse"]},
+            "result": {"action": "hedge", "market": "T7/T8"},
+        }
+    )
+    path = tmp_path / "pack.json"
+    pack = {"stages": {"forecast": {"default": {"action": "hold"}, "rules": rules}}}
+    path.write_text(json.dumps(pack))
+    table = load_rule_pack(path).table("forecast")
+    hot = [Glyph("MARKET:T1234", 0.2)]
+    assert table.evaluate(hot)[0]["market"] == "T1234"
+    assert table.evaluate([Glyph("MARKET:T1234", 0.05)])[0] == {"action": "hold"}
+    assert table.evaluate(GlyphBatch.from_glyphs(hot))[0]["market"] == "T1234"
+    collapse = [Glyph("MARKET:T7", 0.2, ["collapse"])]
+    assert table.match(collapse).name == "override"
+    assert table.match([Glyph("MARKET:T7", 0.2)]).name == "ticker-7"
+
+
+def test_scan_and_bitset_paths_agree_on_lists_and_batches(monkeypatch):
+    pack = {
+        "stages": {
+            "forecast": {
+                "default": {"a": 0},
+                "rules": [
+                    {"name": "neg", "when": {"max_entropy": {"lt": -0.1}}, "result": {"a": 1}},
+                    {"name": "zero", "when": {"max_entropy": {"ge": 0.0, "le": 0.0}},
+                     "result": {"a": 2}},
+                    {"name": "hi", "priority": 5,
+                     "when": {"max_entropy": {"gt": 0.3}, "any_symbols": ["X", "Y"]},
+                     "result": {"a": 3}},
+                    {"name": "tag", "when": {"tags": ["collapse"], "none_symbols": ["Z"]},
+                     "result": {"a": 4}},
+                    {"name": "buy", "when": {"forecast": {"action": "buy", "q": {"gt": 1}}},
+                     "result": {"a": 5}},
+                ],
+            }
+        }
+    }
+    scan = RulePack(pack).table("forecast")
+    monkeypatch.setattr(rules_mod, "_SCAN_RULES", 0)
+    bits = RulePack(pack).table("forecast")
+    assert scan._scan and not bits._scan
+    rng = random.Random(5)
+    for _ in range(500):
+        glyphs = [
+            Glyph(rng.choice("XYZA"), rng.choice([-0.5, -0.2, 0.0, 0.2, 0.4]),
+                  rng.choice([(), ("collapse",)]))
+            for _ in range(rng.randint(0, 3))
+        ]
+        forecast = rng.choice([None, {"action": "buy", "q": 2}, {"action": "buy", "q": "2"}])
+        batch = GlyphBatch.from_glyphs(glyphs)
+        names = {
+            getattr(t.match(g, forecast), "name", None)
+            for t in (scan, bits)
+            for g in (glyphs, batch)
+        }
+        assert len(names) == 1, (glyphs, forecast, names)
+    # all-negative entropies: the true maximum, not a 0.0 floor; no glyphs: 0.0
+    assert bits.match([Glyph("A", -0.5)]).name == scan.match([Glyph("A", -0.5)]).name == "neg"
+    assert bits.match([]).name == scan.match(GlyphBatch()).name == "zero"
+
+
+def test_bad_config_is_rejected():
+    with pytest.raises(ValueError):
+        RulePack({"stages": {"crystal": {}}})
+    bad_rule = {"name": "x", "when": {"foo": 1}, "result": {}}
+    with pytest.raises(ValueError):
+        RulePack({"stages": {"audit": {"default": {}, "rules": [bad_rule]}}})
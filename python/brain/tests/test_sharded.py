@@ -0,0 +1,29 @@
+import io
+import json
+
+from brain.sharded import ShardedEngineRunner, main, read_motif_jsonl
+from brain.unified_engine import UnifiedEngine
+
+TS = "2025-01-01T00:00:00Z"
+CORPUS = [["⥁", "⚛", "MARKET:SPY"], ["A", "NOT:A"], ["B"], ["⥁"], ["C", f"SEQ:{1}"]] * 3
+
+
+def test_pool_output_matches_single_process_in_order():
+    expected = UnifiedEngine().run_engine_batch(CORPUS, timestamp=TS)
+    pooled = ShardedEngineRunner(workers=2, chunk_size=4).run(CORPUS, timestamp=TS)
+    assert [c.capsule_id for c in pooled] == [c.capsule_id for c in expected]
+    assert pooled == expected
+
+
+def test_read_motif_jsonl_accepts_lists_and_objects():
+    src = io.StringIO('["A", "B"]\n\n{"motifs": ["NOT:A"]}\n')
+    assert list(read_motif_jsonl(src)) == [["A", "B"], ["NOT:A"]]
+
+
+def test_cli_writes_capsule_jsonl(tmp_path):
+    corpus = tmp_path / "corpus.jsonl"
+    corpus.write_text("\n".join(json.dumps(m) for m in CORPUS), encoding="utf-8")
+    out = tmp_path / "caps.jsonl"
+    assert main([str(corpus), "--out", str(out), "--workers", "1", "--timestamp", TS]) == 0
+    rows = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert [r["raw_inputs"]["motifs"] for r in rows] == CORPUS
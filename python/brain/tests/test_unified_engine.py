@@ -14,3 +14,30 @@ def test_contradiction_forks_paths():
     cap = engine.run_engine(["A", "NOT:A"])
     assert cap.proof_claim == "Contradiction"
     assert cap.fork_paths
+
+
+def test_batch_matches_single_call_path():
+    engine = UnifiedEngine()
+    engine._utc_now = lambda: "2025-01-01T00:00:00Z"
+    batch = [["⥁", "⚛", "MARKET:SPY"], ["A", "NOT:A"], ["⥁", " ", ""], []]
+    singles = [engine.run_engine(m) for m in batch]
+    assert engine.run_engine_batch(batch) == singles
+    assert engine.run_engine_batch(batch + batch) == singles + singles
+    assert list(engine.iter_engine_batch(iter(batch))) == singles
+
+
+def test_batch_shares_one_timestamp():
+    engine = UnifiedEngine()
+    caps = engine.run_engine_batch([["A"], ["B"]], timestamp="2025-01-01T00:00:00Z")
+    assert {c.timestamp for c in caps} == {"2025-01-01T00:00:00Z"}
+
+
+def test_fixpoint_feeds_crystal_motifs_back():
+    engine = UnifiedEngine()
+    engine._utc_now = lambda: "2025-01-01T00:00:00Z"
+    caps = engine.run_until_fixpoint(["⥁", "⚛", "A", "NOT:A"])
+    rounds = [c.raw_inputs["motifs"] for c in caps]
+    assert rounds == [["⥁", "⚛", "A", "NOT:A"], ["⥁", "⚛", "A", "NOT:A", "CRYSTAL:COLLAPSE☑"]]
+    assert caps == [engine.run_engine(m) for m in rounds]
+    assert len(engine.run_until_fixpoint(["⥁", "⚛"], max_rounds=1)) == 1
+    assert len(engine.run_until_fixpoint(["B"])) == 1
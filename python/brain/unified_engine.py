@@ -3,30 +3,34 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, asdict, field
-from typing import List, Dict, Tuple, Any
-import hashlib
+from dataclasses import dataclass, asdict, fields
+from typing import List, Dict, Set, Tuple, Any, Iterable, Iterator, Optional, Union
 import json
 import datetime as dt
 
+from . import capsule_codec
+from .cache import StageCache
+from .cdcl import CDCLSolver, solve_cnf
+from .forks import ForkExplorer
+from .glyphs import Glyph, GlyphBatch, symbols_of, tags_to_mask
+from .instrumentation import Instrumentation, StageLap
+from .literals import ClauseStore, SymbolTable, as_int_clauses
+from .rules import RulePack, default_rule_pack
+
+
+# Upper bound on per-motif encodings a translator remembers across runs.
+_MEMO_LIMIT = 4096
+# Upper bound on motif lists whose capsule_id a batch remembers.
+_BATCH_ID_LIMIT = 4096
+
 
 # ----------------------------
 # Core data structures
 # ----------------------------
 
-
-@dataclass(frozen=True)
-class Glyph:
-    symbol: str
-    entropy: float
-    narrative_tags: List[str] = field(default_factory=list)
-
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "symbol": self.symbol,
-            "entropy": self.entropy,
-            "narrative_tags": list(self.narrative_tags),
-        }
+# Glyph / GlyphBatch live in brain.glyphs (slotted, interned, tag bitmask).
+_PROOF_TAGS = tags_to_mask(["proof-out"])
+_WALL_TAGS = tags_to_mask(["proof-out", "np-wall-signal"])
 
 
 @dataclass(frozen=True)
@@ -42,78 +46,263 @@ class Capsule:
     def to_json(self) -> str:
         return json.dumps(asdict(self), ensure_ascii=False, indent=2)
 
+    def to_bytes(self) -> bytes:
+        # Canonical binary form (see brain.capsule_codec); lossless for capsules.
+        # Fields are JSON-like already, so skip asdict()'s deep copy.
+        return capsule_codec.dumps({f: getattr(self, f) for f in _CAPSULE_FIELDS})
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Capsule":
+        return cls(**capsule_codec.loads(data))
+
+
+_CAPSULE_FIELDS = tuple(f.name for f in fields(Capsule))
+
 
 # ----------------------------
 # Translator ⇌ Proof ⇌ Core
 # ----------------------------
 
 
+def _units_sat(lits: Set[int], symbols: SymbolTable) -> bool:
+    # Detect immediate contradiction: literal X and ¬X appear as unit
+    # clauses ("¬¬X" and "¬X" clash too; see SymbolTable.negate).
+    for lit in lits:
+        if -lit in lits:
+            return False  # UNSAT
+    if symbols.stacked:
+        negate = symbols.negate
+        for lit in lits:
+            if negate(lit) in lits:
+                return False
+    return True  # SAT (toy)
+
+
 class TranslatorCore:
     """
     Very small, deterministic stand-in for your TranslatorCoreBatchRunner.
     - Motifs → toy CNF clauses
-    - MiniSatBridge.solve → detects obvious contradiction A & ¬A
+    - MiniSatBridge.solve → backend "unit" detects obvious contradiction A & ¬A;
+      backend "cdcl" runs the full CDCL solver (brain.cdcl) on any CNF
     - Claim logic:
         * If contradiction → "Contradiction"
         * Else if NP-wall motif present (⥁ + ⚛) → "P≠NP"
         * Else → "OPEN"
     """
 
-    def motif_to_clauses(self, motifs: List[str]) -> List[List[str]]:
+    SOLVER_BACKENDS = ("unit", "cdcl")
+
+    def __init__(self, solver: str = "unit", max_symbols: int = 1 << 16) -> None:
+        if solver not in self.SOLVER_BACKENDS:
+            raise ValueError(
+                f"unknown solver backend {solver!r}; expected one of {self.SOLVER_BACKENDS}"
+            )
+        self.solver = solver
+        # Atoms are interned per translator, and each motif's encoding
+        # (literal, glyph) is memoized against the same table. The pair is
+        # shared across runs; the memo is cleared past _MEMO_LIMIT entries
+        # and both are replaced once the table outgrows `max_symbols` (runs
+        # in flight keep the pair they started with).
+        self.max_symbols = max_symbols
+        self._scope: Tuple[SymbolTable, Dict[str, Tuple[int, Optional[Glyph]]]] = (
+            SymbolTable(),
+            {},
+        )
+
+    @property
+    def symbols(self) -> SymbolTable:
+        return self._scope[0]
+
+    def scope(self) -> Tuple[SymbolTable, Dict[str, Tuple[int, Optional[Glyph]]]]:
+        """The current (symbol table, motif memo) pair, to hand to run_proof_store."""
+        return self._scope
+
+    def _motif_literal(self, m: str, symbols: SymbolTable) -> int:
         # Toy CNF encoder: each motif becomes a single-literal clause;
-        # special strings with "NOT:" become negated literals.
-        clauses: List[List[str]] = []
-        for m in motifs:
-            m = m.strip()
-            if not m:
-                continue
-            if m.startswith("NOT:"):
-                clauses.append([f"¬{m[4:]}"])
-            else:
-                clauses.append([m])
-        return clauses
-
-    def minisat_solve(self, cnf: List[List[str]]) -> bool:
-        # Detect immediate contradiction: literal X and ¬X appear as unit clauses.
-        lits = {c[0] for c in cnf if c}
-        for lit in list(lits):
-            if lit.startswith("¬") and lit[1:] in lits:
-                return False  # UNSAT
-            if f"¬{lit}" in lits:
-                return False
-        return True  # SAT (toy)
+        # special strings with "NOT:" become negated literals. 0 → no clause.
+        m = m.strip()
+        if not m:
+            return 0
+        if m.startswith("NOT:"):
+            return -symbols.var(m[4:])
+        return symbols.literal(m)
+
+    def motif_to_store(
+        self, motifs: List[str], symbols: Optional[SymbolTable] = None
+    ) -> ClauseStore:
+        symbols = symbols if symbols is not None else self.symbols
+        lits = [self._motif_literal(m, symbols) for m in motifs]
+        return ClauseStore.from_units([lit for lit in lits if lit])
 
-    def run_proof_batch(self, motifs: List[str]) -> Tuple[Dict[str, Any], List[Glyph]]:
-        cnf = self.motif_to_clauses(motifs)
-        sat = self.minisat_solve(cnf)
+    def motif_to_clauses(self, motifs: List[str]) -> List[List[str]]:
+        symbols = self.symbols
+        return self.motif_to_store(motifs, symbols).to_strings(symbols)
+
+    def minisat_solve(
+        self, cnf: Any, backend: Optional[str] = None, symbols: Optional[SymbolTable] = None
+    ) -> bool:
+        # `cnf` is a ClauseStore (built with `symbols`, default self.symbols)
+        # or clauses of text ("A" / "¬A") or DIMACS ints.
+        symbols = symbols if symbols is not None else self.symbols
+        if not isinstance(cnf, ClauseStore):
+            cnf = ClauseStore.from_clauses(as_int_clauses(cnf, symbols))
+        if (backend or self.solver) == "cdcl":
+            links = symbols.links(cnf.data)
+            return solve_cnf(list(cnf) + links if links else cnf)
+        return _units_sat(set(cnf.first_literals()), symbols)
+
+    def _encode_motif(self, m: str, symbols: SymbolTable) -> Tuple[int, Optional[Glyph]]:
+        # Per-motif work shared by run_proof_batch: the unit literal (0 if
+        # none) and the pass-through glyph (if any).
+        lit = self._motif_literal(m, symbols)
+        if not m:
+            return lit, None
+        sym = m.replace("NOT:", "¬")
+        if sym in ("⥁", "⚛"):
+            return lit, Glyph(sym, 0.12, tag_mask=_WALL_TAGS)
+        entropy = 0.05 if sym.startswith("¬") else 0.08
+        return lit, Glyph(sym, entropy, tag_mask=_PROOF_TAGS)
+
+    def run_proof_store(
+        self,
+        motifs: List[str],
+        memo: Optional[Dict[str, Tuple[int, Optional[Glyph]]]] = None,
+        symbols: Optional[SymbolTable] = None,
+    ) -> Tuple[bool, str, ClauseStore, List[Glyph]]:
+        """Integer-level proof batch: (sat, claim, clause store, glyphs)."""
+        # Without `symbols` the run uses the translator's scope(). `memo`
+        # holds encodings that belong to `symbols`; glyphs are frozen, so
+        # sharing them between results is safe.
+        if symbols is None:
+            symbols, shared = self._scope
+            memo = shared if memo is None else memo
+        units: List[int] = []
+        glyphs: List[Glyph] = []
+        fresh = False
+        for m in motifs:
+            enc = memo.get(m) if memo is not None else None
+            if enc is None:
+                enc = self._encode_motif(m, symbols)
+                if memo is not None:
+                    memo[m] = enc
+                    fresh = True
+            lit, glyph = enc
+            if lit:
+                units.append(lit)
+            if glyph is not None:
+                glyphs.append(glyph)
+        if fresh:
+            self._bound_scope(symbols)
+        store = ClauseStore.from_units(units)
+        if self.solver == "unit":
+            sat = _units_sat(set(units), symbols)
+        else:
+            sat = self.minisat_solve(store, symbols=symbols)
 
         # Determine claim
         flat = " ".join(motifs)
         has_np_wall = ("⥁" in flat) and ("⚛" in flat)
         claim = "Contradiction" if not sat else ("P≠NP" if has_np_wall else "OPEN")
-
-        # Emit glyphs: pass through motifs as glyphs with simple entropy
-        glyphs: List[Glyph] = []
-        for m in motifs:
-            if not m:
-                continue
-            sym = m.replace("NOT:", "¬")
-            entropy = (
-                0.12 if sym in ("⥁", "⚛") else (0.05 if sym.startswith("¬") else 0.08)
-            )
-            tags = ["proof-out"]
-            if sym in ("⥁", "⚛"):
-                tags.append("np-wall-signal")
-            glyphs.append(Glyph(symbol=sym, entropy=entropy, narrative_tags=tags))
-
+        return sat, claim, store, glyphs
+
+    def _bound_scope(self, symbols: SymbolTable) -> None:
+        # Only checked after new motifs were encoded into the translator's
+        # table; the next run gets a fresh pair, this one finishes on its own.
+        table, memo = self._scope
+        if table is symbols:
+            if len(table) > self.max_symbols:
+                self._scope = (SymbolTable(), {})
+            elif len(memo) > _MEMO_LIMIT:
+                memo.clear()  # entries stay valid; only their number is bounded
+
+    def run_proof_batch(
+        self,
+        motifs: List[str],
+        memo: Optional[Dict[str, Tuple[int, Optional[Glyph]]]] = None,
+    ) -> Tuple[Dict[str, Any], List[Glyph]]:
+        symbols, shared = self._scope
+        sat, claim, store, glyphs = self.run_proof_store(
+            motifs, shared if memo is None else memo, symbols
+        )
         results = {
             "sat": sat,
             "claim": claim,
-            "clauses": cnf,
+            "clauses": store.to_strings(symbols),
         }
         return results, glyphs
 
 
+class ProofSession:
+    """
+    Incremental translator state for closed-loop runs.
+    - motifs are encoded once; later rounds only add the new unit clauses
+    - each round's clauses are guarded by an activation literal and the
+      formula is re-solved under the activations of every round so far, so
+      one CDCLSolver (and its learnt clauses) lives for the whole session
+    - motif sets only grow, so once UNSAT the session stays UNSAT
+    """
+
+    def __init__(self, translator: TranslatorCore) -> None:
+        self.translator = translator
+        self.symbols = translator.symbols
+        self.solver = CDCLSolver()
+        self.store = ClauseStore()
+        self.glyphs: List[Glyph] = []
+        self.sat = True
+        self._memo: Dict[str, Tuple[int, Optional[Glyph]]] = {}
+        self._svars: Dict[int, int] = {}  # translator var → solver var
+        self._next_var = 1
+        self._assumptions: List[int] = []
+        self._lits: set = set()
+        self._wall: set = set()  # NP-wall symbols seen so far
+
+    def _fresh_var(self) -> int:
+        v = self._next_var
+        self._next_var += 1
+        return v
+
+    def _solver_lit(self, lit: int) -> int:
+        v = self._svars.get(abs(lit))
+        if v is None:
+            v = self._svars[abs(lit)] = self._fresh_var()
+        return v if lit > 0 else -v
+
+    def extend(self, motifs: Iterable[str]) -> Tuple[bool, str]:
+        """Add `motifs` to the session; returns (sat, claim) for everything so far."""
+        memo = self._memo
+        encode = self.translator._encode_motif
+        symbols = self.symbols
+        new_lits: List[int] = []
+        for m in motifs:
+            enc = memo.get(m)
+            if enc is None:
+                enc = memo[m] = encode(m, symbols)
+            lit, glyph = enc
+            if lit:
+                self.store.append_unit(lit)
+                if lit not in self._lits:
+                    self._lits.add(lit)
+                    new_lits.append(lit)
+            if glyph is not None:
+                self.glyphs.append(glyph)
+            for sym in ("⥁", "⚛"):
+                if sym in m:
+                    self._wall.add(sym)
+        if new_lits and self.sat:
+            act = self._fresh_var()
+            for lit in new_lits:
+                self.solver.add_clause([self._solver_lit(lit), -act])
+            for a, b in symbols.links(new_lits):
+                self.solver.add_clause([self._solver_lit(a), self._solver_lit(b)])
+            self._assumptions.append(act)
+            self.sat = self.solver.solve(assumptions=self._assumptions) is True
+        if not self.sat:
+            claim = "Contradiction"
+        else:
+            claim = "P≠NP" if len(self._wall) == 2 else "OPEN"
+        return self.sat, claim
+
+
 # ----------------------------
 # GLYPH ⇌ TRADER ⇌ ENGINE
 # ----------------------------
@@ -125,41 +314,27 @@ class TraderEngine:
     Rule: if {⥁, ⚛} detected in inputs → predict collapse with high confidence,
           else neutral drift.
     Produces a new "☑" collapse glyph when a collapse signal is seen.
+    Forecasts come from the "forecast" table of `rules` (brain.rules); the
+    rule above is the default pack.
     """
 
     COLLAPSE_GLYPH = "☑"
+    NP_WALL = frozenset({"⥁", "⚛"})
+
+    def __init__(self, rules: Optional[RulePack] = None) -> None:
+        self.rules = rules if rules is not None else default_rule_pack()
+        self._table = self.rules.table("forecast")
 
     def forecast_and_act(
-        self, input_glyphs: List[Glyph]
+        self, input_glyphs: Union[List[Glyph], GlyphBatch]
     ) -> Tuple[Dict[str, Any], List[Glyph]]:
-        syms = {g.symbol for g in input_glyphs}
-        if {"⥁", "⚛"} <= syms:
-            forecast = {
-                "action": "hedge",
-                "market": "SPY",
-                "confidence": 0.93,
-                "thesis": "entropy-collapse",
-            }
-            new = [
-                Glyph(
-                    symbol=self.COLLAPSE_GLYPH,
-                    entropy=0.15,
-                    narrative_tags=["collapse", "hedge-signal"],
-                )
-            ]
-        else:
-            forecast = {
-                "action": "hold",
-                "market": "SPY",
-                "confidence": 0.55,
-                "thesis": "neutral",
-            }
-            new = []
-        return forecast, new
-
-    def export_crystal_patterns(self, high_gain_glyphs: List[Glyph]) -> List[str]:
+        return self._table.evaluate(input_glyphs)
+
+    def export_crystal_patterns(
+        self, high_gain_glyphs: Union[List[Glyph], GlyphBatch]
+    ) -> List[str]:
         # If collapse glyph present, emit a motif that feeds back to the translator
-        if any(g.symbol == self.COLLAPSE_GLYPH for g in high_gain_glyphs):
+        if self.COLLAPSE_GLYPH in symbols_of(high_gain_glyphs):
             return ["CRYSTAL:COLLAPSE☑"]
         return []
 
@@ -173,22 +348,17 @@ class GlyphMutator:
     """
     EthicalBound validator (simplified).
     Warns on high-confidence 'buy' with no entropic confirmation (⥁ missing).
+    Verdicts come from the "audit" table of `rules` (brain.rules).
     """
 
+    def __init__(self, rules: Optional[RulePack] = None) -> None:
+        self.rules = rules if rules is not None else default_rule_pack()
+        self._table = self.rules.table("audit")
+
     def audit_narrative(
-        self, forecast: Dict[str, Any], initial_glyphs: List[Glyph]
+        self, forecast: Dict[str, Any], initial_glyphs: Union[List[Glyph], GlyphBatch]
     ) -> Dict[str, Any]:
-        syms = {g.symbol for g in initial_glyphs}
-        if (
-            forecast.get("action") == "buy"
-            and forecast.get("confidence", 0) > 0.9
-            and "⥁" not in syms
-        ):
-            return {
-                "status": "Warning",
-                "reason": "High-confidence buy without entropic (⥁) confirmation",
-            }
-        return {"status": "Harmonic", "reason": "Audit passed"}
+        return self._table.evaluate(initial_glyphs, forecast)[0]
 
 
 # ----------------------------
@@ -199,28 +369,37 @@ class GlyphMutator:
 class ParadoxForker:
     """
     When a contradiction appears, fork new clause paths (creative exploration).
+    Without an `explorer` it emits the two deterministic forks (flip the
+    first literal / add a STABILIZE constraint); with a brain.forks
+    ForkExplorer it returns that search's ranked repair branches instead.
     """
 
+    def __init__(self, explorer: Optional[ForkExplorer] = None) -> None:
+        self.explorer = explorer
+
     def detect_and_fork(
-        self, proof_claim: str, input_clauses: List[List[str]]
+        self,
+        proof_claim: str,
+        input_clauses: Any,
+        symbols: Optional[SymbolTable] = None,
     ) -> List[Dict[str, Any]]:
+        # `input_clauses` is a ClauseStore (with its `symbols`) or text clauses.
         if proof_claim != "Contradiction":
             return []
+        if not isinstance(input_clauses, ClauseStore):
+            symbols = SymbolTable()
+            input_clauses = ClauseStore.from_text(input_clauses, symbols)
+        elif symbols is None:
+            raise ValueError("a ClauseStore needs the SymbolTable it was built with")
+        if self.explorer is not None:
+            return self.explorer.explore(input_clauses, symbols)
         forks: List[Dict[str, Any]] = []
         # Create two deterministic forks: flip first literal, and add constraint
-        base = [c[:] for c in input_clauses]
+        base = input_clauses.to_strings(symbols)
         if base:
-            first = base[0][0]
-            flipped = f"¬{first}" if not first.startswith("¬") else first[1:]
-            fork1 = [
-                {
-                    "clauses": [[flipped] if i == 0 else c for i, c in enumerate(base)],
-                    "HarmonicViable": True,
-                }
-            ]
-            forks.extend(fork1)
-        fork2 = [{"clauses": base + [["STABILIZE"]], "HarmonicViable": False}]
-        forks.extend(fork2)
+            flipped = symbols.text(-input_clauses.data[0])
+            forks.append({"clauses": [[flipped]] + base[1:], "HarmonicViable": True})
+        forks.append({"clauses": base + [["STABILIZE"]], "HarmonicViable": False})
         return forks
 
 
@@ -230,11 +409,36 @@ class ParadoxForker:
 
 
 class UnifiedEngine:
-    def __init__(self) -> None:
-        self.translator = TranslatorCore()
-        self.trader = TraderEngine()
-        self.mutator = GlyphMutator()
-        self.forker = ParadoxForker()
+    """
+    Orchestrates translator → fork → forecast → audit → crystal export and
+    assembles the capsule.
+    Optional `cache` (brain.cache.StageCache) memoizes stages 1-5, which do
+    not depend on the timestamp; a hit only re-assembles timestamp and
+    capsule_id (sha256 of the sorted-key JSON payload, streamed in pieces;
+    see brain.capsule_codec). Entries are keyed by the exact motif
+    sequence (clause order and fork paths follow motif order). Cached stage
+    dicts are shared by every capsule built from them, so treat capsule
+    contents as read-only. `fork_explorer` (brain.forks.ForkExplorer)
+    replaces the two fixed forks with a bounded repair search.
+    `instrument` (brain.instrumentation.Instrumentation) times the six
+    stages and feeds its hooks; without it no clock is read. `rules`
+    (brain.rules.RulePack) drives the forecast and audit stages.
+    """
+
+    def __init__(
+        self,
+        solver: str = "unit",
+        cache: Optional[StageCache] = None,
+        fork_explorer: Optional[ForkExplorer] = None,
+        instrument: Optional[Instrumentation] = None,
+        rules: Optional[RulePack] = None,
+    ) -> None:
+        self.translator = TranslatorCore(solver=solver)
+        self.trader = TraderEngine(rules)
+        self.mutator = GlyphMutator(rules)
+        self.forker = ParadoxForker(fork_explorer)
+        self.cache = cache
+        self.instrument = instrument
 
     def _utc_now(self) -> str:
         return (
@@ -243,47 +447,119 @@ class UnifiedEngine:
             .replace("+00:00", "Z")
         )
 
-    def _capsule_id(self, payload: Dict[str, Any]) -> str:
-        blob = json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")
-        return hashlib.sha256(blob).hexdigest()
-
-    def run_engine(self, motifs: List[str]) -> Capsule:
-        # 1) Translator core
-        proof_results, initial_glyphs = self.translator.run_proof_batch(motifs)
+    def _capsule_id(self, payload: Dict[str, Any], stream: Optional[bool] = None) -> str:
+        return capsule_codec.capsule_id(payload, stream)
+
+    def _run_stages(self, motifs: List[str]) -> Dict[str, Any]:
+        cache = self.cache
+        if cache is None:
+            return self._compute_stages(motifs)
+        key = tuple(motifs)
+        stages = cache.get(key)
+        if stages is None:
+            stages = self._compute_stages(motifs)
+            cache.put(key, stages)
+        return stages
+
+    def _compute_stages(self, motifs: List[str]) -> Dict[str, Any]:
+        # 1) Translator core (ints internally; strings only for the capsule).
+        # The translator's memo spans runs, so repeated motifs encode once.
+        translator = self.translator
+        symbols, memo = translator.scope()
+        ins = self.instrument
+        lap = ins.lap() if ins is not None else None
+        sat, claim, store, initial_glyphs = translator.run_proof_store(motifs, memo, symbols)
+        if lap is not None:
+            lap.stop("translator", {"clauses": len(store), "glyphs": len(initial_glyphs)})
+        return self._downstream_stages(sat, claim, store, initial_glyphs, symbols, lap)
+
+    def _downstream_stages(
+        self,
+        sat: bool,
+        claim: str,
+        store: ClauseStore,
+        initial_glyphs: List[Glyph],
+        symbols: SymbolTable,
+        lap: Optional[StageLap] = None,
+    ) -> Dict[str, Any]:
+        # Stages 2-5; `lap` (instrumented engines only) records each one.
+        proof_results = {
+            "sat": sat,
+            "claim": claim,
+            "clauses": store.to_strings(symbols),
+        }
+        if lap is not None:
+            lap.restart()  # clause rendering belongs to no stage
 
         # 2) Fork on contradiction
-        forks = self.forker.detect_and_fork(
-            proof_results["claim"], proof_results["clauses"]
-        )
+        forks = self.forker.detect_and_fork(claim, store, symbols)
+        if lap is not None:
+            lap.stop("fork", {"clauses": len(store), "forks": len(forks)})
 
         # 3) Forecast & act
         forecast, new_glyphs = self.trader.forecast_and_act(initial_glyphs)
+        if lap is not None:
+            lap.stop("forecast", {"glyphs": len(initial_glyphs), "new_glyphs": len(new_glyphs)})
 
         # 4) Ethical audit
         audit = self.mutator.audit_narrative(forecast, initial_glyphs)
+        if lap is not None:
+            lap.stop("audit", {"glyphs": len(initial_glyphs)})
 
         # 5) Export crystal patterns (feedback)
         feedback_motifs = self.trader.export_crystal_patterns(new_glyphs)
-        if feedback_motifs:
-            # (For now, we only surface the opportunity; you can loop this externally.)
-            print(f"[feedback] New motifs available for refinement: {feedback_motifs}")
+        if lap is not None:
+            lap.stop("crystal", {"glyphs": len(new_glyphs), "motifs": len(feedback_motifs)})
 
-        # 6) Assemble capsule
-        raw_inputs = {
-            "motifs": motifs,
+        return {
             "proof_results": proof_results,
+            "forks": forks,
             "forecast": forecast,
+            "audit": audit,
             "feedback_motifs": feedback_motifs,
         }
+
+    def _assemble(
+        self,
+        motifs: List[str],
+        stages: Dict[str, Any],
+        timestamp: str,
+        cid: Optional[str] = None,
+    ) -> Capsule:
+        ins = self.instrument
+        if ins is None:
+            return self._build_capsule(motifs, stages, timestamp, cid)
+        lap = ins.lap()
+        cap = self._build_capsule(motifs, stages, timestamp, cid)
+        lap.stop("capsule", {"motifs": len(motifs)})
+        return cap
+
+    def _build_capsule(
+        self,
+        motifs: List[str],
+        stages: Dict[str, Any],
+        timestamp: str,
+        cid: Optional[str] = None,
+    ) -> Capsule:
+        # 6) Assemble capsule (`cid`: the id, when the caller already knows it)
+        proof_results = stages["proof_results"]
+        raw_inputs = {
+            "motifs": motifs,
+            "proof_results": proof_results,
+            "forecast": stages["forecast"],
+            "feedback_motifs": stages["feedback_motifs"],
+        }
         capsule_payload = {
-            "timestamp": self._utc_now(),
+            "timestamp": timestamp,
             "proof_claim": proof_results["claim"],
-            "financial_forecast": forecast,
-            "ethical_audit": audit,
-            "fork_paths": forks,
+            "financial_forecast": stages["forecast"],
+            "ethical_audit": stages["audit"],
+            "fork_paths": stages["forks"],
             "raw_inputs": raw_inputs,
         }
-        cid = self._capsule_id(capsule_payload)
+        if cid is None:
+            # Clause lists and fork paths grow with the motif count.
+            cid = self._capsule_id(capsule_payload, len(motifs) > capsule_codec.STREAM_ITEMS)
 
         return Capsule(
             capsule_id=cid,
@@ -295,6 +571,93 @@ class UnifiedEngine:
             raw_inputs=capsule_payload["raw_inputs"],
         )
 
+    def run_engine(self, motifs: List[str]) -> Capsule:
+        stages = self._run_stages(motifs)
+        feedback_motifs = stages["feedback_motifs"]
+        if feedback_motifs:
+            # (For now, we only surface the opportunity; you can loop this externally.)
+            print(f"[feedback] New motifs available for refinement: {feedback_motifs}")
+        return self._assemble(motifs, stages, self._utc_now())
+
+    def iter_engine_batch(
+        self, motif_lists: Iterable[List[str]], timestamp: Optional[str] = None
+    ) -> Iterator[Capsule]:
+        """
+        Lazily run the engine over many motif lists.
+        Every capsule shares one timestamp (taken once when iteration starts,
+        unless ``timestamp`` is given), so each capsule is identical to what
+        ``run_engine`` would return at that instant. Feedback is summarized
+        in a single line once the batch is exhausted instead of per item.
+        With the timestamp fixed, a capsule_id depends only on the motif
+        list, so a repeated list is hashed once per batch.
+        """
+        ts = timestamp if timestamp is not None else self._utc_now()
+        # Without a cache or instrumentation the per-item dispatch is dead
+        # weight: bind the bare stage and capsule functions once.
+        run_stages = self._run_stages if self.cache is not None else self._compute_stages
+        assemble = self._assemble if self.instrument is not None else self._build_capsule
+        ids: Dict[Tuple[str, ...], str] = {}
+        with_feedback = 0
+        for motifs in motif_lists:
+            stages = run_stages(motifs)
+            if stages["feedback_motifs"]:
+                with_feedback += 1
+            key = tuple(motifs)
+            cid = ids.get(key)
+            cap = assemble(motifs, stages, ts, cid)
+            if cid is None:
+                if len(ids) >= _BATCH_ID_LIMIT:
+                    ids.clear()
+                ids[key] = cap.capsule_id
+            yield cap
+        if with_feedback:
+            print(f"[feedback] {with_feedback} capsule(s) surfaced motifs for refinement")
+
+    def run_engine_batch(
+        self, motif_lists: Iterable[List[str]], timestamp: Optional[str] = None
+    ) -> List[Capsule]:
+        """Eager variant of :meth:`iter_engine_batch`."""
+        return list(self.iter_engine_batch(motif_lists, timestamp))
+
+    def run_until_fixpoint(
+        self, motifs: List[str], max_rounds: int = 8, timestamp: Optional[str] = None
+    ) -> List[Capsule]:
+        """
+        Feed crystal motifs back into the translator until no new motif
+        appears (or `max_rounds` capsules have been produced).
+        Round k runs on the round k-1 motifs plus the new feedback motifs,
+        re-solved incrementally through one ProofSession. Returns the
+        per-round capsules, all sharing one timestamp; with the unit solver
+        each equals ``run_engine`` on that round's motif list.
+        """
+        if max_rounds < 1:
+            raise ValueError("max_rounds must be >= 1")
+        ts = timestamp if timestamp is not None else self._utc_now()
+        session = ProofSession(self.translator)
+        current = list(motifs)
+        delta = current
+        capsules: List[Capsule] = []
+        converged = False
+        while len(capsules) < max_rounds:
+            lap = self.instrument.lap() if self.instrument is not None else None
+            sat, claim = session.extend(delta)
+            if lap is not None:
+                counts = {"clauses": len(session.store), "glyphs": len(session.glyphs)}
+                lap.stop("translator", counts)
+            stages = self._downstream_stages(
+                sat, claim, session.store, session.glyphs, session.symbols, lap
+            )
+            capsules.append(self._assemble(current, stages, ts))
+            seen = set(current)
+            delta = [m for m in dict.fromkeys(stages["feedback_motifs"]) if m not in seen]
+            if not delta:
+                converged = True
+                break
+            current = current + delta
+        state = "fixpoint" if converged else "max_rounds"
+        print(f"[feedback] {state} after {len(capsules)} round(s)")
+        return capsules
+
 
 # ----------------------------
 # Quick demo (can be removed in CI)
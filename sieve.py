@@ -18,9 +18,24 @@
 
 # %%
 from __future__ import annotations
-import os, sys, time, math, csv, json, random
+import argparse, os, sys, time, math, json, random
 from typing import Tuple
 
+from brain.sieve import kernel
+from brain.sieve.kernel import DTYPES, SieveParams, auto_batch, batch_maxima, batch_rng
+from brain.sieve.output import OUTPUT_MODES, default_output_path, open_writer
+from brain.sieve.checkpoint import (
+    clear_checkpoint,
+    config_mismatch,
+    default_checkpoint_path,
+    load_checkpoint,
+    save_checkpoint,
+)
+from brain.sieve.parallel import iter_batches
+from brain.sieve.sketch import SieveSketch
+from brain.sieve.stopping import EarlyStop
+from brain.sieve.sweep import parse_grid
+
 # Prefer GPU via CuPy; fall back to NumPy
 backend = "cpu"
 try:
@@ -43,42 +58,64 @@ TRACE_LEN = int(os.getenv("TRACE_LEN", "48"))
 SEED = int(os.getenv("SEED", "42"))
 CSV_PATH = os.getenv("CSV_PATH", "data/entropy_sieve_ci.csv")
 META_PATH = os.getenv("META_PATH", "data/entropy_sieve_ci.json")
-BATCH = int(os.getenv("BATCH", "100000"))
+# Per-trace output layout: csv (default), npy (memmapped columns), npz (compressed),
+# or summary (no per-trace output; the meta sketch alone describes the run)
+SIEVE_FORMAT = os.getenv("SIEVE_FORMAT", "csv")
+OUTPUT_PATH = os.getenv("OUTPUT_PATH") or default_output_path(CSV_PATH, SIEVE_FORMAT)
 
 SPIKE_PROB = float(os.getenv("SPIKE_PROB", "0.035"))
 NOISE_SIGMA = float(os.getenv("NOISE_SIGMA", "0.02"))
+# Kernel: fused (streams column chunks, O(BATCH) memory) or dense (full matrix)
+SIEVE_KERNEL = os.getenv("SIEVE_KERNEL", "fused")
+SIEVE_DTYPE = os.getenv("SIEVE_DTYPE", "float64")  # or float32
+SIEVE_CHUNK = int(os.getenv("SIEVE_CHUNK", str(kernel.DEFAULT_CHUNK)))
+PARAMS = SieveParams(
+    np_threshold=NP_THRESHOLD,
+    spike_prob=SPIKE_PROB,
+    noise_sigma=NOISE_SIGMA,
+    dtype=SIEVE_DTYPE,
+    fused=SIEVE_KERNEL != "dense",
+    chunk=SIEVE_CHUNK,
+)
+# Traces per batch: BATCH if set, else sized so one batch fits SIEVE_MEM_MB
+# (per process).  Output depends on SEED and the batch size, never on workers.
+SIEVE_MEM_MB = float(os.getenv("SIEVE_MEM_MB", "256"))
+BATCH = int(os.getenv("BATCH") or auto_batch(int(SIEVE_MEM_MB * 2**20), TRACE_LEN, PARAMS))
+# Distribution sketch written into the meta: histogram range/bins, KLL size, and extra
+# thresholds (beyond P/NP) with exact hit counts
+SKETCH_RANGE = tuple(float(x) for x in os.getenv("SKETCH_RANGE", "0,0.5").split(","))
+SKETCH_BINS = int(os.getenv("SKETCH_BINS", "200"))
+SKETCH_K = int(os.getenv("SKETCH_K", "200"))
+SKETCH_THRESHOLDS = [float(x) for x in os.getenv("SKETCH_THRESHOLDS", "").split(",") if x]
+# Threshold sweep evaluated on the same traces: "lo:hi:n" or "t1,t2,..." (meta "sweep")
+SWEEP = parse_grid(os.getenv("SWEEP", ""))
+# Adaptive early stopping: stop at the first batch whose NP-hit-rate interval half-width is
+# <= STOP_HALF_WIDTH percentage points (N_TRACES becomes a cap); unset or 0 = off
+STOP_HALF_WIDTH = float(os.getenv("STOP_HALF_WIDTH") or 0)
+STOP_METHOD = os.getenv("STOP_METHOD", "wilson")  # or clopper-pearson
+STOP_CONFIDENCE = float(os.getenv("STOP_CONFIDENCE", "0.95"))
+STOP_MIN_TRACES = int(os.getenv("STOP_MIN_TRACES", "0"))
+# CPU worker processes (0 = one per core); output is identical for any count
+WORKERS = int(os.getenv("SIEVE_WORKERS", "1")) or (os.cpu_count() or 1)
+# Atomic (fsynced) checkpoint every N batches to CHECKPOINT_PATH ($META_PATH.ckpt); unset or
+# 0 = off. `python sieve.py --resume` continues from it; a finished run removes it
+CHECKPOINT_EVERY = int(os.getenv("CHECKPOINT_EVERY") or 0)
+CHECKPOINT_PATH = os.getenv("CHECKPOINT_PATH") or default_checkpoint_path(META_PATH)
 
 
-def rng_rand(shape, seed=None):
-    if backend == "cuda":
-        rs = xp.random.RandomState(SEED if seed is None else seed)
-        return rs.rand(*shape)
-    else:
-        rs = xp.random.default_rng(SEED if seed is None else seed)
-        return rs.random(shape)
+def rng_rand(shape, rng):
+    return kernel.rng_rand(rng, shape)
 
 
-def rng_normal(shape, sigma, seed=None):
-    if backend == "cuda":
-        rs = xp.random.RandomState(SEED if seed is None else seed)
-        return rs.normal(loc=0.0, scale=sigma, size=shape)
-    else:
-        rs = xp.random.default_rng(SEED if seed is None else seed)
-        return rs.normal(loc=0.0, scale=sigma, size=shape)
+def rng_normal(shape, sigma, rng):
+    return kernel.rng_normal(rng, shape, sigma)
 
 
-def gen_traces(n: int, length: int) -> xp.ndarray:
-    base = 0.03 + 0.03 * rng_rand((n, 1))  # [0.03, 0.06)
-    noise = rng_normal((n, length), NOISE_SIGMA)
-    traces = xp.clip(base + noise.cumsum(axis=1) / length, 0, None)
-
-    # Inject spike near last third
-    spikes = (rng_rand((n, 1)) < SPIKE_PROB).astype(traces.dtype)
-    spike_height = NP_THRESHOLD + 0.02 + 0.05 * rng_rand((n, 1))
-    idx = xp.full((n,), int(0.66 * length))
-    rows = xp.arange(n, dtype=xp.int32) if backend == "cuda" else xp.arange(n)
-    traces[rows, idx] += spikes[:, 0] * spike_height[:, 0]
-    return traces
+def gen_traces(n: int, length: int, rng=None) -> xp.ndarray:
+    # One persistent generator per batch; the default is batch 0's stream.
+    if rng is None:
+        rng = batch_rng(xp, SEED, 0)
+    return kernel.gen_traces(xp, rng, n, length, PARAMS)
 
 
 def ensure_dir(path: str):
@@ -87,50 +124,130 @@ def ensure_dir(path: str):
         os.makedirs(d, exist_ok=True)
 
 
-def main():
+def run_config() -> dict:
+    """Settings that determine the output; a checkpoint only resumes a run with the same."""
+    return {
+        "backend": backend,
+        "n_traces": N_TRACES,
+        "trace_len": TRACE_LEN,
+        "seed": SEED,
+        "batch": BATCH,
+        "params": [NP_THRESHOLD, SPIKE_PROB, NOISE_SIGMA, SIEVE_KERNEL, SIEVE_DTYPE, SIEVE_CHUNK],
+        "output_format": SIEVE_FORMAT,
+        "output_path": OUTPUT_PATH,
+        "sketch": [list(SKETCH_RANGE), SKETCH_BINS, SKETCH_K, SKETCH_THRESHOLDS, P_THRESHOLD],
+        "sweep": SWEEP,
+        "stop": [STOP_HALF_WIDTH, STOP_METHOD, STOP_CONFIDENCE, STOP_MIN_TRACES],
+    }
+
+
+def serial_batches(first_batch: int, sketch: SieveSketch):
+    """In-process counterpart of ``iter_batches`` (CPU with one worker, or CUDA)."""
+    for b in range(first_batch, math.ceil(N_TRACES / BATCH)):
+        start = b * BATCH
+        size = min(BATCH, N_TRACES - start)
+        maxvals = batch_maxima(xp, SEED, b, size, TRACE_LEN, PARAMS)
+        np_hits = maxvals > NP_THRESHOLD
+
+        if backend == "cuda":
+            maxvals_np = xp.asnumpy(maxvals)
+            np_hits_np = xp.asnumpy(np_hits.astype(xp.int32))
+            del maxvals, np_hits
+            xp.get_default_memory_pool().free_all_blocks()
+        else:
+            maxvals_np = maxvals
+            np_hits_np = np_hits.astype(int)
+
+        batch_sketch = sketch.empty()
+        batch_sketch.update(maxvals_np)
+        yield start, maxvals_np, np_hits_np, int(np_hits_np.sum()), batch_sketch
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Day-2 entropy sieve (configured via env)")
+    ap.add_argument(
+        "--resume", action="store_true", help=f"continue from the checkpoint ({CHECKPOINT_PATH})"
+    )
+    args = ap.parse_args(argv)
+    if SIEVE_FORMAT not in OUTPUT_MODES:
+        print(f"[sieve] unknown SIEVE_FORMAT={SIEVE_FORMAT!r}; expected one of {OUTPUT_MODES}")
+        return 2
+    if SIEVE_DTYPE not in DTYPES or SIEVE_KERNEL not in ("fused", "dense"):
+        print(f"[sieve] SIEVE_DTYPE must be one of {DTYPES}, SIEVE_KERNEL fused or dense")
+        return 2
     t0 = time.time()
     random.seed(SEED)
-    ensure_dir(CSV_PATH)
+    ensure_dir(OUTPUT_PATH)
     ensure_dir(META_PATH)
 
-    total = 0
-    total_np = 0
-    batches = math.ceil(N_TRACES / BATCH)
+    stopper = None
+    if STOP_HALF_WIDTH > 0:
+        try:
+            stopper = EarlyStop(
+                STOP_HALF_WIDTH / 100.0, STOP_METHOD, STOP_CONFIDENCE, STOP_MIN_TRACES
+            )
+        except ValueError as exc:
+            print(f"[sieve] {exc}")
+            return 2
 
-    with open(CSV_PATH, "w", newline="") as fcsv:
-        w = csv.writer(fcsv)
-        w.writerow(["trace_id", "max_delta_phi", "np_hit", "length", "backend"])
-
-        for _ in range(batches):
-            size = min(BATCH, N_TRACES - total)
-            traces = gen_traces(size, TRACE_LEN)
-            maxvals = traces.max(axis=1)
-            np_hits = maxvals > NP_THRESHOLD
-
-            if backend == "cuda":
-                maxvals_np = xp.asnumpy(maxvals)
-                np_hits_np = xp.asnumpy(np_hits.astype(xp.int32))
-            else:
-                maxvals_np = maxvals
-                np_hits_np = np_hits.astype(int)
-
-            for i in range(size):
-                w.writerow(
-                    [
-                        total + i,
-                        float(maxvals_np[i]),
-                        int(np_hits_np[i]),
-                        TRACE_LEN,
-                        backend,
-                    ]
-                )
+    config = run_config()
+    state = load_checkpoint(CHECKPOINT_PATH) if args.resume else None
+    if state is not None and state["config"] != config:
+        for key, (was, now) in config_mismatch(state["config"], config).items():
+            print(f"[sieve] cannot resume: {key} was {was!r}, now {now!r}")
+        return 2
+    if args.resume:
+        where = f"batch {state['next_batch']}" if state else "scratch (no checkpoint)"
+        print(f"[sieve] resuming from {where}")
 
-            total += size
-            total_np += int(np_hits_np.sum())
+    batches = math.ceil(N_TRACES / BATCH)
+    first = state["next_batch"] if state else 0
+    total = state["total"] if state else 0
+    total_np = state["np_hits"] if state else 0
+    elapsed_before = state["elapsed_sec"] if state else 0.0
+    if state:
+        sketch = SieveSketch.from_dict(state["sketch"])
+    else:
+        sketch = SieveSketch(
+            *SKETCH_RANGE,
+            SKETCH_BINS,
+            SKETCH_K,
+            [P_THRESHOLD, NP_THRESHOLD, *SKETCH_THRESHOLDS],
+            sweep=SWEEP,
+        )
 
-            if backend == "cuda":
-                del traces, maxvals, np_hits
-                xp.get_default_memory_pool().free_all_blocks()
+    workers = WORKERS if backend == "cpu" else 1
+    resume = state["writer"] if state else None
+    with open_writer(SIEVE_FORMAT, OUTPUT_PATH, N_TRACES, TRACE_LEN, backend, resume) as writer:
+        if workers > 1:
+            stream = iter_batches(
+                N_TRACES, BATCH, TRACE_LEN, SEED, PARAMS, workers, sketch=sketch, first_batch=first
+            )
+        else:
+            stream = serial_batches(first, sketch)
+        for b, (start, maxvals, np_hits, hits, batch_sketch) in enumerate(stream, first):
+            writer.write(start, maxvals, np_hits)
+            sketch.merge(batch_sketch)
+            total += len(maxvals)
+            total_np += hits
+            if stopper is not None and stopper.check(total_np, total, b):
+                break
+
+            if CHECKPOINT_EVERY and (b + 1) % CHECKPOINT_EVERY == 0 and b + 1 < batches:
+                save_checkpoint(
+                    CHECKPOINT_PATH,
+                    {
+                        "config": config,
+                        "next_batch": b + 1,
+                        "total": total,
+                        "np_hits": total_np,
+                        "elapsed_sec": elapsed_before + time.time() - t0,
+                        "rng": {"seed": SEED, "next_spawn_key": [b + 1]},
+                        "sketch": sketch.to_dict(),
+                        "writer": writer.checkpoint(),
+                    },
+                )
+        stream.close()  # an early stop leaves batches in flight; cancel them
 
     pct = (100.0 * total_np / total) if total else 0.0
     meta = {
@@ -142,16 +259,37 @@ def main():
         "p_threshold": P_THRESHOLD,
         "spike_prob": SPIKE_PROB,
         "noise_sigma": NOISE_SIGMA,
+        "seed": SEED,
+        "batch": BATCH,
+        "rng": "SeedSequence(seed, spawn_key=(batch_index,))",
+        "workers": workers,
+        "kernel": SIEVE_KERNEL,
+        "dtype": SIEVE_DTYPE,
+        "chunk": SIEVE_CHUNK,
+        "mem_budget_mb": SIEVE_MEM_MB,
         "np_hits": total_np,
         "np_hits_pct": pct,
-        "csv_path": CSV_PATH,
-        "elapsed_sec": round(time.time() - t0, 3),
+        "output_format": SIEVE_FORMAT,
+        "output_path": OUTPUT_PATH or None,
+        "sketch": sketch.to_dict(),
+        "elapsed_sec": round(elapsed_before + time.time() - t0, 3),
     }
+    if stopper is not None:
+        meta["n_traces_cap"] = N_TRACES
+        meta["early_stop"] = stopper.record()
+    if SWEEP:
+        meta["sweep"] = {"traces_np_threshold": NP_THRESHOLD, "table": sketch.sweep_table()}
+    if first:
+        meta["resumed_from_batch"] = first
+    if SIEVE_FORMAT == "csv":
+        meta["csv_path"] = OUTPUT_PATH  # the file written; OUTPUT_PATH may override CSV_PATH
     with open(META_PATH, "w") as f:
         json.dump(meta, f, indent=2)
+    clear_checkpoint(CHECKPOINT_PATH)
 
     print(
-        f"[sieve] backend={backend} traces={total} np_hits={total_np} ({pct:.2f}%) csv={CSV_PATH}"
+        f"[sieve] backend={backend} traces={total} np_hits={total_np} ({pct:.2f}%) "
+        f"{SIEVE_FORMAT}={OUTPUT_PATH or META_PATH}"
     )
     return 0
 
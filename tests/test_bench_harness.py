@@ -0,0 +1,46 @@
+import csv
+import json
+
+import pytest
+
+import bench
+from brain.benchmarks.harness import Case, SkipCase, reject_outliers, run_case, summarize
+
+
+def test_outliers_and_summary():
+    samples = [1.0, 1.1, 0.9, 1.05, 0.95, 9.0]
+    kept, rejected = reject_outliers(samples)
+    assert rejected == [9.0] and len(kept) == 5
+    assert reject_outliers(samples, k=0) == (samples, [])
+    stats = summarize(kept)
+    assert stats["n"] == 5 and stats["median"] == 1.0 and stats["min"] == 0.9
+    assert stats["p5"] == pytest.approx(0.91) and stats["p95"] == pytest.approx(1.09)
+
+
+def test_run_case_counts_calls_and_skips():
+    calls = []
+
+    def setup():
+        return lambda: calls.append(1)
+
+    res = run_case(Case("noop", setup, 10, "items"), warmup=2, repeats=4)
+    assert len(calls) == 6 and len(res["samples_s"]) == 4
+    assert res["throughput_per_s"] > 0
+
+    def skip():
+        raise SkipCase("no backend")
+
+    assert run_case(Case("skip", skip, 1, "items"))["skipped"] == "no backend"
+
+
+def test_bench_writes_csv_schema_and_json(tmp_path):
+    out = tmp_path / "b.csv"
+    argv = ["--traces", "2000", "--mode", "cpu", "--out", str(out), "--repeats", "2"]
+    assert bench.main(argv + ["--items", "50", "--tseitin-n", "10"]) == 0
+    rows = list(csv.reader(out.open()))
+    assert rows[0] == ["timestamp", "mode", "traces", "throughput_traces_per_s", "elapsed_s"]
+    assert rows[1][1:3] == ["cpu", "2000"] and float(rows[1][3]) > 0
+    doc = json.loads((tmp_path / "b.json").read_text())
+    assert doc["backend"] == "cpu"
+    assert [c["case"] for c in doc["cases"]] == ["sieve", "engine", "tseitin", "drat", "capsules"]
+    assert all("elapsed_s" in c or "skipped" in c for c in doc["cases"])
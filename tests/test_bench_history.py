@@ -0,0 +1,62 @@
+import csv
+
+import pytest
+
+from brain.benchmarks import history
+
+
+def _record(case, sha, samples, machine="m1", params=None):
+    return {
+        "timestamp": len(samples),
+        "sha": sha,
+        "machine": machine,
+        "mode": "cpu",
+        "case": case,
+        "unit": "traces",
+        "units": 1000,
+        "params": params or {"traces": 1000},
+        "samples_s": samples,
+        "median_s": sorted(samples)[len(samples) // 2],
+        "throughput_per_s": 1000 / sorted(samples)[len(samples) // 2],
+    }
+
+
+def test_mann_whitney_exact_and_normal():
+    # U = 25 is the most extreme of C(10, 5) = 252 orderings
+    assert history.mann_whitney_greater([6, 7, 8, 9, 10], [1, 2, 3, 4, 5]) == (25.0, 1 / 252)
+    assert history.mann_whitney_greater([1, 2, 3], [4, 5, 6])[1] == 1.0
+    # with ties: normal approximation, still one-sided
+    _, p = history.mann_whitney_greater([2.0] * 20 + [3.0] * 20, [1.0] * 20 + [2.0] * 20)
+    assert p < 1e-3
+
+
+def test_gate_flags_only_significant_slowdowns(tmp_path):
+    path = str(tmp_path / "h.jsonl")
+    base = [0.100, 0.101, 0.099, 0.102, 0.100, 0.098]
+    history.append_records(path, [_record("sieve", "aaa", base)])
+    with open(path, "a") as f:
+        f.write('{"torn": ')  # interrupted append
+    past = list(history.load_records(path))
+    assert len(past) == 1
+
+    slow = _record("sieve", "bbb", [x * 1.3 for x in base])
+    found = history.find_baseline(past, slow, "previous")
+    assert found is not None and history.find_baseline(past, slow, "aa") is found
+    assert history.find_baseline(past, slow, "ccc") is None
+    assert history.find_baseline(past, dict(slow, machine="m2"), "previous") is None
+    verdict = history.compare(slow, found)
+    assert verdict["regression"] and verdict["change"] == pytest.approx(0.3)
+    assert not history.compare(slow, found, threshold=0.5)["regression"]
+    noisy = _record("sieve", "bbb", [x * 1.02 for x in base])
+    assert not history.compare(noisy, found)["regression"]
+
+
+def test_trend_csv_keeps_chart_columns(tmp_path):
+    recs = [_record("sieve", "a", [0.1] * 3), _record("engine", "a", [0.2] * 3)]
+    rows = history.trend_rows(recs, case="sieve")
+    history.write_trend_csv(str(tmp_path / "t.csv"), rows)
+    out = list(csv.DictReader(open(tmp_path / "t.csv")))
+    assert [r["case"] for r in out] == ["sieve"]
+    assert out[0]["throughput_traces_per_s"] == "10000.000"
+    assert "sieve" in history.format_trend(history.trend_rows(recs))
+    assert history.parse_thresholds(["engine=0.25"]) == {"engine": 0.25}
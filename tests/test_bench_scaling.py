@@ -0,0 +1,60 @@
+import csv
+import json
+
+import bench
+from brain.benchmarks.scaling import knees, scaling_rows
+
+
+def _result(case, workers, tp, **params):
+    return {
+        "case": case,
+        "unit": "traces",
+        "params": dict(params, workers=workers),
+        "elapsed_s": {"median": 1.0 / tp},
+        "throughput_per_s": tp,
+    }
+
+
+def test_speedup_efficiency_and_knee():
+    results = [
+        _result("sieve", 1, 100.0, traces=1000, length=48, dtype="float64"),
+        _result("sieve", 2, 190.0, traces=1000, length=48, dtype="float64"),
+        _result("sieve", 4, 200.0, traces=1000, length=48, dtype="float64"),
+        _result("sieve", 8, 210.0, traces=1000, length=48, dtype="float64"),
+        _result("tseitin", 1, 50.0, n=20),
+        {"case": "sieve", "params": {"workers": 16}, "skipped": "no cores"},
+    ]
+    rows = scaling_rows(results)
+    sieve = [r for r in rows if r["workload"] == "sieve"]
+    assert [r["workers"] for r in sieve] == [1, 2, 4, 8]
+    assert [round(r["speedup"], 2) for r in sieve] == [1.0, 1.9, 2.0, 2.1]
+    assert [r["flat"] for r in sieve] == [False, False, True, True]
+    assert sieve[2]["efficiency"] == 0.5
+    assert knees(rows) == [
+        {
+            "workload": "sieve",
+            "size": 1000,
+            "length": 48,
+            "dtype": "float64",
+            "flattens_at_workers": 4,
+            "speedup": 2.0,
+        }
+    ]
+
+
+def test_bench_sweep_writes_grid(tmp_path):
+    out = tmp_path / "s.csv"
+    argv = ["--sweep", "--sweep-out", str(out), "--repeats", "1", "--warmup", "0"]
+    argv += ["--sweep-traces", "2000", "--sweep-dtypes", "float32", "--sweep-workers", "1", "2"]
+    argv += ["--sweep-items", "40", "--sweep-tseitin", "10", "--mode", "cpu"]
+    assert bench.main(argv) == 0
+    rows = list(csv.DictReader(out.open()))
+    assert [(r["workload"], r["workers"]) for r in rows] == [
+        ("sieve", "1"),
+        ("sieve", "2"),
+        ("engine", "1"),
+        ("engine", "2"),
+        ("tseitin", "1"),
+    ]
+    doc = json.loads((tmp_path / "s.json").read_text())
+    assert doc["grid"]["workers"] == [1, 2] and len(doc["results"]) == 5
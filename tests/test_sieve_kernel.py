@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from brain.sieve.kernel import (
+    DTYPES,
+    SieveParams,
+    auto_batch,
+    batch_rng,
+    bytes_per_trace,
+    fused_maxima,
+    gen_traces,
+)
+
+
+@pytest.mark.parametrize("dtype", DTYPES)
+@pytest.mark.parametrize("length,chunk", [(48, 16), (17, 5), (5, 64), (33, 1)])
+def test_fused_matches_dense_bit_for_bit(dtype, length, chunk):
+    params = SieveParams(spike_prob=0.5, dtype=dtype, chunk=chunk)
+    fused = fused_maxima(np, batch_rng(np, 7, 2), 301, length, params)
+    dense = gen_traces(np, batch_rng(np, 7, 2), 301, length, params).max(axis=1)
+    assert fused.dtype == np.dtype(dtype)
+    assert np.array_equal(fused, dense)
+
+
+def test_auto_batch_fits_budget():
+    for params in (SieveParams(), SieveParams(dtype="float32"), SieveParams(fused=False)):
+        n = auto_batch(64 << 20, 48, params)
+        assert n % 1024 == 0
+        assert n * bytes_per_trace(48, params) <= 64 << 20
+    dense = auto_batch(64 << 20, 48, SieveParams(fused=False))
+    assert auto_batch(64 << 20, 48, SieveParams()) > dense
+    assert auto_batch(1, 48, SieveParams()) == 1
@@ -0,0 +1,79 @@
+import csv
+import io
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from brain.sieve.output import (
+    FORMATS,
+    SieveWriter,
+    default_output_path,
+    load_columns,
+    open_writer,
+    summarize,
+)
+
+REPO = Path(__file__).resolve().parents[1]
+
+
+def _batches():
+    rng = np.random.default_rng(7)
+    return [rng.random(n) * 0.2 for n in (5, 0, 11)]
+
+
+def _write(fmt, path):
+    total = 0
+    with open_writer(fmt, path, 16, 48, "cpu") as w:
+        for vals in _batches():
+            w.write(total, vals, vals > 0.09)
+            total += len(vals)
+    return np.concatenate(_batches())
+
+
+def test_csv_bytes_match_csv_writer(tmp_path):
+    vals = _write("csv", tmp_path / "out.csv")
+    ref = io.StringIO(newline="")
+    w = csv.writer(ref)
+    w.writerow(["trace_id", "max_delta_phi", "np_hit", "length", "backend"])
+    for i, v in enumerate(vals):
+        w.writerow([i, float(v), int(v > 0.09), 48, "cpu"])
+    assert (tmp_path / "out.csv").read_bytes() == ref.getvalue().encode()
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_every_format_reads_back(tmp_path, fmt):
+    path = default_output_path(tmp_path / "sieve.csv", fmt)
+    vals = _write(fmt, path)
+    cols = load_columns(path)
+    assert cols["trace_id"].tolist() == list(range(16))
+    assert np.array_equal(cols["max_delta_phi"], vals)
+    assert cols["np_hit"].tolist() == (vals > 0.09).astype(int).tolist()
+    assert (cols["length"], cols["backend"]) == (48, "cpu")
+    summary = summarize(path)
+    assert summary["format"] == fmt
+    assert summary["np_hits"] == int((vals > 0.09).sum())
+
+
+def test_writer_base_is_abstract_and_meta_names_the_written_csv(tmp_path):
+    with pytest.raises(TypeError):
+        SieveWriter(tmp_path / "x", 1, 48, "cpu")
+    out = tmp_path / "elsewhere.csv"
+    env = dict(
+        os.environ,
+        N_TRACES="2000",
+        BATCH="1000",
+        SIEVE_FORMAT="csv",
+        CSV_PATH=str(tmp_path / "unused.csv"),
+        OUTPUT_PATH=str(out),
+        META_PATH=str(tmp_path / "s.json"),
+        PYTHONPATH=str(REPO),
+    )
+    subprocess.run([sys.executable, str(REPO / "sieve.py")], env=env, check=True)
+    meta = json.loads((tmp_path / "s.json").read_text())
+    assert meta["csv_path"] == meta["output_path"] == str(out)
+    assert len(load_columns(out)["trace_id"]) == 2000
@@ -0,0 +1,34 @@
+import numpy as np
+
+from brain.sieve.kernel import SieveParams, batch_maxima
+from brain.sieve.parallel import run_parallel
+
+PARAMS = SieveParams()
+
+
+def _collect(workers, n=9000, batch=2000):
+    parts = []
+    total, hits = run_parallel(
+        lambda start, m, h: parts.append((start, m.copy(), h.copy())),
+        n, batch, 48, 42, PARAMS, workers,
+    )
+    return total, hits, parts
+
+
+def test_batches_draw_independent_streams():
+    a = batch_maxima(np, 42, 0, 500, 48, PARAMS)
+    b = batch_maxima(np, 42, 1, 500, 48, PARAMS)
+    assert not np.array_equal(a, b)
+    assert np.array_equal(a, batch_maxima(np, 42, 0, 500, 48, PARAMS))
+
+
+def test_parallel_output_is_independent_of_worker_count():
+    serial = [batch_maxima(np, 42, b, min(2000, 9000 - b * 2000), 48, PARAMS) for b in range(5)]
+    for workers in (2, 3):
+        total, hits, parts = _collect(workers)
+        assert total == 9000
+        assert [p[0] for p in parts] == [0, 2000, 4000, 6000, 8000]
+        for (_, m, h), ref in zip(parts, serial):
+            assert np.array_equal(m, ref)
+            assert np.array_equal(h.astype(bool), ref > PARAMS.np_threshold)
+        assert hits == sum(int((r > PARAMS.np_threshold).sum()) for r in serial)
@@ -0,0 +1,68 @@
+import json
+
+import numpy as np
+import pytest
+
+from brain.sieve.kernel import SieveParams, batch_maxima
+from brain.sieve.parallel import run_parallel
+from brain.sieve.sketch import KLLSketch, SieveSketch, merge_all
+
+
+def _data(n=300_000):
+    return np.random.default_rng(5).gamma(2.0, 0.02, n)
+
+
+def _batched(x, size=25_000, **kw):
+    parts = []
+    for i in range(0, len(x), size):
+        sk = SieveSketch(thresholds=(0.045, 0.09), **kw)
+        sk.update(x[i : i + size])
+        parts.append(sk)
+    return merge_all(parts)
+
+
+def test_kll_rank_error_and_size_are_bounded():
+    x = _data()
+    sk = KLLSketch(k=200)
+    for i in range(0, len(x), 10_000):
+        sk.update(x[i : i + 10_000])
+    qs = np.linspace(0.01, 0.99, 99)
+    ranks = np.searchsorted(np.sort(x), sk.quantiles(qs)) / len(x)
+    assert np.abs(ranks - qs).max() < 0.01
+    assert sk.retained() < 3 * 200
+    assert sk.n == len(x)
+
+
+def test_merged_counts_are_exact():
+    x = _data()
+    sk = _batched(x)
+    assert sk.count == len(x) and sk.kll.n == len(x)
+    assert sk.hit_rate(0.09) == (x > 0.09).mean()
+    assert [int(c) for c in sk.exceed] == [int((x > 0.045).sum()), int((x > 0.09).sum())]
+    ref, _ = np.histogram(x, bins=200, range=(0.0, 0.5))
+    assert sk.counts.sum() + sk.overflow == len(x)
+    assert np.abs(sk.counts - ref).max() <= 1  # bin-edge rounding only
+    assert sk.max == x.max() and sk.total == pytest.approx(x.sum())
+
+
+def test_round_trip_and_incompatible_merge():
+    sk = _batched(_data(50_000))
+    d = json.loads(json.dumps(sk.to_dict()))
+    again = SieveSketch.from_dict(d)
+    assert again.to_dict() == d
+    again.merge(sk)
+    assert again.count == 2 * sk.count
+    with pytest.raises(ValueError):
+        sk.merge(SieveSketch(bins=10))
+
+
+def test_parallel_sketch_matches_serial():
+    params = SieveParams()
+    serial = SieveSketch(thresholds=(0.09,))
+    for b in range(4):
+        part = serial.empty()
+        part.update(batch_maxima(np, 42, b, min(2500, 9000 - b * 2500), 48, params))
+        serial.merge(part)
+    parallel = serial.empty()
+    run_parallel(lambda *a: None, 9000, 2500, 48, 42, params, 2, sketch=parallel)
+    assert parallel.to_dict() == serial.to_dict()
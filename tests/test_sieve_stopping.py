@@ -0,0 +1,64 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from brain.sieve.output import load_columns
+from brain.sieve.stopping import EarlyStop, clopper_pearson_interval, wilson_interval
+
+REPO = Path(__file__).resolve().parents[1]
+
+
+def test_intervals_match_reference_values():
+    # R: binom.test(10, 100)$conf.int and prop.test(10, 100, correct=FALSE)$conf.int
+    assert clopper_pearson_interval(10, 100) == pytest.approx((0.0490047, 0.1762226), abs=1e-7)
+    assert wilson_interval(10, 100) == pytest.approx((0.0552291, 0.1743657), abs=1e-7)
+    # closed forms at the edges: k = 0 and k = n
+    assert clopper_pearson_interval(0, 50) == pytest.approx((0.0, 1 - 0.025 ** (1 / 50)))
+    assert clopper_pearson_interval(50, 50) == pytest.approx((0.025 ** (1 / 50), 1.0))
+    lo, hi = clopper_pearson_interval(34_000_000, 1_000_000_000)
+    wlo, whi = wilson_interval(34_000_000, 1_000_000_000)
+    assert lo < 0.034 < hi and abs(lo - wlo) < 1e-6 and abs(hi - whi) < 1e-6
+
+
+def test_early_stop_rule():
+    stop = EarlyStop(0.01, method="clopper-pearson", min_traces=5_000)
+    assert not stop.check(40, 1_000, 0)  # too wide
+    assert not stop.check(120, 3_000, 2)  # tight enough but under min_traces
+    assert stop.check(200, 5_000, 4)
+    rec = stop.record()
+    assert rec["stopped_early"] and rec["stopped_at_batch"] == 4 and rec["traces_used"] == 5_000
+    assert rec["half_width_pct"] <= rec["target_half_width_pct"] == 1.0
+    with pytest.raises(ValueError):
+        EarlyStop(0.01, method="agresti")
+
+
+def test_sieve_stops_at_first_tight_batch(tmp_path):
+    env = dict(
+        os.environ,
+        N_TRACES="200000",
+        BATCH="5000",
+        SIEVE_FORMAT="npy",
+        STOP_HALF_WIDTH="0.5",
+        CSV_PATH=str(tmp_path / "s.csv"),
+        META_PATH=str(tmp_path / "s.json"),
+        PYTHONPATH=str(REPO),
+    )
+    subprocess.run([sys.executable, str(REPO / "sieve.py")], env=env, check=True)
+    meta = json.loads((tmp_path / "s.json").read_text())
+    rec = meta["early_stop"]
+    n = meta["n_traces"]
+    assert rec["stopped_early"] and rec["traces_used"] == n < meta["n_traces_cap"]
+    assert n == (rec["stopped_at_batch"] + 1) * 5000
+    assert rec["half_width_pct"] <= 0.5
+    cols = load_columns(tmp_path / "s.cols")  # trimmed to the traces actually run
+    assert len(cols["trace_id"]) == n
+    assert np.count_nonzero(cols["np_hit"]) == meta["np_hits"]
+    # one batch earlier the interval was still too wide
+    prev = n - 5000
+    lo, hi = wilson_interval(int(np.count_nonzero(cols["np_hit"][:prev])), prev)
+    assert 100 * (hi - lo) / 2 > 0.5
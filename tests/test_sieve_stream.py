@@ -0,0 +1,51 @@
+import glob
+import random
+
+import pytest
+
+from brain.sieve.stream import SlidingWindow, StreamingSieve, read_rows
+
+
+def test_sliding_window_matches_brute_force():
+    rng = random.Random(3)
+    values = [rng.choice([rng.random(), 0.5]) for _ in range(500)]
+    for size in (1, 3, 17):
+        w = SlidingWindow(size)
+        for i, v in enumerate(values):
+            tail = values[max(0, i - size + 1) : i + 1]
+            assert w.push(v) == (max(tail), min(tail))
+
+
+def test_events_on_market_series():
+    (path,) = glob.glob("data/market-nphard-*.csv")
+    sieve = StreamingSieve(window=4)
+    events = list(sieve.push_many(read_rows([path])))
+    assert [(e.time_index, e.threshold, e.direction) for e in events] == [
+        (1, "P", "up"),
+        (5, "NP", "up"),
+        (18, "NP", "down"),
+    ]
+    assert events[1].delta_phi == 0.103
+    assert sieve.stats(events[0].series)["count"] == 4
+
+
+def test_series_are_independent_and_bounded():
+    sieve = StreamingSieve(window=2, max_series=3)
+    assert [e.threshold for e in sieve.push("x", 0, 0.2)] == ["P", "NP"]
+    assert sieve.push("y", 0, 0.01) == []
+    assert sieve.stats("y")["delta_phi"] == pytest.approx(0.01)
+    assert sieve.push("x", 1, float("nan")) == []
+    assert sieve.push("x", 2, 0.01) == []  # 0.2 still inside the window
+    assert [e.direction for e in sieve.push("x", 3, 0.01)] == ["down", "down"]
+    for name in ("z", "w"):
+        sieve.push(name, 0, 0.01)
+    assert sieve.stats("y") is None  # least recently updated, evicted
+    assert sieve.summary() == {
+        "rows": 7, "skipped": 1, "series": 3, "evicted": 1, "events": 4
+    }
+
+
+def test_read_rows_multiplexed_and_unterminated(tmp_path):
+    p = tmp_path / "feed.csv"
+    p.write_text("time_index,entropy\n0,0.1\nbad\n1,0.2")
+    assert list(read_rows([str(p)])) == [("feed", 0, 0.1), ("feed", 1, 0.2)]
@@ -0,0 +1,43 @@
+import json
+
+import numpy as np
+import pytest
+
+from brain.sieve.output import open_writer
+from brain.sieve.sketch import SieveSketch, merge_all
+from brain.sieve.sweep import main, parse_grid, sweep_table
+
+
+def test_parse_grid():
+    assert parse_grid("0.1:0.3:3") == pytest.approx([0.1, 0.2, 0.3])
+    assert parse_grid("0.09, 0.045") == [0.09, 0.045]
+    assert parse_grid("") == []
+    with pytest.raises(ValueError):
+        parse_grid("0:1:0")
+
+
+def test_sweep_matches_brute_force_and_merges():
+    x = np.random.default_rng(2).gamma(2.0, 0.02, 50_000)
+    grid = parse_grid("0.0:0.2:200")
+    table = sweep_table(x, grid)
+    assert [r["hits"] for r in table] == [int((x > t).sum()) for t in grid]
+
+    parts = []
+    for i in range(0, len(x), 7_000):
+        sk = SieveSketch(thresholds=(0.09,), sweep=grid)
+        sk.update(x[i : i + 7_000])
+        parts.append(sk)
+    merged = merge_all(parts)
+    assert merged.sweep_table() == table
+    again = SieveSketch.from_dict(json.loads(json.dumps(merged.to_dict())))
+    assert again.sweep_table() == table
+    assert merged.hit_rate(grid[10]) == table[10]["hits"] / len(x)
+
+
+def test_offline_sweep_of_saved_output(tmp_path, capsys):
+    vals = np.array([0.01, 0.05, 0.1, 0.2])
+    with open_writer("csv", tmp_path / "s.csv", 4, 48, "cpu") as w:
+        w.write(0, vals, vals > 0.09)
+    assert main([str(tmp_path / "s.csv"), "--grid", "0.05,0.15"]) == 0
+    doc = json.loads(capsys.readouterr().out)
+    assert [r["hits"] for r in doc["table"]] == [2, 1]
@@ -5,18 +5,62 @@ Generate a schema-compliant capsule JSON from Day-2 sieve meta.
 Usage:
   python tools/capsule_from_meta.py \
     --meta data/entropy_sieve_ci.json \
-    --out  capsules/sieve-day2.json
+    --out  capsules/sieve-day2.json \
+    [--verify]   # re-read the per-trace output (csv / npy / npz) and check counts
 """
 from __future__ import annotations
 import argparse, json, os, sys, time
-from typing import Any, Dict, List
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+def output_path(meta: Dict[str, Any]) -> Optional[str]:
+    """Per-trace output recorded in the meta (``output_path``, else legacy ``csv_path``)."""
+    return meta.get("output_path") or meta.get("csv_path")
+
+
+def verify_sketch(meta: Dict[str, Any]) -> List[str]:
+    """Check the meta sketch against the meta counts (histogram total, NP exceedance)."""
+    sketch = meta["sketch"]
+    hist = sketch["histogram"]
+    binned = sum(hist["counts"]) + hist["underflow"] + hist["overflow"]
+    problems = []
+    if not int(meta.get("n_traces", -1)) == sketch["count"] == binned == sketch["kll"]["n"]:
+        problems.append(
+            f"n_traces: meta={meta.get('n_traces')} sketch={sketch['count']} "
+            f"histogram={binned} kll={sketch['kll']['n']}"
+        )
+    np_thr = meta.get("np_threshold")
+    for e in sketch["exceedance"]:
+        if e["threshold"] == np_thr and e["count"] != int(meta.get("np_hits", -1)):
+            problems.append(f"np_hits: meta={meta.get('np_hits')} sketch={e['count']}")
+    return problems
+
+
+def verify_output(meta: Dict[str, Any]) -> List[str]:
+    """Compare meta counts with the per-trace output and sketch; returns mismatch messages."""
+    from brain.sieve.output import summarize
+
+    problems = verify_sketch(meta) if "sketch" in meta else []
+    path = output_path(meta)
+    if meta.get("output_format") == "summary":
+        return problems if "sketch" in meta else ["summary-only meta has no sketch"]
+    if not path:
+        return problems + ["meta records no per-trace output"]
+    summary = summarize(path)
+    for key in ("n_traces", "np_hits"):
+        if int(meta.get(key, -1)) != summary[key]:
+            problems.append(f"{key}: meta={meta.get(key)} output={summary[key]} ({path})")
+    return problems
 
 
 def build_capsule(meta: Dict[str, Any], args: argparse.Namespace) -> Dict[str, Any]:
     np_hits_pct = float(meta.get("np_hits_pct", 0.0))
     np_hits = int(meta.get("np_hits", 0))
     n_traces = int(meta.get("n_traces", 0))
-    csv_path = meta.get("csv_path")
+    csv_path = output_path(meta)
     generated_at = meta.get("generated_at_utc") or time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
 
     refs: List[str] = [args.meta]
@@ -64,11 +108,20 @@ def main() -> int:
     ap.add_argument("--status", default="draft", choices=["draft", "frozen", "superseded"], help="Capsule status field")
     ap.add_argument("--version", default="0.1.0", help="Capsule version (SemVer)")
     ap.add_argument("--author", default="Entropy Sieve Bot", help="Author name for capsule")
+    ap.add_argument("--verify", action="store_true", help="Cross-check meta counts against the per-trace output")
     args = ap.parse_args()
 
     with open(args.meta, encoding="utf-8") as f:
         meta = json.load(f)
 
+    if args.verify:
+        problems = verify_output(meta)
+        for msg in problems:
+            print(f"[capsule] verify failed: {msg}", file=sys.stderr)
+        if problems:
+            return 1
+        print(f"[capsule] verified {output_path(meta) or args.meta}")
+
     capsule = build_capsule(meta, args)
 
     os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)